@@ -0,0 +1,289 @@
+"""
+This file times the main steps of the tool on synthetic instances of several sizes, and saves the timings as JSON so
+that they can be compared between versions of the code or between machines.
+Instructions on how to run this file can be found in the README.md in this directory.
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+import multiprocessing
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic_data import generate_sheets
+from src.data_load import DataLoader
+from src.ProblemInstance import ProblemInstance
+from src.Schedule import Schedule
+from src.GeneticAlgorithm import GeneticAlgorithm
+from src.Config import Config, DEFAULT_CONFIG_PATH
+
+# Number of students and wards in each instance size
+SCALES = {
+    "small": (100, 10),
+    "medium": (1000, 100),
+    "large": (10000, 300),
+}
+
+
+def time_function(function, repeats: int) -> dict:
+    """
+    Function to time repeated calls of a function
+
+    :param function: function taking no arguments
+    :param repeats: integer number of times to call the function
+    :returns: dictionary of the number of repeats and the minimum, median, mean and maximum time in seconds
+    """
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return {
+        "repeats": repeats,
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "mean_s": statistics.mean(times),
+        "max_s": max(times),
+    }
+
+
+def benchmark_scale(
+    num_students: int,
+    num_wards: int,
+    config: Config,
+    pop_size: int,
+    repeats: int,
+    seed: int,
+) -> dict:
+    """
+    Function to time each step of the tool on one synthetic instance
+
+    :param num_students: integer number of students in the instance
+    :param num_wards: integer number of wards in the instance
+    :param config: the Config to run with
+    :param pop_size: integer number of schedules in the population used to time select_parents and evolve
+    :param repeats: integer number of times each step is timed
+    :param seed: integer seed for the instance and the algorithm
+    :returns: dictionary of the size of the instance and the timings of each step
+    """
+    sheets = generate_sheets(num_students, num_wards, seed)
+    timings = {}
+
+    dataload = DataLoader()
+    timings["process_sheets"] = time_function(
+        lambda: dataload.process_sheets(
+            {name: sheet.copy() for name, sheet in sheets.items()}
+        ),
+        1,
+    )
+    num_weeks = dataload.num_weeks()
+    slots, wards, placements = dataload.preprocData(num_weeks)
+    records = (dataload.placement_records, dataload.ward_records)
+    timings["problem_instance"] = time_function(
+        lambda: ProblemInstance(slots, wards, placements, num_weeks, *records), 1
+    )
+    instance = ProblemInstance(slots, wards, placements, num_weeks, *records)
+
+    random.seed(seed)
+
+    def new_schedule() -> Schedule:
+        schedule = Schedule(slots, wards, placements, num_weeks, instance, config)
+        schedule.schedule_generation()
+        return schedule
+
+    timings["schedule_generation"] = time_function(new_schedule, repeats)
+    schedule = new_schedule()
+    other_schedule = new_schedule()
+    timings["get_fitness"] = time_function(schedule.get_fitness, repeats)
+    other_schedule.get_fitness()
+
+    ga_params = config.genetic_algorithm_params
+    timings["mutation"] = time_function(
+        lambda: schedule.mutation(ga_params.num_mutations), repeats
+    )
+    num_recomb_points = int(np.round(num_weeks / ga_params.recomb_points, 0))
+    timings["recombination"] = time_function(
+        lambda: schedule.recombination(other_schedule, num_recomb_points, 1), repeats
+    )
+
+    GA = GeneticAlgorithm(
+        slots, wards, placements, pop_size, num_weeks, config, instance=instance
+    )
+    GA.seed_schedules()
+    GA.evaluate()
+    timings["select_parents"] = time_function(GA.select_parents, repeats)
+    timings["evolve"] = time_function(GA.evolve, repeats)
+    GA.close()
+
+    schedule.populate_schedule()
+    timings["save_report"] = time_function(schedule.save_report, repeats)
+
+    return {
+        "num_students": num_students,
+        "num_wards": num_wards,
+        "num_placements": len(placements),
+        "num_weeks": num_weeks,
+        "timings": timings,
+    }
+
+
+def environment() -> dict:
+    """
+    Function to describe the machine and code the benchmarks were run on, so that results can be compared fairly
+
+    :returns: dictionary describing the environment
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Function to find the steps which have become slower than in an earlier set of results
+
+    :param results: the results of this run
+    :param baseline: results of an earlier run, read from its JSON file
+    :param tolerance: allowed fractional increase in the median time before a step counts as slower
+    :returns: list of (scale, step, baseline median, new median) for each step that is slower
+    """
+    regressions = []
+    for scale, scale_results in results["scales"].items():
+        baseline_timings = baseline["scales"].get(scale, {}).get("timings", {})
+        for step, timing in scale_results["timings"].items():
+            if step not in baseline_timings:
+                continue
+            baseline_median = baseline_timings[step]["median_s"]
+            if timing["median_s"] > baseline_median * (1 + tolerance):
+                regressions.append((scale, step, baseline_median, timing["median_s"]))
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """
+    Function to run the benchmarks, save the results as JSON and optionally compare them with an earlier run
+
+    :param argv: list of command line arguments, sys.argv if not given
+    :returns: exit status, 1 if any step is slower than the baseline by more than the tolerance
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.run_benchmarks",
+        description="Time the main steps of the tool on synthetic instances",
+    )
+    parser.add_argument(
+        "--scales",
+        default="small,medium,large",
+        help=f"comma separated instance sizes to run, from {', '.join(SCALES)}, or students x wards such as 5000x200",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=5, help="number of times each step is timed"
+    )
+    parser.add_argument(
+        "--pop-size",
+        type=int,
+        default=20,
+        help="number of schedules in the population used to time select_parents and evolve",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="value of num_workers")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--output", help="JSON file to save the results to, printed if not given"
+    )
+    parser.add_argument(
+        "--baseline", help="JSON file of earlier results to compare with"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="fractional increase in median time allowed before a step counts as slower than the baseline",
+    )
+    parser.add_argument(
+        "--config", default=DEFAULT_CONFIG_PATH, help="location of params.yml"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as results_folder:
+        config = Config.load(args.config)
+        config = dataclasses.replace(
+            config,
+            schedule_params=dataclasses.replace(
+                config.schedule_params, results_folder=results_folder
+            ),
+            genetic_algorithm_params=dataclasses.replace(
+                config.genetic_algorithm_params,
+                num_workers=args.workers,
+                checkpoint_interval=0,
+            ),
+        )
+
+        results = {
+            "environment": environment(),
+            "settings": {
+                "repeats": args.repeats,
+                "pop_size": args.pop_size,
+                "workers": args.workers,
+                "seed": args.seed,
+            },
+            "scales": {},
+        }
+        for scale in args.scales.split(","):
+            if scale in SCALES:
+                num_students, num_wards = SCALES[scale]
+            else:
+                num_students, num_wards = (int(size) for size in scale.split("x"))
+            print(
+                f"Benchmarking {scale}: {num_students} students, {num_wards} wards",
+                file=sys.stderr,
+            )
+            results["scales"][scale] = benchmark_scale(
+                num_students, num_wards, config, args.pop_size, args.repeats, args.seed
+            )
+            for step, timing in results["scales"][scale]["timings"].items():
+                print(f"  {step:<20} {timing['median_s']:10.4f}s", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+        for scale, step, baseline_median, median in regressions:
+            print(
+                f"Slower: {scale} {step} took {median:.4f}s against {baseline_median:.4f}s",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
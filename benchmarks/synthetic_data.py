@@ -0,0 +1,223 @@
+"""
+This file generates synthetic input data at any scale, for benchmarking the tool.
+Unlike the fake data generator, the data is linked so that it behaves like real data: every student belongs to a cohort
+with its own set of placements, students further through their course have previous placements on existing wards, and
+ward capacities are sized to the busiest week, so that capacity is tight but every placement can usually be given a
+ward.
+Instructions on how to run this file can be found in the README.md in this directory.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+
+UNIVERSITIES = ["University1", "University2", "University3"]
+QUALIFICATIONS = ["Adult Nursing", "Child Nursing"]
+
+# Each intake, and the part of the course its students are on
+INTAKES = [
+    ("Sep2021", "P1"),
+    ("Jan2022", "P1"),
+    ("Sep2020", "P2"),
+    ("Jan2021", "P2"),
+    ("Sep2019", "P3"),
+    ("Jan2020", "P3"),
+]
+
+DEPARTMENTS = [
+    "General Medicine",
+    "Acute Medicine",
+    "Respiratory Medicine",
+    "General Surgery",
+    "Cardiac Surgery",
+    "Orthopaedic Surgery",
+    "Critical Care",
+    "Emergency Department",
+    "Community Nursing",
+    "Paediatrics",
+    "Elderly Care",
+    "Oncology",
+    "Renal",
+    "Maternity",
+]
+
+# Range of the number of previous placements of students on each part of the course
+PREVIOUS_PLACEMENTS = {"P1": (0, 1), "P2": (2, 4), "P3": (4, 6)}
+
+FIRST_WEEK = pd.Timestamp("2021-09-06")
+BLOCKS_PER_YEAR = 3
+WEEKS_PER_YEAR = 52
+
+
+def generate_sheets(
+    num_students: int, num_wards: int, seed: int = 0, capacity_slack: float = 1.0
+) -> dict:
+    """
+    Function to generate the students, wards and placements sheets of an input file
+
+    :param num_students: integer number of students
+    :param num_wards: integer number of wards
+    :param seed: integer seed, the same seed always gives the same data
+    :param capacity_slack: ratio of the total ward capacity to the number of students on placement in the busiest week
+    :returns: dictionary of the students, wards and placements dataframes, in the format of the input file
+    """
+    rng = np.random.default_rng(seed)
+    ward_names = np.array([f"Ward{i}" for i in range(num_wards)])
+
+    # Each cohort has BLOCKS_PER_YEAR placements, with January intakes a third of a year behind
+    cohorts = []
+    placement_rows = []
+    for university_index, university in enumerate(UNIVERSITIES):
+        for qualification in QUALIFICATIONS:
+            for course_start, part in INTAKES:
+                cohorts.append((university, qualification, course_start, part))
+                intake_offset = 17 if course_start.startswith("Jan") else 0
+                for block in range(BLOCKS_PER_YEAR):
+                    start_week = (
+                        intake_offset
+                        + block * 17
+                        + university_index * 5
+                        + int(rng.integers(0, 4))
+                    ) % WEEKS_PER_YEAR
+                    placement_rows.append(
+                        [
+                            university,
+                            qualification,
+                            course_start,
+                            f"{part}, Block {block + 1}",
+                            str(
+                                (FIRST_WEEK + pd.Timedelta(weeks=start_week)).date()
+                            ),
+                            int(rng.integers(4, 9)),
+                        ]
+                    )
+    placements = pd.DataFrame(
+        placement_rows,
+        columns=[
+            "university",
+            "qualification",
+            "course_start",
+            "placement_name",
+            "placement_start_date",
+            "placement_len_weeks",
+        ],
+    )
+
+    student_cohorts = rng.integers(0, len(cohorts), num_students)
+    student_parts = [cohorts[cohort][3] for cohort in student_cohorts]
+    previous_placements = []
+    for part in student_parts:
+        low, high = PREVIOUS_PLACEMENTS[part]
+        num_previous = min(int(rng.integers(low, high + 1)), num_wards)
+        previous_wards = rng.choice(ward_names, num_previous, replace=False)
+        previous_placements.append(
+            "[" + ", ".join(f"'{ward}'" for ward in previous_wards) + "]"
+        )
+    students = pd.DataFrame(
+        {
+            "student_id": [f"Student{i}" for i in range(num_students)],
+            "university": [cohorts[cohort][0] for cohort in student_cohorts],
+            "qualification": [cohorts[cohort][1] for cohort in student_cohorts],
+            "course_start": [cohorts[cohort][2] for cohort in student_cohorts],
+            "year": [f"Year{part[1]}" for part in student_parts],
+            "prev_placements": previous_placements,
+            "allowable_covid_status": rng.choice(
+                ["Medium/High", "Low/Medium"], num_students, p=[0.85, 0.15]
+            ),
+        }
+    )
+
+    # Size ward capacity to the busiest week, so that most placements can be given a ward
+    cohort_students = np.bincount(student_cohorts, minlength=len(cohorts))
+    start_weeks = (
+        pd.to_datetime(placements["placement_start_date"]) - FIRST_WEEK
+    ).dt.days.to_numpy() // 7
+    weekly_demand = np.zeros(WEEKS_PER_YEAR + placements["placement_len_weeks"].max())
+    for row, (start_week, length) in enumerate(
+        zip(start_weeks, placements["placement_len_weeks"])
+    ):
+        weekly_demand[start_week : start_week + length] += cohort_students[
+            row // BLOCKS_PER_YEAR
+        ]
+    ward_share = rng.uniform(0.5, 1.5, num_wards)
+    ward_share = ward_share / ward_share.sum()
+    ward_capacity = np.ceil(capacity_slack * weekly_demand.max() * ward_share)
+    # Each part may only use some of a ward's capacity, with at least one part able to use all of it
+    part_share = rng.uniform(0.5, 1.0, (num_wards, 3))
+    part_share[np.arange(num_wards), rng.integers(0, 3, num_wards)] = 1.0
+    part_capacity = np.ceil(ward_capacity[:, None] * part_share).astype(int)
+
+    # A few wards have an education audit which expires during the year
+    audit_expiry = np.where(
+        rng.random(num_wards) < 0.05,
+        [
+            str((FIRST_WEEK + pd.Timedelta(weeks=int(week))).date())
+            for week in rng.integers(10, 50, num_wards)
+        ],
+        str((FIRST_WEEK + pd.Timedelta(weeks=2 * WEEKS_PER_YEAR)).date()),
+    )
+    wards = pd.DataFrame(
+        {
+            "ward_name": ward_names,
+            "ward_speciality": rng.choice(DEPARTMENTS, num_wards),
+            "education_audit_exp": audit_expiry,
+            "covid_status": rng.choice(
+                ["Low/Medium", "Medium/High"], num_wards, p=[0.8, 0.2]
+            ),
+            "capacity_num": ward_capacity.astype(int),
+            "p1_cap": part_capacity[:, 0],
+            "p2_cap": part_capacity[:, 1],
+            "p3_cap": part_capacity[:, 2],
+        }
+    )
+
+    return {"students": students, "wards": wards, "placements": placements}
+
+
+def write_workbook(sheets: dict, filename: str):
+    """
+    Function to save generated sheets as an input file which can be used by the UI or the command line runner
+
+    :param sheets: dictionary of the students, wards and placements dataframes
+    :param filename: path of the .xlsx file to write
+    """
+    with pd.ExcelWriter(filename) as writer:
+        for sheet_name, sheet in sheets.items():
+            sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic input file of any size for benchmarking the tool"
+    )
+    parser.add_argument(
+        "--number_of_students",
+        "-ns",
+        type=int,
+        default=1000,
+        help="[int] Number of students to generate. Default is 1000.",
+    )
+    parser.add_argument(
+        "--number_of_wards",
+        "-nw",
+        type=int,
+        default=100,
+        help="[int] Number of wards to generate. Default is 100.",
+    )
+    parser.add_argument(
+        "--filename",
+        "-fn",
+        type=str,
+        default="data/synthetic_data.xlsx",
+        help="[str] The path of the xlsx file to save. Default is data/synthetic_data.xlsx.",
+    )
+    parser.add_argument(
+        "--seed", "-s", type=int, default=0, help="[int] Random seed. Default is 0."
+    )
+    args = parser.parse_args()
+
+    sheets = generate_sheets(args.number_of_students, args.number_of_wards, args.seed)
+    write_workbook(sheets, args.filename)
+    print(
+        f"Synthetic data saved to {args.filename} with {args.number_of_students} students, {args.number_of_wards} wards and {len(sheets['placements'])} cohort placements"
+    )
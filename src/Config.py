@@ -0,0 +1,192 @@
+from dataclasses import MISSING, dataclass, fields
+import os
+import yaml
+
+
+DEFAULT_CONFIG_PATH = "config/params.yml"
+
+# The tool's folder, which relative paths in params.yml such as checkpoint_file are relative to
+TOOL_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def tool_path(path: str) -> str:
+    """
+    Function to find a file or folder named in params.yml, so that it is the same wherever the tool is run from
+
+    :param path: path from params.yml, relative to the tool's folder unless it is an absolute path
+    :returns: the path, joined to the tool's folder if it is relative
+    """
+    return os.path.join(TOOL_DIRECTORY, path)
+
+
+def convert_value(section_class: type, field, value):
+    """
+    Function to convert a value read from params.yml to the type of its field. Bools must be given as True or False,
+    or as those words in quotes, as converting any other non-empty string or number with bool would make it True.
+    Ints must be whole numbers, as converting 0.5 with int would quietly make it 0
+
+    :param section_class: the dataclass for the section
+    :param field: the dataclass field the value is for
+    :param value: the value read from params.yml
+    :returns: the value converted to the type of the field
+    :raises ValueError: raises exception if the value is empty or cannot be read as the type of the field
+    """
+    name = f"{field.name} in {section_class.__name__}"
+    if value is None:
+        raise ValueError(f"{name} must be given a value")
+
+    if field.type is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        raise ValueError(f"{name} must be True or False, not {value!r}")
+
+    if field.type is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and value.strip().lstrip("+-").isdigit():
+            return int(value)
+        raise ValueError(f"{name} must be a whole number, not {value!r}")
+
+    try:
+        return field.type(value)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"{name} must be a {field.type.__name__}, not {value!r}"
+        ) from None
+
+
+def section_from_dict(section_class: type, section: dict):
+    """
+    Function to build one section of the config from its dictionary in params.yml. Parameters added since the first
+    version of the tool have defaults, so an older params.yml without them can still be read. A parameter with a
+    default which is left empty also takes its default
+
+    :param section_class: the dataclass for the section
+    :param section: dictionary of parameter names and values read from params.yml
+    :returns: an instance of section_class, with each value converted to the type of its field
+    :raises KeyError: raises exception if a parameter without a default is missing
+    """
+    missing = [
+        field.name
+        for field in fields(section_class)
+        if field.name not in section and field.default is MISSING
+    ]
+    if missing:
+        raise KeyError(
+            f"Missing parameters in {section_class.__name__}: {', '.join(missing)}"
+        )
+    return section_class(
+        **{
+            field.name: convert_value(section_class, field, section[field.name])
+            for field in fields(section_class)
+            if field.name in section
+            and not (section[field.name] is None and field.default is not MISSING)
+        }
+    )
+
+
+@dataclass(frozen=True)
+class UiParams:
+    """
+    Parameters for the user interface, see ui_params in config/params.yml. Parameters with a default may be left out of
+    the file
+    """
+
+    input_file_name: str
+    numberOfChromosomes: int
+    report_queue_size: int = 2
+    refresh_interval: float = 0.5
+
+
+@dataclass(frozen=True)
+class ScheduleParams:
+    """
+    Parameters for scoring schedules, see schedule_params in config/params.yml. Parameters with a default may be left
+    out of the file
+    """
+
+    within_capacity_scoring_factor: float
+    double_booked_scoring_factor: float
+    correct_num_wards_scoring_factor: float
+    uniq_departments_scoring_factor: float
+    uniq_wards_scoring_factor: float
+    all_placements_assigned_scoring_factor: float
+    capacity_utilisation_scoring_factor: float
+    medical_placement_check: bool
+    medical_placement_scoring_factor: float
+    surgical_placement_check: bool
+    surgical_placement_scoring_factor: float
+    community_placement_check: bool
+    community_placement_scoring_factor: float
+    critical_care_placement_check: bool
+    critical_care_placement_scoring_factor: float
+    seeding_attempts: int = 10
+    save_csv: bool = True
+    results_folder: str = "results"
+
+
+@dataclass(frozen=True)
+class GeneticAlgorithmParams:
+    """
+    Parameters for the genetic algorithm, see genetic_algorithm_params in config/params.yml. Parameters with a default
+    may be left out of the file
+    """
+
+    mutationProbability: float
+    recombinationProbability: float
+    num_mutations: int
+    recomb_points: int
+    max_no_change_iterations: int
+    fitness_threshold: float
+    changed_protected_proportion: float
+    new_schedule_prop: float
+    selection_method: str = "roulette"
+    tournament_size: int = 3
+    num_workers: int = 1
+    num_islands: int = 1
+    migration_interval: int = 5
+    num_migrants: int = 2
+    checkpoint_interval: int = 0
+    checkpoint_file: str = "checkpoints/ga_checkpoint.npz"
+    fitness_cache_size: int = 10000
+    collect_timings: bool = False
+    timings_file: str = ""
+
+
+@dataclass(frozen=True)
+class Config:
+    """
+    The Config holds the parameters from config/params.yml. It is read once and then shared by the GeneticAlgorithm and
+    every Schedule it creates, so that the file is not opened again while schedules are evolving. It cannot be changed
+    once loaded.
+
+    param: ui_params: UiParams for the user interface
+    param: schedule_params: ScheduleParams with the scoring weights and speciality checks
+    param: genetic_algorithm_params: GeneticAlgorithmParams controlling evolution of schedules
+    """
+
+    ui_params: UiParams
+    schedule_params: ScheduleParams
+    genetic_algorithm_params: GeneticAlgorithmParams
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CONFIG_PATH) -> "Config":
+        """
+        Function to read the config from a params.yml file
+
+        :param path: location of the params.yml file
+        :returns: a Config object
+        """
+        with open(path) as f:
+            params = yaml.load(f, Loader=yaml.FullLoader)
+
+        return cls(
+            **{
+                field.name: section_from_dict(field.type, params[field.name])
+                for field in fields(cls)
+            }
+        )
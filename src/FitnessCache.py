@@ -0,0 +1,115 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+
+class FitnessCache:
+    """
+    The FitnessCache remembers the fitness and viability of schedules which have already been scored, keyed on a hash of
+    their assignment array. Mutation and recombination often reproduce a schedule that has been seen before, and the
+    fittest schedules survive from one generation to the next, so looking them up avoids scoring them again. Once full,
+    the least recently used entry is dropped.
+
+    param: max_size: Integer number of schedules to remember. 0 turns the cache off
+    param: entries: An OrderedDict of (fitness, viable) tuples keyed on assignment hash, least recently used first
+    param: hits: Integer number of lookups which found a stored fitness
+    param: misses: Integer number of lookups which did not
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def genome_key(assignment: np.ndarray) -> bytes:
+        """
+        Function to produce the key for an assignment array. Equal assignments always give the same key
+
+        :param assignment: array with one ward id per placement
+        :returns: a 16 byte hash of the assignment
+        """
+        return hashlib.blake2b(
+            np.ascontiguousarray(assignment, dtype=np.int64).tobytes(), digest_size=16
+        ).digest()
+
+    def get(self, key: bytes) -> tuple:
+        """
+        Function to look up a stored fitness
+
+        :param key: the genome_key of the assignment
+        :returns: a tuple of fitness and viability, or None if the assignment has not been stored
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: bytes, value: tuple):
+        """
+        Function to store the fitness of an assignment, dropping the least recently used entry if the cache is full
+
+        :param key: the genome_key of the assignment
+        :param value: a tuple of fitness and viability
+        """
+        if not self.max_size:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def evaluate(self, assignments: list, evaluate_function) -> tuple:
+        """
+        Function to score a population of assignments, only passing those not already stored to evaluate_function.
+        An assignment which appears more than once in the population is only scored once
+
+        :param assignments: list of assignment arrays, one per schedule
+        :param evaluate_function: function taking a (schedules x placements) array and returning arrays of fitness and
+            viability
+        :returns: an array of fitness scores and a boolean array of whether each schedule is viable
+        """
+        if not self.max_size:
+            return evaluate_function(np.stack(assignments))
+
+        keys = [self.genome_key(assignment) for assignment in assignments]
+        results = [self.get(key) for key in keys]
+        # Indices of the schedules still to be scored, grouped by key so that copies are scored once
+        missing = {}
+        for index, result in enumerate(results):
+            if result is None:
+                missing.setdefault(keys[index], []).append(index)
+        if missing:
+            fitnesses, viable = evaluate_function(
+                np.stack([assignments[indices[0]] for indices in missing.values()])
+            )
+            for (key, indices), fitness, schedule_viable in zip(
+                missing.items(), fitnesses.tolist(), viable.tolist()
+            ):
+                self.put(key, (fitness, schedule_viable))
+                for index in indices:
+                    results[index] = (fitness, schedule_viable)
+
+        return (
+            np.array([fitness for fitness, _ in results], dtype=float),
+            np.array([schedule_viable for _, schedule_viable in results], dtype=bool),
+        )
+
+    def stats(self) -> dict:
+        """
+        Function to summarise how well the cache is working, to help choose its size
+
+        :returns: dictionary of the number of stored entries, maximum size, hits, misses and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,16 +1,51 @@
-from xmlrpc.client import Boolean
 from src.Schedule import Schedule
+from src.ProblemInstance import ProblemInstance
+from src.PopulationEvaluator import PopulationEvaluator
+from src.Config import Config, tool_path
+from src.WorkerPool import WorkerPool
+from src.Selection import SELECTION_METHODS
+from src.ReportWriter import ReportWriter, save_report
+from src.RunProgress import run_generations, run_generations_async
 from operator import itemgetter
 from datetime import datetime
 import numpy as np
+import dataclasses
+import hashlib
+import json
+import os
 import random
-import streamlit as st
-import yaml
 from random import randrange
 from typing import Tuple
 import logging
 
 
+# Increase whenever the contents of a checkpoint change, so that older checkpoints are not resumed
+CHECKPOINT_VERSION = 1
+
+# Genetic algorithm parameters which do not change the schedules a run reaches, left out of the checkpoint key
+CHECKPOINT_KEY_IGNORED = (
+    "num_workers",
+    "checkpoint_interval",
+    "checkpoint_file",
+    "fitness_cache_size",
+    "collect_timings",
+    "timings_file",
+)
+
+
+def run_checkpoint_file(checkpoint_file: str, run_index: int) -> str:
+    """
+    Function to name the checkpoint of one of several runs started together, so that each run has a checkpoint of its
+    own
+
+    :param checkpoint_file: path of the checkpoint from params.yml
+    :param run_index: integer number of the run, counting from 0
+    :returns: the path with the run number added before the extension
+    """
+    root, extension = os.path.splitext(checkpoint_file)
+    return f"{root}_{run_index}{extension}"
+
+
 class GeneticAlgorithm:
     """
     The Genetic Algorithm object is what drives the process behind the tool, orchestrating the generation, evolution and 
@@ -24,6 +59,10 @@ class GeneticAlgorithm:
     :param placements: A list of all placements to be allocated
     :param number_of_schedules: Integer number of schedules to be produced (dictates the population size)
     :param num_weeks: Integer number of weeks that placements will take place over
+    :param config: The Config read from config/params.yml, loaded here if not given
+    :param report_writer: A ReportWriter to save reports in the background, reports are saved straight away if not given
+    :param instance: The ProblemInstance of the slots, wards and placements, built here if not given
+    :param run_index: Integer number of this run among those started together, which each have their own checkpoint
     """
 
     def __init__(
@@ -33,63 +72,151 @@ class GeneticAlgorithm:
         placements: list,
         number_of_schedules: int,
         num_weeks: int,
+        config: Config = None,
+        report_writer: ReportWriter = None,
+        instance: ProblemInstance = None,
+        run_index: int = 0,
     ):
         self.slots = slots
         self.wards = wards
         self.placements = placements
         self.number_of_schedules = number_of_schedules
         self.num_weeks = num_weeks
+        if config is None:
+            config = Config.load()
+        self.config = config
+        self.report_writer = report_writer
+        # Turned off for the islands of an IslandModel, which saves the report of the chosen schedule itself
+        self.save_reports = True
+        if instance is None:
+            instance = ProblemInstance(slots, wards, placements, num_weeks)
+        self.instance = instance
+        self.evaluator = PopulationEvaluator(self.instance, config)
 
         self.schedules = []
         self.new_schedules = []
 
         self.iteration_count = 0
 
-        with open("config/params.yml") as f:
-            params = yaml.load(f, Loader=yaml.FullLoader)
+        ga_params = config.genetic_algorithm_params
 
         self.new_schedule_count = int(
-            self.number_of_schedules
-            * params["genetic_algorithm_params"]["new_schedule_prop"]
+            self.number_of_schedules * ga_params.new_schedule_prop
         )
 
-        self.mutation_probability = params["genetic_algorithm_params"][
-            "mutationProbability"
-        ]
-        self.recombination_probability = params["genetic_algorithm_params"][
-            "recombinationProbability"
-        ]
-        self.num_mutations = params["genetic_algorithm_params"][
-            "num_mutations"
-        ]  # Note that this is number of mutations per schedule
-        self.recomb_points = params["genetic_algorithm_params"]["recomb_points"]
-        self.max_no_change_iterations = params["genetic_algorithm_params"][
-            "max_no_change_iterations"
-        ]
-        self.fitness_threshold = params["genetic_algorithm_params"]["fitness_threshold"]
-        self.changed_protected_proportion = params["genetic_algorithm_params"][
-            "changed_protected_proportion"
-        ]
+        self.mutation_probability = ga_params.mutationProbability
+        self.recombination_probability = ga_params.recombinationProbability
+        self.num_mutations = (
+            ga_params.num_mutations
+        )  # Note that this is number of mutations per schedule
+        self.recomb_points = ga_params.recomb_points
+        self.max_no_change_iterations = ga_params.max_no_change_iterations
+        self.fitness_threshold = ga_params.fitness_threshold
+        self.changed_protected_proportion = ga_params.changed_protected_proportion
+        if ga_params.selection_method not in SELECTION_METHODS:
+            raise ValueError(
+                f"Unknown selection_method {ga_params.selection_method}, choose from {', '.join(SELECTION_METHODS)}"
+            )
+        self.selection_function = SELECTION_METHODS[ga_params.selection_method]
+        self.tournament_size = ga_params.tournament_size
+        self.checkpoint_interval = ga_params.checkpoint_interval
+        # Relative to the tool's folder, so the checkpoint is found wherever the tool is run from
+        self.run_index = run_index
+        self.checkpoint_file = run_checkpoint_file(
+            tool_path(ga_params.checkpoint_file), run_index
+        )
+
+        # Generation and scoring of schedules is spread across processes when num_workers is above 1
+        self.workers = WorkerPool(
+            self.instance, config, ga_params.num_workers, self.evaluator
+        )
+        # Schedules already scored in this process, so that unchanged schedules are not scored again
+        self.fitness_cache = self.workers.context.fitness_cache
+        # Time spent in each phase, recorded when collect_timings is on
+        self.stats = self.workers.context.stats
 
         self.last_fitness = 0
         self.no_change_count = 0
+        # Set by load_checkpoint, and by run once a schedule has been chosen
+        self.resumed = False
+        self.chosen_schedule = None
+
+    def start(self, resume: bool = False) -> Tuple[bool, object, float, int, list]:
+        """
+        Function to begin a run. When asked to resume, the run carries on from its last checkpoint if checkpoints are
+        on and one was saved for this run and problem. Otherwise the first generation of schedules is seeded and
+        evaluated
+
+        :param resume: bool of whether to carry on from the checkpoint of a run which was stopped part way through
+        :returns: the same details as evaluate
+        """
+        if resume and self.checkpoint_interval and self.load_checkpoint():
+            return self.resume_status()
+        self.seed_schedules()
+        return self.evaluate()
+
+    def run(self, **run_options):
+        """
+        Function to run the algorithm from start to finish, as a generator yielding a GenerationSnapshot of the progress
+        after each generation and returning the chosen schedule. See run_generations in RunProgress.py for the resume,
+        max_generations, time_budget, should_stop, min_interval and histogram_bins options
+
+        :returns: the chosen schedule, also kept as chosen_schedule
+        """
+        return run_generations(self, **run_options)
+
+    def run_async(self, **run_options):
+        """
+        Function to run the algorithm from start to finish as an asynchronous generator of GenerationSnapshots, with
+        each generation run on a separate thread. Takes the same options as run
+
+        :returns: an asynchronous generator of GenerationSnapshots, the chosen schedule is kept as chosen_schedule
+        """
+        return run_generations_async(self, **run_options)
+
+    def stop(self) -> Schedule:
+        """
+        Function to end a run before evaluate has chosen a schedule, for example when its time budget has run out. The
+        fittest schedule so far is chosen and its report saved, and any checkpoint is removed as the run is over
+
+        :returns: the chosen schedule
+        """
+        chosen_schedule = self.fittest_schedules(1)[0]["schedule"]
+        with self.stats.phase("report_schedule"):
+            chosen_schedule.populate_schedule()
+            self.save_schedule_report(chosen_schedule)
+        if self.checkpoint_interval:
+            self.remove_checkpoint()
+        return chosen_schedule
+
+    def count_viable(self) -> int:
+        """
+        Function to count the viable schedules in the population
+
+        :returns: integer number of viable schedules
+        """
+        return sum(bool(schedule["schedule"].viable) for schedule in self.schedules)
 
     def seed_schedules(self):
         """
         Function to initialise the first generation of schedules
         """
-        for i in range(0, self.number_of_schedules):
-            schedule_obj = Schedule(
-                self.slots, self.wards, self.placements, self.num_weeks
-            )
-            schedule_obj.schedule_generation()
-            schedule_obj.get_fitness()
-            self.schedules.append(
-                {
-                    "schedule": schedule_obj,
-                    "fitness": schedule_obj.fitness,
-                    "sched_id": randrange(9999),
-                }
+        seeds = [random.getrandbits(32) for i in range(0, self.number_of_schedules)]
+        with self.stats.phase("seed_schedules"):
+            for schedule_obj in self.workers.generate(seeds):
+                self.schedules.append(
+                    {
+                        "schedule": schedule_obj,
+                        "fitness": schedule_obj.fitness,
+                        "sched_id": randrange(9999),
+                    }
+                )
+        most_unplaceable = max(
+            len(schedule["schedule"].unplaceable) for schedule in self.schedules
+        )
+        if most_unplaceable:
+            logging.warning(
+                f"Up to {most_unplaceable} placements per schedule could not be placed on a ward with room and have been left unassigned"
             )
 
     def viable_schedule_check(self) -> Tuple[bool, object, list]:
@@ -99,14 +226,20 @@ class GeneticAlgorithm:
         :returns: bool to determine whether evaluation should continue, a schedule and a list of schedule fitnesses
         """
         continue_eval = True
-        schedule_fitnesses = []
-        for schedule in self.schedules:
-            schedule["schedule"].populate_schedule()
-            schedule_fitnesses.append(schedule["schedule"].fitness)
-            if (schedule["schedule"].fitness > self.fitness_threshold) and (
-                schedule["schedule"].viable
-            ):
-                schedule["schedule"].save_report()
+        with self.stats.phase("score_population"):
+            fitnesses, viable = self.fitness_cache.evaluate(
+                [schedule["schedule"].assignment for schedule in self.schedules],
+                self.workers.evaluate,
+            )
+        schedule_fitnesses = fitnesses.tolist()
+        for schedule, fitness, schedule_viable in zip(
+            self.schedules, schedule_fitnesses, viable
+        ):
+            schedule["fitness"] = fitness
+            if (fitness > self.fitness_threshold) and schedule_viable:
+                with self.stats.phase("report_schedule"):
+                    schedule["schedule"].populate_schedule()
+                    self.save_schedule_report(schedule["schedule"])
                 logging.info(
                     f'Viable schedule identified with fitness of {schedule["schedule"].fitness}, saving'
                 )
@@ -115,6 +248,15 @@ class GeneticAlgorithm:
         if continue_eval:
             return continue_eval, None, schedule_fitnesses
 
+    def save_schedule_report(self, schedule: Schedule):
+        """
+        Function to save the report of a chosen schedule, with the ReportWriter if there is one
+
+        :param schedule: the schedule to be reported on
+        """
+        if self.save_reports:
+            save_report(schedule, self.report_writer)
+
     def status_update(self):
         """
         Function to output status update to demonstrate progress in evolving schedules
@@ -129,6 +271,7 @@ class GeneticAlgorithm:
                 f'At {now} the best fitness in generation is schedule {self.schedules[total_schedules - 1]["sched_id"]} with: {self.last_fitness}'
             )
             self.no_change_count = 0
+        logging.debug(f"Fitness cache: {self.fitness_cache.stats()}")
         self.iteration_count += 1
         return self.iteration_count
 
@@ -146,9 +289,12 @@ class GeneticAlgorithm:
         if self.last_fitness == self.schedules[total_schedules - 1]["fitness"]:
             self.no_change_count += 1
             if self.no_change_count >= self.max_no_change_iterations:
-                self.schedules[total_schedules - 1]["schedule"].populate_schedule()
-                self.schedules[total_schedules - 1]["schedule"].save_report()
-                self.schedules[total_schedules - 1]["schedule"].get_fitness()
+                with self.stats.phase("report_schedule"):
+                    self.schedules[total_schedules - 1]["schedule"].populate_schedule()
+                    self.save_schedule_report(
+                        self.schedules[total_schedules - 1]["schedule"]
+                    )
+                    self.schedules[total_schedules - 1]["schedule"].get_fitness()
                 logging.info(
                     f"The algorithm has passed more then {self.max_no_change_iterations} without an improvement in fitness, program terminating"
                 )
@@ -165,20 +311,46 @@ class GeneticAlgorithm:
 
         :returns: bool to determine if evaluation should continue and then details on current best schedule
         """
-        (
-            continue_eval,
-            chosen_schedule,
-            schedule_fitnesses,
-        ) = self.viable_schedule_check()
-        iter_count = self.status_update()
-        if continue_eval:
-            continue_eval, chosen_schedule = self.no_change_check()
+        with self.stats.phase("evaluate"):
+            (
+                continue_eval,
+                chosen_schedule,
+                schedule_fitnesses,
+            ) = self.viable_schedule_check()
+            iter_count = self.status_update()
+            if continue_eval:
+                continue_eval, chosen_schedule = self.no_change_check()
+        if self.checkpoint_interval:
+            if not continue_eval:
+                self.remove_checkpoint()
+            elif iter_count % self.checkpoint_interval == 0:
+                with self.stats.phase("save_checkpoint"):
+                    self.save_checkpoint()
         if chosen_schedule is None:
             fitness = self.last_fitness
         else:
             fitness = chosen_schedule.fitness
+        self.end_generation(iter_count, fitness)
         return continue_eval, chosen_schedule, fitness, iter_count, schedule_fitnesses
 
+    def end_generation(self, iteration: int, fitness: float):
+        """
+        Function to finish the timings of a generation, if collect_timings is on, writing them to timings_file with the
+        state of the population
+
+        :param iteration: the integer number of the generation
+        :param fitness: the best fitness found so far
+        """
+        if not self.stats.enabled:
+            return
+        self.stats.end_generation(
+            iteration,
+            best_fitness=fitness,
+            population_size=len(self.schedules),
+            no_change_count=self.no_change_count,
+            fitness_cache=self.fitness_cache.stats(),
+        )
+
     def execute_mutation(self):
         """
         Function to randomly determine which schedules should be mutated
@@ -187,46 +359,41 @@ class GeneticAlgorithm:
         """
         self.new_schedules = []
         # Mutate a proportion of the schedules
+        mutations = []
         for mutation_index in range(0, len(self.schedules) - 1):
             if random.uniform(0, 1) <= self.mutation_probability:
-                mutuated_schedule = self.schedules[mutation_index]["schedule"].mutation(
-                    self.num_mutations
-                )
-                self.new_schedules.append(
-                    {
-                        "schedule": mutuated_schedule,
-                        "fitness": mutuated_schedule.fitness,
-                        "sched_id": randrange(9999),
-                    }
+                mutations.append(
+                    (random.getrandbits(32), self.schedules[mutation_index]["schedule"])
                 )
+        for mutuated_schedule in self.workers.mutate(mutations, self.num_mutations):
+            self.new_schedules.append(
+                {
+                    "schedule": mutuated_schedule,
+                    "fitness": mutuated_schedule.fitness,
+                    "sched_id": randrange(9999),
+                }
+            )
 
-    def select_parents(self) -> int:
+    def select_parents(self) -> list:
         """
-        Function to use a roulette wheel approach (i.e. probability of selection is
-        proportional to fitness of schedule) to select parents for recombination
+        Function to select parents for recombination. Each schedule is paired with a second parent chosen using the
+        selection_method set in params.yml: a roulette wheel (probability of selection is proportional to fitness of
+        schedule), stochastic universal sampling, or a tournament between tournament_size schedules
 
-        :returns: a list of schedules to be used as parents for recombination
+        :returns: a list of pairs of schedule indices to be used as parents for recombination
         """
-        total_fitness = 0
         population_size = len(self.schedules)
-        for schedule in self.schedules:
-            total_fitness += schedule["fitness"]
-
-        prob_selection = [i / total_fitness for i in range(population_size)]
-        cum_prob = np.cumsum(prob_selection)
-        select_indices = [random.random() for i in range(population_size)]
-        selected_parents = []
-
-        for parent_one_index in range(population_size):
-            for parent_two_index in range(population_size):
-                if (
-                    cum_prob[parent_two_index] < (select_indices[parent_one_index])
-                    and cum_prob[parent_two_index + 1]
-                    >= select_indices[parent_one_index]
-                ):
-                    pair = (parent_one_index, parent_two_index)
-                    if parent_one_index != parent_two_index:
-                        selected_parents.append(pair)
+        fitnesses = np.array([schedule["fitness"] for schedule in self.schedules])
+        rng = np.random.default_rng(random.getrandbits(64))
+        second_parents = self.selection_function(
+            fitnesses, population_size, rng, tournament_size=self.tournament_size
+        )
+
+        selected_parents = [
+            (parent_one_index, int(parent_two_index))
+            for parent_one_index, parent_two_index in enumerate(second_parents)
+            if parent_one_index != parent_two_index
+        ]
 
         return selected_parents
 
@@ -237,22 +404,27 @@ class GeneticAlgorithm:
         :param selected_parents: a list of schedules to be used as parents for recombination
         :returns: no explicit return but populates new_schedules class object with recombined schedules
         """
+        pairs = []
         for pair in selected_parents:
             if random.uniform(0, 1) <= self.recombination_probability:
-                offspring_schedules = self.schedules[pair[0]]["schedule"].recombination(
-                    self.schedules[pair[1]]["schedule"],
-                    int(np.round(self.num_weeks / self.recomb_points, 0)),
-                    1,
-                )
-                for schedule in offspring_schedules:
-                    schedule.get_fitness()
-                    self.new_schedules.append(
-                        {
-                            "schedule": schedule,
-                            "fitness": schedule.fitness,
-                            "sched_id": randrange(9999),
-                        }
+                pairs.append(
+                    (
+                        random.getrandbits(32),
+                        self.schedules[pair[0]]["schedule"],
+                        self.schedules[pair[1]]["schedule"],
                     )
+                )
+        for offspring_schedules in self.workers.recombine(
+            pairs, int(np.round(self.num_weeks / self.recomb_points, 0)), 1
+        ):
+            for schedule in offspring_schedules:
+                self.new_schedules.append(
+                    {
+                        "schedule": schedule,
+                        "fitness": schedule.fitness,
+                        "sched_id": randrange(9999),
+                    }
+                )
 
     def culling(self, num_new_schedules: int):
         """
@@ -261,12 +433,8 @@ class GeneticAlgorithm:
         :param num_new_schedules: the integer number of new schedules to be generated/to be replaced in existing population
         :returns: no explicit return but populates new_schedules class object with newly generated schedules
         """
-        for i in range(0, num_new_schedules):
-            schedule_obj = Schedule(
-                self.slots, self.wards, self.placements, self.num_weeks
-            )
-            schedule_obj.schedule_generation()
-            schedule_obj.get_fitness()
+        seeds = [random.getrandbits(32) for i in range(0, num_new_schedules)]
+        for schedule_obj in self.workers.generate(seeds):
             self.new_schedules.append(
                 {
                     "schedule": schedule_obj,
@@ -292,17 +460,53 @@ class GeneticAlgorithm:
         ):
             self.schedules[i] = self.new_schedules[i]
 
+    def evolve_population(self):
+        """
+        Function to produce the next generation of schedules through culling, mutation and recombination
+
+        :returns: no explicit return but replaces schedules in the schedules class object
+        """
+        self.new_schedules = []
+        with self.stats.phase("culling"):
+            self.culling(self.new_schedule_count)
+        with self.stats.phase("execute_mutation"):
+            self.execute_mutation()
+        with self.stats.phase("select_parents"):
+            selected_parents = self.select_parents()
+        with self.stats.phase("generate_offspring"):
+            self.generate_offspring(selected_parents)
+        with self.stats.phase("update_population"):
+            self.update_population()
+
+    def fittest_schedules(self, num_schedules: int) -> list:
+        """
+        Function to find the fittest schedules in the population
+
+        :param num_schedules: the integer number of schedules to return
+        :returns: list of schedule dictionaries, fittest last
+        """
+        return sorted(self.schedules, key=itemgetter("fitness"))[
+            max(0, len(self.schedules) - num_schedules) :
+        ]
+
+    def receive_migrants(self, migrants: list):
+        """
+        Function to replace the least fit schedules with schedules from another population
+
+        :param migrants: list of schedule dictionaries to be added to the population
+        :returns: no explicit return but replaces lowest scoring schedules in schedules class object
+        """
+        self.schedules = sorted(self.schedules, key=itemgetter("fitness"))
+        for i, migrant in enumerate(migrants[: len(self.schedules)]):
+            self.schedules[i] = migrant
+
     def evolve(self) -> Tuple[bool, object, float, int, list]:
         """
         Function to execute the genetic algorithm until convergence or no change found
 
         :returns: bool to determine if evaluation should continue as well as details on best performing schedule
         """
-        self.new_schedules = []
-        self.culling(self.new_schedule_count)
-        self.execute_mutation()
-        self.generate_offspring(self.select_parents())
-        self.update_population()
+        self.evolve_population()
         (
             continue_eval,
             chosen_schedule,
@@ -311,3 +515,199 @@ class GeneticAlgorithm:
             schedule_fitnesses,
         ) = self.evaluate()
         return continue_eval, chosen_schedule, fitness, iteration, schedule_fitnesses
+
+    def checkpoint_key(self) -> str:
+        """
+        Function to produce a key identifying the problem being solved, so that a checkpoint is only resumed by the run
+        with the same number, placements, wards, population size and parameters. Parameters which do not change the
+        schedules a run reaches, such as the number of workers, are left out so that they can be changed between runs
+
+        :returns: hex digest of the key
+        """
+        key = hashlib.blake2b(
+            f"checkpoint version {CHECKPOINT_VERSION} {self.num_weeks} {self.number_of_schedules} {self.run_index}".encode(),
+            digest_size=16,
+        )
+        key.update(repr(self.config.schedule_params).encode())
+        ga_params = self.config.genetic_algorithm_params
+        key.update(
+            repr(
+                {
+                    field.name: getattr(ga_params, field.name)
+                    for field in dataclasses.fields(ga_params)
+                    if field.name not in CHECKPOINT_KEY_IGNORED
+                }
+            ).encode()
+        )
+        key.update(repr(self.instance.ward_names).encode())
+        for array in (
+            self.instance.placement_start_week,
+            self.instance.placement_duration,
+            self.instance.placement_part,
+            self.instance.placement_student,
+            self.instance.ward_capacity,
+            self.instance.covid_conflict,
+            self.instance.ward_history_keys,
+            self.instance.department_history_keys,
+        ):
+            key.update(np.ascontiguousarray(array).tobytes())
+        return key.hexdigest()
+
+    def save_checkpoint(self, file_name: str = None):
+        """
+        Function to save the population and the state of the random number generator, so that a stopped run can be
+        resumed with load_checkpoint and reach the same result as if it had not stopped. Assignments are saved in the
+        smallest integer type which holds every ward id. The checkpoint is written to a temporary file which then
+        replaces the previous checkpoint, so a run stopped while writing leaves the previous checkpoint intact
+
+        :param file_name: path of the checkpoint, checkpoint_file from params.yml if not given
+        """
+        if file_name is None:
+            file_name = self.checkpoint_file
+        directory = os.path.dirname(file_name)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        random_version, random_internal, random_gauss = random.getstate()
+        details = {
+            "key": self.checkpoint_key(),
+            "iteration_count": self.iteration_count,
+            "no_change_count": self.no_change_count,
+            "last_fitness": self.last_fitness,
+            "random_version": random_version,
+            "random_gauss": random_gauss,
+        }
+        schedules = [schedule["schedule"] for schedule in self.schedules]
+        assignment_type = np.min_scalar_type(-max(1, self.instance.num_wards))
+
+        temporary_file = f"{file_name}.tmp"
+        with open(temporary_file, "wb") as checkpoint:
+            np.savez(
+                checkpoint,
+                details=np.array(json.dumps(details)),
+                assignments=np.stack(
+                    [schedule.assignment for schedule in schedules]
+                ).astype(assignment_type),
+                fitnesses=np.array(
+                    [schedule["fitness"] for schedule in self.schedules], dtype=float
+                ),
+                schedule_fitnesses=np.array(
+                    [schedule.fitness for schedule in schedules], dtype=float
+                ),
+                viable=np.array(
+                    [schedule.viable for schedule in schedules], dtype=bool
+                ),
+                generations=np.array(
+                    [schedule.generation for schedule in schedules], dtype=np.int64
+                ),
+                sched_ids=np.array(
+                    [schedule["sched_id"] for schedule in self.schedules],
+                    dtype=np.int64,
+                ),
+                random_internal=np.array(random_internal, dtype=np.uint32),
+            )
+        os.replace(temporary_file, file_name)
+        logging.info(
+            f"Checkpoint saved to {file_name} at iteration {self.iteration_count}"
+        )
+
+    def load_checkpoint(self, file_name: str = None) -> bool:
+        """
+        Function to restore a population saved by save_checkpoint, in place of seed_schedules. The run then carries on
+        from resume_status with evolve. A checkpoint saved for a different problem is ignored
+
+        :param file_name: path of the checkpoint, checkpoint_file from params.yml if not given
+        :returns: bool of whether a checkpoint was restored
+        """
+        if file_name is None:
+            file_name = self.checkpoint_file
+        if not os.path.exists(file_name):
+            return False
+
+        with np.load(file_name) as checkpoint:
+            details = json.loads(str(checkpoint["details"]))
+            if details["key"] != self.checkpoint_key():
+                logging.warning(
+                    f"Checkpoint {file_name} was saved for a different problem or parameters, starting a new run"
+                )
+                return False
+            self.schedules = [
+                {
+                    "schedule": Schedule.from_assignment(
+                        assignment,
+                        self.instance,
+                        self.config,
+                        generation,
+                        schedule_fitness,
+                        viable,
+                    ),
+                    "fitness": fitness,
+                    "sched_id": sched_id,
+                }
+                for (
+                    assignment,
+                    fitness,
+                    schedule_fitness,
+                    viable,
+                    generation,
+                    sched_id,
+                ) in zip(
+                    checkpoint["assignments"],
+                    checkpoint["fitnesses"].tolist(),
+                    checkpoint["schedule_fitnesses"].tolist(),
+                    checkpoint["viable"].tolist(),
+                    checkpoint["generations"].tolist(),
+                    checkpoint["sched_ids"].tolist(),
+                )
+            ]
+            random.setstate(
+                (
+                    details["random_version"],
+                    tuple(checkpoint["random_internal"].tolist()),
+                    details["random_gauss"],
+                )
+            )
+
+        self.iteration_count = details["iteration_count"]
+        self.no_change_count = details["no_change_count"]
+        self.last_fitness = details["last_fitness"]
+        self.resumed = True
+        logging.info(
+            f"Resumed from checkpoint {file_name} at iteration {self.iteration_count}"
+        )
+        return True
+
+    def resume_status(self) -> Tuple[bool, object, float, int, list]:
+        """
+        Function to give the details returned by evaluate for the generation a restored checkpoint was saved at. The
+        generation is not evaluated again, as that would count it twice
+
+        :returns: the same details as evaluate
+        """
+        return (
+            True,
+            None,
+            self.last_fitness,
+            self.iteration_count,
+            [schedule["fitness"] for schedule in self.schedules],
+        )
+
+    def remove_checkpoint(self, file_name: str = None):
+        """
+        Function to delete the checkpoint once the run has finished, so that the next run starts afresh
+
+        :param file_name: path of the checkpoint, checkpoint_file from params.yml if not given
+        """
+        if file_name is None:
+            file_name = self.checkpoint_file
+        if os.path.exists(file_name):
+            os.remove(file_name)
+
+    def close(self):
+        """
+        Function to shut down any worker processes once the algorithm has finished, logging where the time of the
+        run went if collect_timings is on
+        """
+        if self.stats.enabled and self.stats.generations:
+            logging.info(self.stats.summary())
+        self.workers.close()
@@ -0,0 +1,418 @@
+import dataclasses
+import logging
+import multiprocessing
+import random
+from datetime import datetime
+from typing import Tuple
+from src.GeneticAlgorithm import GeneticAlgorithm
+from src.Schedule import Schedule
+from src.ProblemInstance import ProblemInstance
+from src.Config import Config
+from src.ReportWriter import ReportWriter, save_report
+from src.RunStats import RunStats
+from src.RunProgress import run_generations, run_generations_async
+
+
+def island_status(island: GeneticAlgorithm, num_migrants: int) -> dict:
+    """
+    Function to summarise the state of an island after it has been evaluated
+
+    :param island: the GeneticAlgorithm of the island
+    :param num_migrants: integer number of fittest schedules to send to the next island
+    :returns: dictionary of the island's fitnesses, fittest schedule and emigrants, with schedules as states
+    """
+    fittest = island.fittest_schedules(max(1, num_migrants))
+    emigrants = fittest[len(fittest) - num_migrants :] if num_migrants else []
+    return {
+        "fitnesses": [schedule["fitness"] for schedule in island.schedules],
+        "best_fitness": fittest[-1]["fitness"],
+        "num_viable": island.count_viable(),
+        "best": fittest[-1]["schedule"].export_state(),
+        "emigrants": [
+            dict(schedule, schedule=schedule["schedule"].export_state())
+            for schedule in emigrants
+        ],
+    }
+
+
+def run_island(
+    connection,
+    slots: list,
+    wards: list,
+    placements: list,
+    number_of_schedules: int,
+    num_weeks: int,
+    config: Config,
+    seed: int,
+    num_migrants: int,
+    instance: ProblemInstance,
+):
+    """
+    Function run in each island process. It holds one GeneticAlgorithm population and carries out the commands sent by
+    the IslandModel until told to close
+
+    :param connection: the island's end of a Pipe to the IslandModel
+    :param slots: A list of all potential placement week positions
+    :param wards: A list of all potential wards that placements can be taken on
+    :param placements: A list of all placements to be allocated
+    :param number_of_schedules: Integer number of schedules in the island's population
+    :param num_weeks: Integer number of weeks that placements will take place over
+    :param config: The Config read from config/params.yml
+    :param seed: Integer seed for the island's random numbers
+    :param num_migrants: Integer number of schedules sent to the next island at each migration
+    :param instance: The ProblemInstance of the slots, wards and placements
+    """
+    random.seed(seed)
+    island = GeneticAlgorithm(
+        slots,
+        wards,
+        placements,
+        number_of_schedules,
+        num_weeks,
+        config,
+        instance=instance,
+    )
+    # The chosen schedule is sent back to the IslandModel, which saves its report
+    island.save_reports = False
+
+    while True:
+        command, arguments = connection.recv()
+        if command == "close":
+            break
+
+        if command == "seed":
+            island.seed_schedules()
+            num_generations = 0
+        elif command == "evolve":
+            num_generations, immigrants = arguments
+            island.receive_migrants(
+                [
+                    dict(
+                        schedule,
+                        schedule=Schedule.from_state(
+                            schedule["schedule"], island.instance, island.config
+                        ),
+                    )
+                    for schedule in immigrants
+                ]
+            )
+
+        generation = 0
+        continue_eval, chosen_schedule, _ = island.viable_schedule_check()
+        while continue_eval and generation < num_generations:
+            island.evolve_population()
+            generation += 1
+            continue_eval, chosen_schedule, _ = island.viable_schedule_check()
+
+        status = island_status(island, num_migrants)
+        status["generations"] = generation
+        status["timings"] = island.stats.take()
+        status["chosen"] = (
+            None if chosen_schedule is None else chosen_schedule.export_state()
+        )
+        connection.send(status)
+
+    island.close()
+    connection.close()
+
+
+class IslandModel:
+    """
+    The IslandModel runs several GeneticAlgorithm populations (islands) side by side, each in its own process. The
+    islands evolve independently, and every few generations the fittest schedules of each island migrate to the next
+    island in a ring, replacing its least fit schedules. Keeping separate populations makes it less likely that every
+    schedule converges on the same local optimum, while spreading the work across cores.
+
+    The IslandModel has the same seed_schedules, evaluate and evolve functions as the GeneticAlgorithm, so it can be used
+    in its place. Evaluation stops as soon as any island finds a viable schedule above the fitness threshold, or when
+    the best fitness across all islands has not improved for max_no_change_iterations generations.
+
+    For more detail see documentation at docs/ga.md
+
+    :param slots: A list of all potential placement week positions
+    :param wards: A list of all potential wards that placements can be taken on
+    :param placements: A list of all placements to be allocated
+    :param number_of_schedules: Integer number of schedules to be produced, split evenly between the islands
+    :param num_weeks: Integer number of weeks that placements will take place over
+    :param config: The Config read from config/params.yml, loaded here if not given
+    :param report_writer: A ReportWriter to save reports in the background, reports are saved straight away if not given
+    :param instance: The ProblemInstance of the slots, wards and placements, built here if not given
+    """
+
+    def __init__(
+        self,
+        slots: list,
+        wards: list,
+        placements: list,
+        number_of_schedules: int,
+        num_weeks: int,
+        config: Config = None,
+        report_writer: ReportWriter = None,
+        instance: ProblemInstance = None,
+    ):
+        if config is None:
+            config = Config.load()
+        self.config = config
+        self.report_writer = report_writer
+        self.num_weeks = num_weeks
+        # Used to rebuild schedules sent back from the islands, and sent to each island so that it is not built again
+        if instance is None:
+            instance = ProblemInstance(slots, wards, placements, num_weeks)
+        self.instance = instance
+
+        ga_params = config.genetic_algorithm_params
+        self.num_islands = ga_params.num_islands
+        self.migration_interval = ga_params.migration_interval
+        self.num_migrants = ga_params.num_migrants
+        self.max_no_change_iterations = ga_params.max_no_change_iterations
+        self.island_size = max(2, number_of_schedules // self.num_islands)
+
+        # Each island is already a separate process, so islands do not start worker pools of their own. Islands send
+        # their timings back with their status, to be written to the timings file here
+        island_config = dataclasses.replace(
+            config,
+            genetic_algorithm_params=dataclasses.replace(
+                ga_params, num_workers=1, timings_file=""
+            ),
+        )
+        self.stats = RunStats(ga_params.collect_timings, ga_params.timings_file)
+
+        self.connections = []
+        self.processes = []
+        for island_index in range(self.num_islands):
+            connection, island_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=run_island,
+                args=(
+                    island_connection,
+                    slots,
+                    wards,
+                    placements,
+                    self.island_size,
+                    num_weeks,
+                    island_config,
+                    random.getrandbits(32),
+                    self.num_migrants,
+                    self.instance,
+                ),
+                daemon=True,
+            )
+            process.start()
+            self.connections.append(connection)
+            self.processes.append(process)
+
+        self.island_statuses = []
+        self.iteration_count = 0
+        self.last_fitness = 0
+        self.no_change_count = 0
+        # Checkpoints are not used with islands, so a run never resumes
+        self.resumed = False
+        self.chosen_schedule = None
+
+    def send_command(self, command: str, arguments: list) -> list:
+        """
+        Function to send a command to every island and wait for them all to finish
+
+        :param command: the command to be carried out, "seed" or "evolve"
+        :param arguments: list with the arguments for each island
+        :returns: list of the status returned by each island
+        """
+        with self.stats.phase(f"{command}_islands"):
+            for connection, island_arguments in zip(self.connections, arguments):
+                connection.send((command, island_arguments))
+            statuses = [connection.recv() for connection in self.connections]
+        for status in statuses:
+            self.stats.merge(status["timings"])
+        return statuses
+
+    def start(self, resume: bool = False) -> Tuple[bool, object, float, int, list]:
+        """
+        Function to begin a run by seeding and evaluating the first generation of schedules on every island. Islands
+        are not checkpointed, so there is nothing to resume from
+
+        :param resume: ignored, taken so that islands are started as GeneticAlgorithm.start
+        :returns: the same details as evaluate
+        """
+        self.seed_schedules()
+        return self.evaluate()
+
+    def run(self, **run_options):
+        """
+        Function to run the islands from start to finish, as a generator yielding a GenerationSnapshot of the progress
+        after each migration and returning the chosen schedule, as GeneticAlgorithm.run
+
+        :returns: the chosen schedule, also kept as chosen_schedule
+        """
+        return run_generations(self, **run_options)
+
+    def run_async(self, **run_options):
+        """
+        Function to run the islands from start to finish as an asynchronous generator of GenerationSnapshots, as
+        GeneticAlgorithm.run_async
+
+        :returns: an asynchronous generator of GenerationSnapshots, the chosen schedule is kept as chosen_schedule
+        """
+        return run_generations_async(self, **run_options)
+
+    def stop(self) -> Schedule:
+        """
+        Function to end a run before evaluate has chosen a schedule, choosing the fittest schedule across all islands
+        and saving its report
+
+        :returns: the chosen schedule
+        """
+        best_status = max(
+            self.island_statuses, key=lambda status: status["best_fitness"]
+        )
+        chosen_schedule = self.rebuild_schedule(best_status["best"])
+        chosen_schedule.populate_schedule()
+        save_report(chosen_schedule, self.report_writer)
+        return chosen_schedule
+
+    def count_viable(self) -> int:
+        """
+        Function to count the viable schedules across all islands
+
+        :returns: integer number of viable schedules
+        """
+        return sum(status["num_viable"] for status in self.island_statuses)
+
+    def seed_schedules(self):
+        """
+        Function to initialise the first generation of schedules on every island
+        """
+        self.island_statuses = self.send_command("seed", [None] * self.num_islands)
+
+    def viable_schedule_check(self) -> Tuple[bool, object, list]:
+        """
+        Function to check whether any island has found a viable schedule with the prequisite level of fitness, and
+        save its report
+
+        :returns: bool to determine whether evaluation should continue, a schedule and a list of schedule fitnesses
+        """
+        schedule_fitnesses = [
+            fitness
+            for status in self.island_statuses
+            for fitness in status["fitnesses"]
+        ]
+        for status in self.island_statuses:
+            if status["chosen"] is not None:
+                chosen_schedule = self.rebuild_schedule(status["chosen"])
+                logging.info(
+                    f"Viable schedule identified with fitness of {chosen_schedule.fitness}, saving"
+                )
+                save_report(chosen_schedule, self.report_writer)
+                return False, chosen_schedule, schedule_fitnesses
+        return True, None, schedule_fitnesses
+
+    def no_change_check(self) -> Tuple[bool, object]:
+        """
+        Function to check whether the best fitness across all islands has improved. If not for max_no_change_iterations
+        generations, the fittest schedule is saved
+
+        :returns: bool to determine whether evaluation should continue and a schedule
+        """
+        best_status = max(
+            self.island_statuses, key=lambda status: status["best_fitness"]
+        )
+        if best_status["best_fitness"] > self.last_fitness:
+            now = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            logging.info(
+                f'At {now} the best fitness across {self.num_islands} islands is: {best_status["best_fitness"]}'
+            )
+            self.last_fitness = best_status["best_fitness"]
+            self.no_change_count = 0
+            return True, None
+
+        self.no_change_count += max(
+            status["generations"] for status in self.island_statuses
+        )
+        logging.info(f"No change detected, no change number {self.no_change_count}")
+        if self.no_change_count >= self.max_no_change_iterations:
+            best_schedule = self.rebuild_schedule(best_status["best"])
+            best_schedule.populate_schedule()
+            save_report(best_schedule, self.report_writer)
+            logging.info(
+                f"The algorithm has passed more then {self.max_no_change_iterations} without an improvement in fitness, program terminating"
+            )
+            return False, best_schedule
+        return True, None
+
+    def evaluate(self) -> Tuple[bool, object, float, int, list]:
+        """
+        Function to evaluate the fitness of the schedules on every island
+
+        :returns: bool to determine if evaluation should continue and then details on current best schedule
+        """
+        (
+            continue_eval,
+            chosen_schedule,
+            schedule_fitnesses,
+        ) = self.viable_schedule_check()
+        self.iteration_count += max(
+            1, max(status["generations"] for status in self.island_statuses)
+        )
+        if continue_eval:
+            continue_eval, chosen_schedule = self.no_change_check()
+        if chosen_schedule is None:
+            fitness = self.last_fitness
+        else:
+            fitness = chosen_schedule.fitness
+        self.stats.end_generation(
+            self.iteration_count,
+            best_fitness=fitness,
+            population_size=sum(
+                len(status["fitnesses"]) for status in self.island_statuses
+            ),
+            no_change_count=self.no_change_count,
+        )
+        return (
+            continue_eval,
+            chosen_schedule,
+            fitness,
+            self.iteration_count,
+            schedule_fitnesses,
+        )
+
+    def evolve(self) -> Tuple[bool, object, float, int, list]:
+        """
+        Function to migrate the fittest schedules around the ring of islands, then evolve every island for
+        migration_interval generations
+
+        :returns: bool to determine if evaluation should continue as well as details on best performing schedule
+        """
+        # Island i receives the emigrants of island i - 1
+        immigrants = [
+            self.island_statuses[island_index - 1]["emigrants"]
+            for island_index in range(self.num_islands)
+        ]
+        self.island_statuses = self.send_command(
+            "evolve",
+            [
+                (self.migration_interval, island_immigrants)
+                for island_immigrants in immigrants
+            ],
+        )
+        return self.evaluate()
+
+    def rebuild_schedule(self, state: dict) -> Schedule:
+        """
+        Function to rebuild a schedule sent back from an island
+
+        :param state: dictionary of the schedule's attributes from Schedule.export_state
+        :returns: schedule object
+        """
+        return Schedule.from_state(state, self.instance, self.config)
+
+    def close(self):
+        """
+        Function to shut down the island processes, logging where the time of the run went if collect_timings is on
+        """
+        if self.stats.enabled and self.stats.generations:
+            logging.info(self.stats.summary())
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
@@ -1,6 +1,22 @@
 class Placement:
     """ Placement class represents the list of student placements to be assigned """
 
+    __slots__ = (
+        "id",
+        "name",
+        "cohort",
+        "duration",
+        "start",
+        "start_date",
+        "part",
+        "wardhistory",
+        "dephistory",
+        "covid_status",
+        "student_idx",
+        "wardhistory_tokens",
+        "dephistory_tokens",
+    )
+
     def __init__(self, listOfInputs):
         (
             self.id,
@@ -14,3 +30,8 @@ class Placement:
             self.dephistory,
             self.covid_status,
         ) = listOfInputs
+        # Index of the placement's student, set by index_students in src/Vocabulary.py
+        self.student_idx = None
+        # Token ids of the previous wards and department words, set by tokenise in src/Vocabulary.py
+        self.wardhistory_tokens = None
+        self.dephistory_tokens = None
@@ -0,0 +1,25 @@
+from src.RecordTable import RecordTable
+
+
+class PlacementTable(RecordTable):
+    """
+    A PlacementTable holds the attributes of every Placement in a structured array (see src/RecordTable.py), so that
+    the ProblemInstance can compile them a column at a time
+
+    param: fields: A tuple of the Placement attributes held as columns
+    param: records: A read-only NumPy record array with one row per placement
+    """
+
+    fields = (
+        "id",
+        "name",
+        "cohort",
+        "duration",
+        "start",
+        "start_date",
+        "part",
+        "wardhistory",
+        "dephistory",
+        "covid_status",
+        "student_idx",
+    )
@@ -0,0 +1,247 @@
+import numpy as np
+from src.ProblemInstance import (
+    ProblemInstance,
+    TOTAL_INDEX,
+    UNASSIGNED,
+    count_new_tokens,
+    segment_positions,
+)
+from src.Schedule import Schedule
+from src.Config import Config
+from src.RunStats import timed
+
+
+class PopulationEvaluator:
+    """
+    The PopulationEvaluator scores a whole population of schedules at once. Rather than scoring each Schedule object in
+    turn, it takes a 2-D array of assignments (one row per schedule, one column per placement) and checks capacity,
+    covid status, double booking, utilisation and ward and department variety for every schedule with NumPy. The
+    resulting counts are combined with Schedule.combine_scores so that fitness matches Schedule.get_fitness exactly.
+
+    param: instance: A ProblemInstance holding the static slot, ward and placement data shared by all schedules
+    param: config: The Config read from config/params.yml, holding the scoring weights
+    param: chunk_size: Integer number of schedules scored together, limiting the memory used for occupancy counts
+    param: scoring: A Schedule used for its scoring weights and to combine the counts into fitness scores
+    """
+
+    def __init__(
+        self, instance: ProblemInstance, config: Config = None, chunk_size: int = 64
+    ):
+        self.instance = instance
+        self.chunk_size = chunk_size
+        self.scoring = Schedule(
+            instance.slots,
+            instance.wards,
+            instance.placements,
+            instance.num_weeks,
+            instance,
+            config,
+        )
+
+        # Every week of every placement, used to build occupancy counts
+        self.week_placements, self.week_positions = instance.placement_weeks(
+            np.arange(instance.num_placements)
+        )
+
+        # Speciality checks look for their words within single department words
+        self.ward_speciality, self.history_speciality = instance.speciality_matches(
+            self.scoring.speciality_checks
+        )
+
+    @timed("evaluate_population")
+    def evaluate(self, assignments: np.ndarray) -> tuple:
+        """
+        Function to score a population of schedules
+
+        :param assignments: a (schedules x placements) array of the ward id assigned to each placement
+        :returns: an array of fitness scores and a boolean array of whether each schedule is viable
+        """
+        assignments = np.atleast_2d(np.asarray(assignments, dtype=np.int64))
+        num_schedules = assignments.shape[0]
+        fitness = np.zeros(num_schedules, dtype=float)
+        viable = np.zeros(num_schedules, dtype=bool)
+
+        for first in range(0, num_schedules, self.chunk_size):
+            chunk = assignments[first : first + self.chunk_size]
+            totals = self.population_totals(chunk)
+            for row in range(len(chunk)):
+                (
+                    fitness[first + row],
+                    viable[first + row],
+                    _,
+                    _,
+                    _,
+                ) = self.scoring.combine_scores(
+                    *[int(total[row]) for total in totals[:5]],
+                    float(totals[5][row]),
+                    int(totals[6][row]),
+                    float(totals[7][row]),
+                    float(totals[8][row]),
+                    totals[9][:, row],
+                )
+
+        return fitness, viable
+
+    def population_totals(self, assignments: np.ndarray) -> tuple:
+        """
+        Function to calculate, for each schedule, the counts and totals used by Schedule.combine_scores
+
+        :param assignments: a (schedules x placements) array of the ward id assigned to each placement
+        :returns: a tuple of arrays with one entry per schedule, in the order of Schedule.combine_scores arguments
+        """
+        instance = self.instance
+        num_schedules, num_placements = assignments.shape
+        num_wards = instance.num_wards
+        num_week_slots = instance.num_week_slots
+        num_students = instance.num_students
+        num_parts = TOTAL_INDEX + 1
+
+        assigned = assignments != UNASSIGNED
+        ward_ids = np.where(assigned, assignments, 0)
+        schedule_index = np.arange(num_schedules)[:, None]
+
+        # Occupancy counts for every schedule, ward, week and part
+        week_wards = assignments[:, self.week_placements]
+        week_parts = np.broadcast_to(
+            instance.placement_part[self.week_placements], week_wards.shape
+        )
+        week_assigned = week_wards != UNASSIGNED
+        week_cells = (
+            (schedule_index * num_wards + week_wards) * num_week_slots
+            + self.week_positions
+        ) * num_parts
+        num_cells = num_schedules * num_wards * num_week_slots * num_parts
+        occupancy = np.bincount(
+            (week_cells + week_parts)[week_assigned & (week_parts != TOTAL_INDEX)],
+            minlength=num_cells,
+        )
+        occupancy += np.bincount(
+            (week_cells + TOTAL_INDEX)[week_assigned], minlength=num_cells
+        )
+
+        # Check if wards have exceeded capacity of assigned placements in the week they start
+        parts = instance.placement_part
+        start_cells = (
+            (schedule_index * num_wards + ward_ids) * num_week_slots
+            + instance.placement_start_week
+        ) * num_parts
+        ward_count = occupancy[start_cells + TOTAL_INDEX]
+        year_count = occupancy[start_cells + parts]
+        within_capacity = (
+            (ward_count <= instance.ward_capacity[ward_ids, TOTAL_INDEX])
+            & (year_count <= instance.ward_capacity[ward_ids, parts])
+            & assigned
+        )
+
+        # Check if student's covid status can accommodate selected ward
+        covid_incompatible = (
+            instance.covid_conflict[np.arange(num_placements), ward_ids] & assigned
+        )
+
+        # Check if student has another placement arranged for a different ward at the same time
+        pair_wards = assignments[:, instance.overlap_placement]
+        other_wards = assignments[:, instance.overlap_other]
+        pair_clash = (
+            (pair_wards != other_wards)
+            & (pair_wards != UNASSIGNED)
+            & (other_wards != UNASSIGNED)
+        )
+        clash_count = np.zeros((num_placements, num_schedules), dtype=np.int64)
+        np.add.at(clash_count, instance.overlap_placement, pair_clash.T)
+        double_booked = clash_count.T > 0
+
+        fully_scored = within_capacity & ~covid_incompatible & ~double_booked
+
+        # Utilisation is summed per ward from the start-week occupancy of its placements
+        ward_util_numerator = np.bincount(
+            (schedule_index * num_wards + ward_ids)[assigned],
+            weights=ward_count[assigned],
+            minlength=num_schedules * num_wards,
+        ).reshape(num_schedules, num_wards)
+        capacity = instance.ward_capacity[:, TOTAL_INDEX]
+        ward_utilisation = np.divide(
+            ward_util_numerator,
+            capacity,
+            out=np.zeros(ward_util_numerator.shape, dtype=float),
+            where=capacity != 0,
+        )
+
+        # Ward and department variety for each student
+        placement_students = np.broadcast_to(
+            schedule_index * num_students + instance.placement_student,
+            assignments.shape,
+        )[assigned]
+        student_assigned = np.bincount(
+            placement_students, minlength=num_schedules * num_students
+        ).reshape(num_schedules, num_students)
+        student_active = student_assigned > 0
+
+        placement_student_ids = np.broadcast_to(
+            instance.placement_student, assignments.shape
+        )[assigned]
+        assigned_wards = ward_ids[assigned]
+
+        new_wards = count_new_tokens(
+            placement_students,
+            placement_student_ids,
+            instance.ward_tokens[assigned_wards],
+            instance.ward_history_keys,
+            instance.num_ward_tokens,
+            num_schedules * num_students,
+        ).reshape(num_schedules, num_students)
+        uniq_wards = np.divide(
+            instance.ward_history_unique + new_wards,
+            instance.ward_history_length + student_assigned,
+            out=np.zeros(student_assigned.shape, dtype=float),
+            where=student_active,
+        )
+
+        dep_rows, dep_positions = segment_positions(
+            instance.ward_department_pointer, assigned_wards
+        )
+        new_deps = count_new_tokens(
+            placement_students[dep_rows],
+            placement_student_ids[dep_rows],
+            instance.ward_department_ids[dep_positions],
+            instance.department_history_keys,
+            instance.num_department_tokens,
+            num_schedules * num_students,
+        ).reshape(num_schedules, num_students)
+        student_dep_length = np.bincount(
+            placement_students[dep_rows], minlength=num_schedules * num_students
+        ).reshape(num_schedules, num_students)
+        uniq_deps = np.divide(
+            instance.department_history_unique + new_deps,
+            instance.department_history_length + student_dep_length,
+            out=np.zeros(student_assigned.shape, dtype=float),
+            where=student_active,
+        )
+
+        # Students with a department matching each speciality check
+        speciality_counts = np.zeros(
+            (len(self.scoring.speciality_checks), num_schedules), dtype=np.int64
+        )
+        for check_index in range(len(self.scoring.speciality_checks)):
+            ward_matches = np.bincount(
+                placement_students,
+                weights=self.ward_speciality[check_index, assigned_wards],
+                minlength=num_schedules * num_students,
+            ).reshape(num_schedules, num_students)
+            speciality_counts[check_index] = np.count_nonzero(
+                student_active
+                & ((ward_matches > 0) | self.history_speciality[check_index]),
+                axis=1,
+            )
+
+        return (
+            np.count_nonzero(assigned, axis=1),
+            np.count_nonzero(within_capacity, axis=1),
+            np.count_nonzero(covid_incompatible, axis=1),
+            np.count_nonzero(double_booked & assigned, axis=1),
+            np.count_nonzero(fully_scored, axis=1),
+            np.sum(ward_utilisation, axis=1),
+            np.count_nonzero(student_active, axis=1),
+            np.sum(uniq_wards, axis=1),
+            np.sum(uniq_deps, axis=1),
+            speciality_counts,
+        )
@@ -0,0 +1,480 @@
+import numpy as np
+import pandas as pd
+import logging
+from src.Vocabulary import clean_departments, tokenise, index_students
+from src.PlacementTable import PlacementTable
+from src.WardTable import WardTable
+
+
+# Index of each placement part within the last axis of occupancy counts. Placements whose part is not
+# recognised are only checked against the overall ward capacity, which is held in TOTAL_INDEX
+PART_INDEX = {"P1": 0, "P2": 1, "P3": 2}
+TOTAL_INDEX = 3
+
+# Ward id used in an assignment array for a placement which has not been given a ward
+UNASSIGNED = -1
+
+# Student counts per ward-week are small, so occupancy is held compactly
+OCCUPANCY_DTYPE = np.int16
+
+
+def num_tokens(token_arrays: list) -> int:
+    """
+    Function to find the number of token ids needed to cover a set of token arrays
+
+    :param token_arrays: list of arrays of token ids
+    :returns: one more than the largest token id, or 1 if there are none
+    """
+    return 1 + max([-1] + [int(tokens.max()) for tokens in token_arrays if len(tokens)])
+
+
+def segment_pointer(lengths: np.ndarray) -> np.ndarray:
+    """
+    Function to build the pointer array of a CSR-style index, where the entries of segment i are held between
+    pointer[i] and pointer[i + 1]
+
+    :param lengths: array of the number of entries in each segment
+    :returns: array of segment start positions, one longer than lengths
+    """
+    return np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+
+
+def segment_positions(pointer: np.ndarray, segments: np.ndarray) -> tuple:
+    """
+    Function to find the positions of the entries of a set of segments of a CSR-style index
+
+    :param pointer: array of segment start positions (see segment_pointer)
+    :param segments: array of segment indices
+    :returns: an array of the row within segments of each entry, and an array of the position of each entry
+    """
+    if len(segments) == 1:
+        # A single segment, as when one placement is moved, is a contiguous slice
+        start, end = pointer[segments[0]], pointer[segments[0] + 1]
+        return np.zeros(end - start, dtype=np.int64), np.arange(start, end)
+    starts = pointer[segments]
+    lengths = pointer[np.asarray(segments) + 1] - starts
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return rows, starts[rows] + offsets
+
+
+def history_index(student_history: list, num_tokens: int) -> tuple:
+    """
+    Function to summarise each student's history of token ids
+
+    :param student_history: list with an array of the token ids each student has previously been placed on
+    :param num_tokens: integer size of the vocabulary
+    :returns: sorted (student x num_tokens + token) keys of each student's history, and the number of unique and total
+        tokens in each student's history
+    """
+    history_keys = np.unique(
+        np.concatenate(
+            [
+                student * num_tokens + np.asarray(tokens, dtype=np.int64)
+                for student, tokens in enumerate(student_history)
+            ]
+            + [np.zeros(0, dtype=np.int64)]
+        )
+    )
+    history_unique = np.bincount(
+        history_keys // num_tokens, minlength=len(student_history)
+    )
+    history_length = np.array(
+        [len(tokens) for tokens in student_history], dtype=np.int64
+    )
+    return history_keys, history_unique, history_length
+
+
+def count_new_tokens(
+    groups: np.ndarray,
+    students: np.ndarray,
+    tokens: np.ndarray,
+    history_keys: np.ndarray,
+    num_tokens: int,
+    num_groups: int,
+) -> np.ndarray:
+    """
+    Function to count, for each group, the distinct tokens assigned to it which are not already in the history of the
+    group's student
+
+    :param groups: array of the group (e.g. schedule x students + student) of each assigned token
+    :param students: array of the student of each assigned token
+    :param tokens: array of the id of each assigned token
+    :param history_keys: sorted array of (student x num_tokens + token) keys for each student's history
+    :param num_tokens: integer size of the vocabulary
+    :param num_groups: integer number of groups
+    :returns: array of counts, one per group
+    """
+    student_keys = students * num_tokens + tokens
+    if len(history_keys):
+        positions = np.minimum(
+            np.searchsorted(history_keys, student_keys), len(history_keys) - 1
+        )
+        in_history = history_keys[positions] == student_keys
+    else:
+        in_history = np.zeros(len(student_keys), dtype=bool)
+    new_keys = np.unique((groups * num_tokens + tokens)[~in_history])
+    return np.bincount(new_keys // num_tokens, minlength=num_groups)
+
+
+class ProblemInstance:
+    """
+    A ProblemInstance holds the static data shared by every Schedule in a run of the tool. The lists of Slot, Ward and
+    Placement objects are compiled once into NumPy arrays so that each Schedule only needs to store the integer id of the
+    ward that each of its placements is assigned to.
+
+    param: slots: A list of Slot objects for placements on wards to be assigned into
+    param: wards: A list of Ward objects where placements can take place
+    param: placements: A list of Placement objects to be assigned
+    param: num_weeks: An integer number of the length of time that placements need to be allocated for
+    param: placement_records: A PlacementTable of the attributes of every placement, as built by the DataLoader, or
+        built here from the placements if not given
+    param: ward_records: A WardTable of the attributes of every ward, as built by the DataLoader, or built here from the
+        wards if not given
+    param: num_week_slots: An integer number of week positions held for each ward, large enough for the longest placement
+    param: placement_start_week: An array of the first week position that each placement occupies on its ward
+    param: placement_duration: An array of the integer number of weeks that each placement lasts
+    param: placement_part: An array of the index of each placement's part (see PART_INDEX)
+    param: ward_capacity: A (wards x 4) array of P1, P2, P3 and overall capacity for each ward
+    param: placement_student: An array of the index of the student each placement belongs to (its student_idx)
+    param: num_students: An integer number of students
+    param: student_pointer: An array giving, for each student, where their entries in student_placement_ids start and end
+    param: student_placement_ids: An array of placement indices ordered by student
+    param: student_placements: A list with an array of placement indices for each student, as views of
+        student_placement_ids
+    param: student_dep_history: A list with the cleaned department words each student has previously been placed within
+    param: ward_names: A list with the name of each ward
+    param: ward_dep_words: A list with the cleaned department words for each ward
+    param: ward_tokens: An array of the token id of each ward's name
+    param: ward_department_tokens: A list with an array of the department word token ids for each ward
+    param: student_ward_history_tokens: A list with an array of the token ids of the wards each student has previously
+        been placed on
+    param: student_department_history_tokens: A list with an array of the token ids of the department words each student
+        has previously been placed within
+    param: num_ward_tokens: An integer number of distinct ward name token ids
+    param: num_department_tokens: An integer number of distinct department word token ids
+    param: ward_department_pointer: An array giving, for each ward, where its entries in ward_department_ids start and end
+    param: ward_department_ids: An array of the department word token ids of every ward, ordered by ward
+    param: ward_history_keys: A sorted array of (student x num_ward_tokens + token) keys of each student's ward history
+    param: ward_history_unique: An array of the number of unique wards in each student's history
+    param: ward_history_length: An array of the number of wards in each student's history
+    param: department_history_keys: A sorted array of (student x num_department_tokens + token) keys of each student's
+        department history
+    param: department_history_unique: An array of the number of unique department words in each student's history
+    param: department_history_length: An array of the number of department words in each student's history
+    param: covid_conflict: A (placements x wards) boolean array of placements whose covid status the ward cannot accommodate
+    param: feasible: A (placements x wards) boolean array of wards each placement could ever be assigned to, based on
+        covid status and the ward having capacity for students of the placement's part
+    param: feasible_wards: A list with an array of the feasible ward ids for each placement
+    param: seeding_order: An array of placement indices in the order they are placed when generating a schedule,
+        fewest feasible wards first and then longest first
+    param: student_week_count: A (students x week slots) array of the number of placements each student has running each week
+    param: placement_overlapped: A boolean array of placements whose student has another placement running in their start week
+    param: overlap_placement: An array of placements which another placement of the same student overlaps in its start week
+    param: overlap_other: An array of the overlapping placement matching each entry of overlap_placement
+    param: overlap_pointer: An array giving, for each placement, where its entries in overlap_other start and end
+    param: placement_table: A DataFrame of placement details used when producing reports
+    param: ward_table: A DataFrame of ward details used when producing reports
+    """
+
+    def __init__(
+        self,
+        slots: list,
+        wards: list,
+        placements: list,
+        num_weeks: int,
+        placement_records: PlacementTable = None,
+        ward_records: WardTable = None,
+    ):
+        self.slots = slots
+        self.wards = wards
+        self.placements = placements
+        self.num_weeks = num_weeks
+
+        self.num_wards = len(wards)
+        self.num_placements = len(placements)
+
+        # The DataLoader gives each placement its student_idx and tokenises the wards and placements it
+        # creates, otherwise it is done here
+        if any(p.student_idx is None for p in placements):
+            index_students(placements)
+        if any(w.department_tokens is None for w in wards) or any(
+            p.dephistory_tokens is None for p in placements
+        ):
+            tokenise(wards, placements)
+
+        # Attributes are compiled a column at a time from structured arrays of the wards and placements. The
+        # DataLoader builds these straight from its DataFrames, so they are only built from the objects if not given
+        if placement_records is None:
+            placement_records = PlacementTable.from_objects(placements)
+        if ward_records is None:
+            ward_records = WardTable.from_objects(wards)
+        self.placement_records = placement_records
+        self.ward_records = ward_records
+
+        # Placements occupy the week after their start week within a ward's row of slots
+        self.placement_start_week = (
+            self.placement_records.start.astype(np.int64, copy=False) + 1
+        )
+        self.placement_duration = self.placement_records.duration.astype(np.int64)
+        self.placement_part = np.full(self.num_placements, TOTAL_INDEX, dtype=np.int64)
+        for part, part_index in PART_INDEX.items():
+            self.placement_part[self.placement_records.part == part] = part_index
+
+        if self.num_placements:
+            last_week = int(
+                (self.placement_start_week + self.placement_duration).max()
+            )
+        else:
+            last_week = 0
+        self.num_week_slots = max(len(slots), num_weeks, last_week)
+
+        self.ward_capacity = np.stack(
+            [
+                self.ward_records.p1_capacity,
+                self.ward_records.p2_capacity,
+                self.ward_records.p3_capacity,
+                self.ward_records.capacity,
+            ],
+            axis=1,
+        ).astype(np.int64)
+
+        # Placements are grouped by student through a CSR-style index: the placements of student i are
+        # student_placement_ids[student_pointer[i] : student_pointer[i + 1]]
+        self.placement_student = self.placement_records.student_idx.astype(np.int64)
+        self.num_students = num_tokens([self.placement_student])
+        self.student_pointer = segment_pointer(
+            np.bincount(self.placement_student, minlength=self.num_students)
+        )
+        self.student_placement_ids = np.argsort(self.placement_student, kind="stable")
+        self.student_placements = np.split(
+            self.student_placement_ids, self.student_pointer[1:-1]
+        )
+        first_placements = [placements[ids[0]] for ids in self.student_placements]
+        self.student_dep_history = [
+            clean_departments(p.dephistory) for p in first_placements
+        ]
+        self.ward_names = self.ward_records.ward.tolist()
+        self.ward_dep_words = [
+            clean_departments(department)
+            for department in self.ward_records.department.tolist()
+        ]
+
+        # Ward names and department words are compared as integer token ids
+        self.ward_tokens = self.ward_records.ward_token.astype(np.int64)
+        self.ward_department_tokens = [w.department_tokens for w in wards]
+        self.student_ward_history_tokens = [
+            p.wardhistory_tokens for p in first_placements
+        ]
+        self.student_department_history_tokens = [
+            p.dephistory_tokens for p in first_placements
+        ]
+        self.num_ward_tokens = num_tokens(
+            [self.ward_tokens] + self.student_ward_history_tokens
+        )
+        self.num_department_tokens = num_tokens(
+            self.ward_department_tokens + self.student_department_history_tokens
+        )
+        self.ward_department_pointer = segment_pointer(
+            [len(tokens) for tokens in self.ward_department_tokens]
+        )
+        self.ward_department_ids = np.concatenate(
+            self.ward_department_tokens + [np.zeros(0, dtype=np.int64)]
+        )
+        (
+            self.ward_history_keys,
+            self.ward_history_unique,
+            self.ward_history_length,
+        ) = history_index(self.student_ward_history_tokens, self.num_ward_tokens)
+        (
+            self.department_history_keys,
+            self.department_history_unique,
+            self.department_history_length,
+        ) = history_index(
+            self.student_department_history_tokens, self.num_department_tokens
+        )
+        self.speciality_match_cache = {}
+
+        self.covid_conflict = np.outer(
+            self.placement_records.covid_status == "Low/Medium",
+            self.ward_records.covid_status == "Medium/High",
+        )
+
+        # Constraints which do not change during a run are checked once for every placement and ward
+        self.feasible = (
+            ~self.covid_conflict
+            & (self.ward_capacity[:, TOTAL_INDEX] > 0)
+            & (self.ward_capacity.T[self.placement_part] > 0)
+        )
+        self.feasible_wards = [np.flatnonzero(wards_ok) for wards_ok in self.feasible]
+        for placement, wards_ok in zip(placements, self.feasible_wards):
+            if not len(wards_ok):
+                logging.warning(
+                    f"No ward has capacity for placement {placement.name} with covid status {placement.covid_status}, it will be left unassigned"
+                )
+
+        # Placements with the fewest feasible wards, then the longest, are placed first when generating schedules
+        self.seeding_order = np.lexsort(
+            (-self.placement_duration, self.feasible.sum(axis=1))
+        )
+
+        # Count the placements each student has running in each week. A placement can only be double
+        # booked if its student has more than one placement running in the week it starts
+        all_placements, all_weeks = self.placement_weeks(np.arange(self.num_placements))
+        self.student_week_count = (
+            np.bincount(
+                self.placement_student[all_placements] * self.num_week_slots
+                + all_weeks,
+                minlength=self.num_students * self.num_week_slots,
+            )
+            .astype(OCCUPANCY_DTYPE)
+            .reshape(self.num_students, self.num_week_slots)
+        )
+        self.placement_overlapped = (
+            self.student_week_count[self.placement_student, self.placement_start_week]
+            > 1
+        )
+
+        # Pairs of placements for the same student where the second is running in the week the first starts,
+        # ordered by the first placement. The first is double booked if the two are assigned to different wards
+        overlap_pairs = [
+            (placement_id, other_id)
+            for placement_id in np.flatnonzero(self.placement_overlapped)
+            for other_id in self.student_placements[self.placement_student[placement_id]]
+            if other_id != placement_id
+            and self.placement_start_week[other_id]
+            <= self.placement_start_week[placement_id]
+            < self.placement_start_week[other_id] + self.placement_duration[other_id]
+        ]
+        self.overlap_placement = np.array(
+            [pair[0] for pair in overlap_pairs], dtype=np.int64
+        )
+        self.overlap_other = np.array([pair[1] for pair in overlap_pairs], dtype=np.int64)
+        self.overlap_pointer = segment_pointer(
+            np.bincount(self.overlap_placement, minlength=self.num_placements)
+        )
+
+        # Placements ordered by the week they start, so that those starting within a range of
+        # weeks can be found without scanning every placement
+        self.placements_by_start = np.argsort(self.placement_start_week, kind="stable")
+        self.start_week_pointer = np.searchsorted(
+            self.placement_start_week[self.placements_by_start],
+            np.arange(self.num_week_slots + 1),
+        )
+
+        self.placement_table = pd.DataFrame(
+            {
+                "nurse_name": self.placement_records.name,
+                "nurse_uni_cohort": self.placement_records.cohort,
+                "placement_part": self.placement_records.part,
+                "placement_start": self.placement_records.start,
+                "placement_start_date": self.placement_records.start_date,
+                "placement_duration": self.placement_records.duration,
+            }
+        )
+        # Placement names are the nurse key and block joined by the first underscore
+        name_parts = self.placement_table["nurse_name"].str.split("_", n=1)
+        self.placement_table["nurse_id"] = name_parts.str[0]
+        self.placement_table["block"] = name_parts.str[1]
+        self.ward_table = pd.DataFrame(
+            {
+                "ward_name": self.ward_records.ward,
+                "department": self.ward_records.department,
+                "ward_capacity": self.ward_records.capacity,
+                "p1_ward_capacity": self.ward_records.p1_capacity,
+                "p2_ward_capacity": self.ward_records.p2_capacity,
+                "p3_ward_capacity": self.ward_records.p3_capacity,
+                "ed_audit_exp_week": self.ward_records.ed_audit_expiry_week,
+            }
+        )
+
+        # The arrays are shared by every schedule, so they are made read-only to stop any schedule changing them
+        for value in vars(self).values():
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+        for index_array in self.feasible_wards + self.student_placements:
+            index_array.flags.writeable = False
+
+    def speciality_matches(self, speciality_checks: list) -> tuple:
+        """
+        Function to find which wards and which students' previous departments match each speciality check. Checks look
+        for their words within single department words. Results are kept so that each set of checks is only run once
+
+        :param speciality_checks: list of (compiled regex, score) tuples
+        :returns: a (checks x wards) boolean array and a (checks x students) boolean array
+        """
+        key = tuple((regex.pattern, regex.flags) for regex, _ in speciality_checks)
+        if key not in self.speciality_match_cache:
+            ward_matches = np.array(
+                [
+                    [
+                        any(regex.search(word) for word in words)
+                        for words in self.ward_dep_words
+                    ]
+                    for regex, _ in speciality_checks
+                ],
+                dtype=bool,
+            ).reshape(len(speciality_checks), self.num_wards)
+            history_matches = np.array(
+                [
+                    [
+                        any(regex.search(word) for word in words)
+                        for words in self.student_dep_history
+                    ]
+                    for regex, _ in speciality_checks
+                ],
+                dtype=bool,
+            ).reshape(len(speciality_checks), self.num_students)
+            ward_matches.flags.writeable = False
+            history_matches.flags.writeable = False
+            self.speciality_match_cache[key] = (ward_matches, history_matches)
+        return self.speciality_match_cache[key]
+
+    def placement_weeks(self, placement_indices: np.ndarray) -> tuple:
+        """
+        Function to expand a set of placements into one entry per week that each placement occupies
+
+        :param placement_indices: array of placement indices to be expanded
+        :returns: an array of placement indices repeated once per week, and the matching week positions
+        """
+        durations = self.placement_duration[placement_indices]
+        expanded = np.repeat(placement_indices, durations)
+        week_offsets = np.arange(len(expanded)) - np.repeat(
+            np.cumsum(durations) - durations, durations
+        )
+        return expanded, self.placement_start_week[expanded] + week_offsets
+
+    def occupancy_counts(self, assignment: np.ndarray) -> np.ndarray:
+        """
+        Function to count the number of students on each ward in each week, split by placement part
+
+        :param assignment: array with one ward id per placement
+        :returns: a (wards x week slots x 4) array of P1, P2, P3 and overall student counts
+        """
+        assigned = np.flatnonzero(assignment != UNASSIGNED)
+        placement_rows, weeks = self.placement_weeks(assigned)
+        ward_week = (assignment[placement_rows] * self.num_week_slots + weeks) * (
+            TOTAL_INDEX + 1
+        )
+        parts = self.placement_part[placement_rows]
+        num_cells = self.num_wards * self.num_week_slots * (TOTAL_INDEX + 1)
+
+        counts = np.bincount(
+            (ward_week + parts)[parts != TOTAL_INDEX], minlength=num_cells
+        )
+        counts += np.bincount(ward_week + TOTAL_INDEX, minlength=num_cells)
+        return counts.astype(OCCUPANCY_DTYPE).reshape(
+            self.num_wards, self.num_week_slots, TOTAL_INDEX + 1
+        )
+
+    def placements_starting_between(self, first_week: int, last_week: int) -> np.ndarray:
+        """
+        Function to find the placements which start on or after one week and before another
+
+        :param first_week: first week position to include
+        :param last_week: week position at which to stop (not included)
+        :returns: an array of placement indices
+        """
+        return self.placements_by_start[
+            self.start_week_pointer[first_week] : self.start_week_pointer[last_week]
+        ]
@@ -0,0 +1,102 @@
+from datetime import datetime
+import numpy as np
+
+
+def column_array(values) -> np.ndarray:
+    """
+    Function to store the values of one attribute in the most compact array type which holds them exactly. Whole numbers
+    are held as int64, other numbers as float64 and dates as datetime64. Strings and anything else (e.g. a mix of types)
+    are held as objects, so each row refers to the string already held by its Ward or Placement rather than copying it.
+    Fixed width unicode would take four bytes per character of the longest string for every row, which for columns such
+    as the department history is several times the size of the objects themselves
+
+    :param values: list, array or Series of attribute values, one per object
+    :returns: array of the values
+    """
+    if not isinstance(values, (list, np.ndarray)):
+        values = np.asarray(values)
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+        return values.astype(np.int64 if values.dtype.kind in "iu" else np.float64)
+    if isinstance(values, np.ndarray) and values.dtype.kind == "M":
+        return values.astype("datetime64[ns]")
+
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    types = set(map(type, column.tolist()))
+    if types and all(issubclass(value_type, datetime) for value_type in types):
+        return column.astype("datetime64[ns]")
+    if all(
+        issubclass(value_type, (int, float, np.integer, np.floating))
+        and not issubclass(value_type, (bool, np.bool_))
+        for value_type in types
+    ):
+        if all(issubclass(value_type, (int, np.integer)) for value_type in types):
+            return column.astype(np.int64)
+        return column.astype(np.float64)
+    return column
+
+
+class RecordTable:
+    """
+    A RecordTable holds the attributes of a list of objects in a NumPy structured array, with one column per attribute
+    and one row per object. Whole columns can be read as arrays without looking up an attribute on every object, and
+    rows keep object-style access, e.g. table.duration for every duration and table[3].duration for one of them.
+    Subclasses list the attributes to be held in fields.
+
+    A table is a view of the objects for compiling the ProblemInstance a column at a time, not a replacement for them.
+    The Ward and Placement objects still hold the attributes, and string columns refer to the same strings, so a table
+    adds little more than its numeric columns and one pointer per string to the memory of a run.
+
+    param: fields: A tuple of the names of the attributes held as columns
+    param: records: A read-only NumPy record array with one row per object
+    """
+
+    fields = ()
+
+    def __init__(self, records: np.recarray):
+        self.records = records
+        self.records.flags.writeable = False
+
+    @classmethod
+    def from_columns(cls, columns: dict) -> "RecordTable":
+        """
+        Function to build a table from whole columns of values, e.g. the columns of a DataFrame
+
+        :param columns: dictionary of a list, array or Series of values for each of the table's fields
+        :returns: the table
+        """
+        return cls(
+            np.rec.fromarrays(
+                [column_array(columns[field]) for field in cls.fields],
+                names=list(cls.fields),
+            )
+        )
+
+    @classmethod
+    def from_objects(cls, items: list) -> "RecordTable":
+        """
+        Function to build a table from the attributes of a list of objects
+
+        :param items: list of objects with an attribute for each of the table's fields
+        :returns: the table
+        """
+        return cls.from_columns(
+            {field: [getattr(item, field) for item in items] for field in cls.fields}
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getattr__(self, name: str):
+        # Only called for names which are not ordinary attributes, so columns can be read as table.<field>
+        if name in self.fields:
+            return self.records[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
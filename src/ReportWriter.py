@@ -0,0 +1,213 @@
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from src.Schedule import Schedule, results_directory
+
+
+# Columns of the schedule comparison table shown on the UI and saved to the comparison file
+COMPARISON_COLUMNS = [
+    "Schedule file name",
+    "Viable schedule?",
+    "Non-viable reason",
+    "Number of iterations to generate",
+    "Schedule Fitness Score",
+    "Placement Utilisation score ",
+    "Unique Specialities Score",
+    "Unique Wards Score",
+    "No. students with incorrect no. of placements",
+    "No. of placements with the incorrect length",
+    "No. of ward-weeks where capacity is exceeded",
+    "No. of placements where student is double-booked",
+]
+
+
+class ReportJob:
+    """
+    A ReportJob is a report waiting to be written, or already written, by a ReportWriter. The file name is chosen when
+    the job is submitted, so it is known straight away, while the quality metrics are only filled in once the report
+    has been saved.
+
+    param: schedule: A read-only snapshot of the schedule taken when the job was submitted
+    param: file_name: The file name the report is saved under in the results directory
+    param: quality_metrics: A dictionary of the schedule quality checks, None until the report has been saved
+    param: error: The exception raised while saving the report, if it could not be saved
+    param: finished: A threading Event set once the job has finished, whether or not it succeeded
+    """
+
+    def __init__(self, schedule: Schedule):
+        self.schedule = schedule
+        self.file_name = schedule.file_name
+        self.quality_metrics = None
+        self.error = None
+        self.finished = threading.Event()
+
+    def done(self) -> bool:
+        """
+        Function to check whether the job has finished without waiting for it
+
+        :returns: bool of whether the job has finished
+        """
+        return self.finished.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Function to wait for the job to finish
+
+        :param timeout: maximum number of seconds to wait, waits until the job finishes if None
+        :returns: bool of whether the job has finished
+        """
+        return self.finished.wait(timeout)
+
+
+class ReportWriter:
+    """
+    The ReportWriter saves schedule reports on a background thread, so that building the Excel workbook does not hold up
+    the genetic algorithm or the user interface. Reports are queued as read-only snapshots of the schedule, so the
+    schedule itself can carry on changing while its report is written. The queue holds at most max_pending reports;
+    once it is full, submitting another report waits until there is room, so reports cannot pile up faster than they
+    are written.
+
+    For more detail see documentation at docs/schedule.md
+
+    :param max_pending: Integer number of reports which can be waiting to be written at once
+    """
+
+    def __init__(self, max_pending: int = 2):
+        self.queue = queue.Queue(maxsize=max(1, max_pending))
+        self.jobs = {}
+        self.thread = threading.Thread(
+            target=self.write_reports, name="ReportWriter", daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, schedule: Schedule) -> ReportJob:
+        """
+        Function to queue the report of a schedule to be written in the background. The report's file name is set on
+        the schedule before it is queued, and is different from the name of every other report this ReportWriter has
+        been given, so that reports chosen in the same second do not overwrite each other
+
+        :param schedule: the schedule to be reported on
+        :returns: the ReportJob for the report
+        """
+        schedule.file_name = schedule.report_file_name(self.jobs)
+        job = ReportJob(schedule.snapshot())
+        self.jobs[job.file_name] = job
+        if self.queue.full():
+            logging.info(
+                f"Waiting for earlier reports to be written before queueing {job.file_name}"
+            )
+        self.queue.put(job)
+        return job
+
+    def write_reports(self):
+        """
+        Function run on the background thread, writing each queued report in turn until closed
+        """
+        while True:
+            job = self.queue.get()
+            if job is None:
+                self.queue.task_done()
+                break
+            try:
+                job.schedule.save_report(job.file_name)
+                job.quality_metrics = job.schedule.quality_metrics
+                logging.info(f"Report {job.file_name} saved")
+            except Exception as error:
+                logging.exception(f"Report {job.file_name} could not be saved")
+                job.error = error
+            finally:
+                job.finished.set()
+                self.queue.task_done()
+
+    def job(self, file_name: str) -> ReportJob:
+        """
+        Function to find the job for a report
+
+        :param file_name: the file name of the report
+        :returns: the ReportJob, or None if no report of that name was submitted
+        """
+        return self.jobs.get(file_name)
+
+    def pending(self) -> list:
+        """
+        Function to list the reports which have not yet been written
+
+        :returns: list of the ReportJobs which have not finished
+        """
+        return [job for job in self.jobs.values() if not job.done()]
+
+    def wait(self):
+        """
+        Function to wait until every queued report has been written
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        Function to write any queued reports and then stop the background thread
+        """
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+def save_report(schedule: Schedule, report_writer: ReportWriter = None) -> str:
+    """
+    Function to save the report of a schedule, in the background if a ReportWriter is given or straight away if not
+
+    :param schedule: the schedule to be reported on
+    :param report_writer: the ReportWriter to queue the report with, or None
+    :returns: the file name of the report
+    """
+    if report_writer is None:
+        return schedule.save_report()
+    return report_writer.submit(schedule).file_name
+
+
+def comparison_row(
+    chosen_schedule: Schedule, iteration: int, quality_scores: dict
+) -> list:
+    """
+    Function to summarise a chosen schedule for the schedule comparison table
+
+    :param chosen_schedule: the Schedule chosen by a run of the tool
+    :param iteration: the integer number of iterations the run took
+    :param quality_scores: the dictionary of quality checks from the schedule's report
+    :returns: a list with one value for each of COMPARISON_COLUMNS
+    """
+    viable = chosen_schedule.file_name.split("_", maxsplit=10)[9].replace(".xlsx", "")
+    schedule_scores = chosen_schedule.schedule_eval_scores
+    return [
+        chosen_schedule.file_name,
+        viable,
+        chosen_schedule.non_viable_reason,
+        iteration,
+        np.round(chosen_schedule.fitness, 4),
+        np.round(schedule_scores["mean_ward_util"], 2),
+        np.round(schedule_scores["mean_uniq_deps"], 2),
+        np.round(schedule_scores["mean_uniq_wards"], 2),
+        np.round(quality_scores["num_incorr_num_plac"], 2),
+        np.round(quality_scores["num_incorrect_length"], 2),
+        np.round(quality_scores["num_capacity_exceeded"], 2),
+        np.round(quality_scores["num_double_booked"], 2),
+    ]
+
+
+def save_comparison(scheduleCompareDF: pd.DataFrame, results_folder: str) -> str:
+    """
+    Function to save the schedule comparison table, so that schedules can be compared after the tool has finished
+
+    :param scheduleCompareDF: dataframe with COMPARISON_COLUMNS and one row per schedule
+    :param results_folder: results_folder from params.yml
+    :returns: the path of the saved comparison file
+    """
+    now = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
+    file_name = f"schedule_comparison_{now}.csv"
+    full_save_path = os.path.join(results_directory(results_folder), file_name)
+    scheduleCompareDF.to_csv(full_save_path)
+    logging.info("Comparison file saved")
+    return full_save_path
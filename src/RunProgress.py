@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+
+
+@dataclass(frozen=True)
+class GenerationSnapshot:
+    """
+    A GenerationSnapshot describes the progress of a run after one generation, for showing on the UI or logging. It
+    only holds numbers, so it is cheap to build and can be passed between threads or processes, and it cannot be
+    changed once made.
+
+    param: iteration: Integer number of the generation, as returned by evaluate
+    param: elapsed_s: Seconds since the run started
+    param: best_fitness: The best fitness found so far
+    param: num_viable: Integer number of viable schedules in the population
+    param: population_size: Integer number of schedules in the population
+    param: fitness_counts: Tuple of the number of schedules in each bin of the fitness histogram
+    param: fitness_bin_edges: Tuple of the edges of the bins of the fitness histogram, one more than the counts
+    param: timings: Dictionary of the time spent in each phase in the last generation if collect_timings is on, else
+        None
+    param: resumed: Bool of whether the run carried on from a checkpoint
+    param: finished: Bool of whether the run has finished, only True for the last snapshot of a run
+    param: viable: Bool of whether the chosen schedule is viable, False until the run has finished
+    param: file_name: The file name of the chosen schedule's report, None until the run has finished
+    param: stopped_early: Why the run was stopped before it finished by itself, "cancelled", "time_budget" or
+        "max_generations", or None
+    """
+
+    iteration: int
+    elapsed_s: float
+    best_fitness: float
+    num_viable: int
+    population_size: int
+    fitness_counts: tuple
+    fitness_bin_edges: tuple
+    timings: dict
+    resumed: bool
+    finished: bool = False
+    viable: bool = False
+    file_name: str = None
+    stopped_early: str = None
+
+
+def run_generations(
+    algorithm,
+    resume: bool = False,
+    max_generations: int = None,
+    time_budget: float = None,
+    should_stop=None,
+    min_interval: float = 0.0,
+    histogram_bins: int = 100,
+):
+    """
+    Function to run a GeneticAlgorithm or IslandModel from start to finish as a generator, yielding a
+    GenerationSnapshot after each generation. The run is started with algorithm.start, so if resume is set it carries
+    on from a checkpoint if there is one, and then evolved until evaluate finds a schedule. It can also be stopped
+    early, by should_stop, time_budget or max_generations, in which case the fittest schedule so far is chosen and its
+    report saved by algorithm.stop. These are checked between generations, so a generation which has started always
+    finishes.
+
+    The last snapshot has finished set to True, and the generator returns the chosen schedule, which is also kept as
+    algorithm.chosen_schedule. Breaking out of the loop before then leaves the run where it is, with no schedule chosen
+    and any checkpoint left in place to resume from.
+
+    :param algorithm: the GeneticAlgorithm or IslandModel to run
+    :param resume: bool of whether to carry on from the checkpoint of a run which was stopped part way through
+    :param max_generations: integer number of generations to stop after, counted as by evaluate, or None for no limit
+    :param time_budget: number of seconds after which to stop, or None for no limit
+    :param should_stop: function taking no arguments which returns True to cancel the run, or None
+    :param min_interval: minimum number of seconds between snapshots, so a UI is not redrawn more often than it needs
+        to be. Generations in between are run without yielding a snapshot. The first and last snapshots are always
+        yielded
+    :param histogram_bins: integer number of bins in the fitness histogram of each snapshot
+    :returns: the chosen schedule
+    """
+    start_time = time.perf_counter()
+    algorithm.chosen_schedule = None
+    (
+        continue_eval,
+        chosen_schedule,
+        fitness,
+        iteration,
+        schedule_fitnesses,
+    ) = algorithm.start(resume)
+    last_snapshot_time = None
+    stopped_early = None
+
+    def snapshot(**final_details) -> GenerationSnapshot:
+        """
+        Function to describe the current state of the run
+
+        :param final_details: the finished, viable, file_name and stopped_early fields, for the last snapshot
+        :returns: GenerationSnapshot of the run
+        """
+        fitness_counts, fitness_bin_edges = np.histogram(
+            schedule_fitnesses, bins=histogram_bins
+        )
+        return GenerationSnapshot(
+            iteration=iteration,
+            elapsed_s=time.perf_counter() - start_time,
+            best_fitness=fitness,
+            num_viable=algorithm.count_viable(),
+            population_size=len(schedule_fitnesses),
+            fitness_counts=tuple(fitness_counts.tolist()),
+            fitness_bin_edges=tuple(fitness_bin_edges.tolist()),
+            timings=algorithm.stats.last_generation_timings(),
+            resumed=algorithm.resumed,
+            **final_details,
+        )
+
+    while continue_eval:
+        now = time.perf_counter()
+        if last_snapshot_time is None or now - last_snapshot_time >= min_interval:
+            last_snapshot_time = now
+            yield snapshot()
+
+        if should_stop is not None and should_stop():
+            stopped_early = "cancelled"
+        elif (
+            time_budget is not None
+            and time.perf_counter() - start_time >= time_budget
+        ):
+            stopped_early = "time_budget"
+        elif max_generations is not None and iteration >= max_generations:
+            stopped_early = "max_generations"
+        if stopped_early is not None:
+            logging.info(
+                f"Run stopped early ({stopped_early}) at iteration {iteration}, choosing the fittest schedule so far"
+            )
+            chosen_schedule = algorithm.stop()
+            fitness = chosen_schedule.fitness
+            break
+
+        (
+            continue_eval,
+            chosen_schedule,
+            fitness,
+            iteration,
+            schedule_fitnesses,
+        ) = algorithm.evolve()
+
+    algorithm.chosen_schedule = chosen_schedule
+    yield snapshot(
+        finished=True,
+        viable=bool(chosen_schedule.viable),
+        file_name=chosen_schedule.file_name,
+        stopped_early=stopped_early,
+    )
+    return chosen_schedule
+
+
+async def run_generations_async(algorithm, **run_options):
+    """
+    Function to run a GeneticAlgorithm or IslandModel as an asynchronous generator, for frontends built on asyncio.
+    Each generation is run on a separate thread so that the event loop is not held up, and a GenerationSnapshot is
+    yielded after each as in run_generations. The chosen schedule is kept as algorithm.chosen_schedule. If the task
+    running the loop is cancelled, the generation being run finishes and the run is then left where it is, as when
+    breaking out of run_generations
+
+    :param algorithm: the GeneticAlgorithm or IslandModel to run
+    :param run_options: the resume, max_generations, time_budget, should_stop, min_interval and histogram_bins options
+        of run_generations
+    """
+    generations = run_generations(algorithm, **run_options)
+    loop = asyncio.get_running_loop()
+    # A single thread, so that every generation runs in turn and the generator is only closed once the last has ended
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        try:
+            while True:
+                snapshot = await loop.run_in_executor(
+                    executor, next, generations, None
+                )
+                if snapshot is None:
+                    break
+                yield snapshot
+        finally:
+            await asyncio.shield(loop.run_in_executor(executor, generations.close))
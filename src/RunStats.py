@@ -0,0 +1,232 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+
+# Returned by RunStats.phase when timing is off, so that an untimed phase costs no more than entering an empty block
+NOT_TIMED = nullcontext()
+
+
+class ThreadStats(threading.local):
+    """
+    The RunStats that timed functions record into, set separately for each thread while a phase is running. None
+    outside of phases, so that timed functions run untimed
+    """
+
+    stats = None
+
+
+thread_stats = ThreadStats()
+
+
+class RunStats:
+    """
+    The RunStats records how much wall-clock time a run spends in each phase of the genetic algorithm, and how many
+    times each phase runs, so that a slow run can be understood without attaching a profiler. Phases are timed with
+    the phase context manager, and functions decorated with timed, such as Schedule.get_fitness, are timed whenever
+    they are called within a phase. Phases can be nested, so the time of get_fitness is also counted in the phase it
+    was called from.
+
+    Timings from worker processes are added with merge. These are the total time spent across all workers, so with
+    more than one worker they can be more than the wall-clock time of the phase that ran them.
+
+    At the end of each generation, end_generation adds the generation's timings to the totals and, if a timings_file
+    is given, appends them to it as one line of JSON. When the RunStats is not enabled nothing is recorded.
+
+    For more detail see documentation at docs/ga.md
+
+    param: enabled: Bool of whether timings are recorded
+    param: timings_file: Path of the JSON lines file each generation's timings are appended to, or None
+    param: generation_timings: Dictionary of [calls, seconds] for each phase in the current generation
+    param: total_timings: Dictionary of [calls, seconds] for each phase in all finished generations
+    param: generations: Integer number of finished generations
+    param: last_generation: Dictionary of the details and timings of the last finished generation, as written to
+        timings_file
+    """
+
+    def __init__(self, enabled: bool = False, timings_file: str = None):
+        self.enabled = enabled
+        self.timings_file = timings_file or None
+        self.generation_timings = {}
+        self.total_timings = {}
+        self.generations = 0
+        self.last_generation = None
+
+    def record(self, name: str, seconds: float, calls: int = 1):
+        """
+        Function to add time spent in a phase to the current generation
+
+        :param name: the name of the phase
+        :param seconds: the time spent in the phase
+        :param calls: the integer number of times the phase ran
+        """
+        timing = self.generation_timings.get(name)
+        if timing is None:
+            self.generation_timings[name] = [calls, seconds]
+        else:
+            timing[0] += calls
+            timing[1] += seconds
+
+    def merge(self, timings: dict):
+        """
+        Function to add timings recorded by another RunStats, such as one in a worker process, to the current
+        generation
+
+        :param timings: dictionary of [calls, seconds] for each phase, as returned by take
+        """
+        for name, (calls, seconds) in timings.items():
+            self.record(name, seconds, calls)
+
+    def take(self) -> dict:
+        """
+        Function to remove and return the timings of the current generation, so that they can be sent to another
+        process and merged there
+
+        :returns: dictionary of [calls, seconds] for each phase
+        """
+        timings = self.generation_timings
+        self.generation_timings = {}
+        return timings
+
+    @contextmanager
+    def recording(self):
+        """
+        Function to make this the RunStats that timed functions record into on the current thread, until the block
+        ends
+        """
+        previous_stats = thread_stats.stats
+        thread_stats.stats = self
+        try:
+            yield
+        finally:
+            thread_stats.stats = previous_stats
+
+    @contextmanager
+    def timer(self, name: str):
+        """
+        Function to time a block as a phase, recording any timed functions called within it
+        """
+        with self.recording():
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+    def phase(self, name: str):
+        """
+        Function to time a phase, for use as a context manager: with stats.phase("culling"): ...
+
+        :param name: the name of the phase
+        :returns: a context manager timing the block, or one which does nothing if the RunStats is not enabled
+        """
+        if not self.enabled:
+            return NOT_TIMED
+        return self.timer(name)
+
+    def end_generation(self, iteration: int, **details) -> dict:
+        """
+        Function to finish the timings of a generation, adding them to the totals and writing them to timings_file
+
+        :param iteration: the integer number of the generation
+        :param details: any other values to be written alongside the timings, such as the best fitness
+        :returns: dictionary of the generation's details and timings, or None if the RunStats is not enabled
+        """
+        if not self.enabled:
+            return None
+        timings = self.take()
+        for name, (calls, seconds) in timings.items():
+            total = self.total_timings.setdefault(name, [0, 0.0])
+            total[0] += calls
+            total[1] += seconds
+        self.generations += 1
+
+        generation = {
+            "iteration": iteration,
+            "timestamp": datetime.now().isoformat(timespec="milliseconds"),
+            **details,
+            "timings": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in timings.items()
+            },
+        }
+        if self.timings_file is not None:
+            timings_folder = os.path.dirname(self.timings_file)
+            if timings_folder:
+                os.makedirs(timings_folder, exist_ok=True)
+            with open(self.timings_file, "a") as timings_file:
+                timings_file.write(json.dumps(generation) + "\n")
+        self.last_generation = generation
+        return generation
+
+    def last_generation_timings(self) -> dict:
+        """
+        Function to give the timings of the last finished generation
+
+        :returns: dictionary of the calls and seconds of each phase, or None if no generation has finished or the
+            RunStats is not enabled
+        """
+        if self.last_generation is None:
+            return None
+        return self.last_generation["timings"]
+
+    def stats(self) -> dict:
+        """
+        Function to summarise where the time of the run has gone, over all finished generations
+
+        :returns: dictionary of the number of generations and the calls, total seconds and mean seconds of each phase,
+            slowest phase first
+        """
+        return {
+            "generations": self.generations,
+            "timings": {
+                name: {
+                    "calls": calls,
+                    "seconds": seconds,
+                    "mean_s": seconds / calls if calls else 0.0,
+                }
+                for name, (calls, seconds) in sorted(
+                    self.total_timings.items(), key=lambda item: -item[1][1]
+                )
+            },
+        }
+
+    def summary(self) -> str:
+        """
+        Function to describe where the time of the run has gone, for the log
+
+        :returns: a string with a line for each phase, slowest phase first
+        """
+        lines = [f"Time spent in each phase over {self.generations} generations:"]
+        for name, timing in self.stats()["timings"].items():
+            lines.append(
+                f"  {name}: {timing['seconds']:.3f}s in {timing['calls']} calls, {timing['mean_s'] * 1000:.3f}ms each"
+            )
+        return "\n".join(lines)
+
+
+def timed(name: str):
+    """
+    Function to decorate a function so that each call is recorded as the phase name, whenever it is called within a
+    phase of an enabled RunStats on the same thread. Otherwise the function runs untimed
+
+    :param name: the name of the phase
+    :returns: the decorator
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            stats = thread_stats.stats
+            if stats is None:
+                return function(*args, **kwargs)
+            with stats.timer(name):
+                return function(*args, **kwargs)
+
+        return timed_function
+
+    return decorator
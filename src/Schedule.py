@@ -1,16 +1,58 @@
-from random import randint, shuffle, randrange
+from random import randint, sample
 import copy
-import math
-import collections
-from xmlrpc.client import Boolean
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import re
 from typing import Tuple
-import yaml
 import os
 import logging
+from src.ProblemInstance import (
+    ProblemInstance,
+    PART_INDEX,
+    TOTAL_INDEX,
+    UNASSIGNED,
+    count_new_tokens,
+    segment_positions,
+)
+from src.Vocabulary import clean_departments
+from src.Config import Config, tool_path
+from src.FitnessCache import FitnessCache
+from src.RunStats import timed
+
+
+# Columns of the schedule dataframe saved to the CSV, with one row per placement week
+CSV_COLUMNS = [
+    "nurse_name",
+    "nurse_uni_cohort",
+    "placement_part",
+    "placement_start",
+    "placement_start_date",
+    "placement_week",
+    "placement_duration",
+    "ward_name",
+    "department",
+    "ward_capacity",
+    "p1_ward_capacity",
+    "p2_ward_capacity",
+    "p3_ward_capacity",
+    "ed_audit_exp_week",
+]
+
+
+def results_directory(results_folder: str) -> str:
+    """
+    Function to find the folder that reports are saved to, creating it if needed
+
+    :param results_folder: results_folder from params.yml, relative to the tool's folder unless it is an absolute path
+    :returns: path of the results folder
+    """
+    save_directory = tool_path(results_folder)
+    try:
+        os.makedirs(save_directory)
+    except OSError:
+        pass  # already exists
+    return save_directory
 
 
 class Schedule:
@@ -18,9 +60,15 @@ class Schedule:
     A Schedule object contains a complete set of student placements across all wards. When the genetic algorithm is run there are many 
     Schedule objects which are manipulated and scored to try and reach the best possible solution.
 
-    param: conf_placements: An empty list for confirmed placements to be stored in
-    param total_slots: An integer number of empty lists to be inserted into slots
-    param: slots: An empty list of lists for slots to be created in
+    The schedule is stored as a single array holding the id of the ward each placement is assigned to. Which placements
+    are on a ward in a given week is derived from this array when it is needed, and the number of students on each ward in
+    each week is kept up to date in an occupancy array so that capacity checks are simple lookups.
+
+    param: instance: A ProblemInstance holding the static slot, ward and placement data shared by all schedules
+    param: config: The Config read from config/params.yml, shared by all schedules
+    param: assignment: An array with one ward id per placement (UNASSIGNED where no ward has been chosen)
+    param: occupancy: A (wards x week slots x 4) array counting P1, P2, P3 and overall students on each ward each week
+    param: scored_ward: An array of the ward each placement was on when it was last scored (None until first scored)
     param: wards: A list of Ward objects where placements can take place
     param: placements: A list of Placement objects to be assigned
     param: placement_slots: A list of Slot objects for placements on wards to be assigned into
@@ -29,13 +77,43 @@ class Schedule:
     param: fitness: A float initialising the fitness score for this schedule
     param: viable: A Boolean initialising the viability of this schedule
     param: non_viable_reason: A None string initialising the explanation for why the schedule is not viable
+    param: unplaceable: An array of placements which no ward had room for when the schedule was generated
     """
 
-    def __init__(self, slots: list, wards: list, placements: list, num_weeks: int):
-        self.conf_placements = []
-        self.slots = []
-        total_slots = len(slots) * len(wards)
-        self.slots = [[] for _ in range(0, total_slots)]
+    # Arrays which make up the state of a schedule and must not be shared between schedules
+    state_arrays = (
+        "assignment",
+        "occupancy",
+        "scored_ward",
+        "within_capacity",
+        "covid_compatible",
+        "double_booked",
+        "start_occupancy",
+        "ward_util_numerator",
+        "student_active",
+        "student_uniq_wards",
+        "student_uniq_deps",
+        "student_speciality",
+    )
+
+    # Attributes holding data shared by every schedule in a run, which are left out when a schedule is sent
+    # between processes as each process already holds its own copy
+    shared_attributes = ("instance", "config", "wards", "placements", "placement_slots")
+
+    def __init__(
+        self,
+        slots: list,
+        wards: list,
+        placements: list,
+        num_weeks: int,
+        instance: ProblemInstance = None,
+        config: Config = None,
+    ):
+        if instance is None:
+            instance = ProblemInstance(slots, wards, placements, num_weeks)
+        self.instance = instance
+        self.assignment = np.full(len(placements), UNASSIGNED, dtype=np.int64)
+        self.occupancy = instance.occupancy_counts(self.assignment)
 
         self.wards = wards
         self.placements = placements
@@ -46,56 +124,86 @@ class Schedule:
         self.fitness = 0.0
         self.viable = False
         self.non_viable_reason = None
+        self.scored_ward = None
+        self.unplaceable = np.zeros(0, dtype=np.int64)
+
+        if config is None:
+            config = Config.load()
+        self.config = config
+        schedule_params = config.schedule_params
+
+        self.medical_placement_check = schedule_params.medical_placement_check
+        self.surgical_placement_check = schedule_params.surgical_placement_check
+        self.community_placement_check = schedule_params.community_placement_check
+        self.critical_care_placement_check = (
+            schedule_params.critical_care_placement_check
+        )
 
-        with open("config/params.yml") as f:
-            params = yaml.load(f, Loader=yaml.FullLoader)
+        self.within_capacity_scoring_factor = (
+            schedule_params.within_capacity_scoring_factor
+        )
+        self.double_booked_scoring_factor = schedule_params.double_booked_scoring_factor
+        self.correct_num_wards_scoring_factor = (
+            schedule_params.correct_num_wards_scoring_factor
+        )
+        self.uniq_departments_scoring_factor = (
+            schedule_params.uniq_departments_scoring_factor
+        )
+        self.uniq_wards_scoring_factor = schedule_params.uniq_wards_scoring_factor
+        self.all_placements_assigned_scoring_factor = (
+            schedule_params.all_placements_assigned_scoring_factor
+        )
+        self.capacity_utilisation_scoring_factor = (
+            schedule_params.capacity_utilisation_scoring_factor
+        )
 
-        self.medical_placement_check = params["schedule_params"][
-            "medical_placement_check"
-        ]
-        self.surgical_placement_check = params["schedule_params"][
-            "surgical_placement_check"
-        ]
-        self.community_placement_check = params["schedule_params"][
-            "community_placement_check"
-        ]
-        self.critical_care_placement_check = params["schedule_params"][
-            "critical_care_placement_check"
-        ]
+        self.medical_placement_scoring_factor = (
+            schedule_params.medical_placement_scoring_factor
+        )
+        self.surgical_placement_scoring_factor = (
+            schedule_params.surgical_placement_scoring_factor
+        )
+        self.community_placement_scoring_factor = (
+            schedule_params.community_placement_scoring_factor
+        )
+        self.critical_care_placement_scoring_factor = (
+            schedule_params.critical_care_placement_scoring_factor
+        )
 
-        self.within_capacity_scoring_factor = params["schedule_params"][
-            "within_capacity_scoring_factor"
-        ]
-        self.double_booked_scoring_factor = params["schedule_params"][
-            "double_booked_scoring_factor"
-        ]
-        self.correct_num_wards_scoring_factor = params["schedule_params"][
-            "correct_num_wards_scoring_factor"
-        ]
-        self.uniq_departments_scoring_factor = params["schedule_params"][
-            "uniq_departments_scoring_factor"
-        ]
-        self.uniq_wards_scoring_factor = params["schedule_params"][
-            "uniq_wards_scoring_factor"
-        ]
-        self.all_placements_assigned_scoring_factor = params["schedule_params"][
-            "all_placements_assigned_scoring_factor"
-        ]
-        self.capacity_utilisation_scoring_factor = params["schedule_params"][
-            "capacity_utilisation_scoring_factor"
-        ]
+        self.seeding_attempts = schedule_params.seeding_attempts
+        self.save_schedule_csv = schedule_params.save_csv
+        self.results_folder = schedule_params.results_folder
 
-        self.medical_placement_scoring_factor = params["schedule_params"][
-            "medical_placement_scoring_factor"
-        ]
-        self.surgical_placement_scoring_factor = params["schedule_params"][
-            "surgical_placement_scoring_factor"
-        ]
-        self.community_placement_scoring_factor = params["schedule_params"][
-            "community_placement_scoring_factor"
+        ####################################################################################
+        ## NOTE THAT THE BELOW IS CURRENT TURNED OFF USING BOOLEANS SET AT START OF CLASS ##
+        ####################################################################################
+        # Speciality checks reward each student whose departments include one of the words
+        speciality_checks = [
+            (
+                self.medical_placement_check,
+                ["Medical", "Medicine"],
+                self.medical_placement_scoring_factor,
+            ),
+            (
+                self.surgical_placement_check,
+                ["Surgical", "Surgery"],
+                self.surgical_placement_scoring_factor,
+            ),
+            (
+                self.community_placement_check,
+                ["Community"],
+                self.community_placement_scoring_factor,
+            ),
+            (
+                self.critical_care_placement_check,
+                ["Critical", "Emergency"],
+                self.critical_care_placement_scoring_factor,
+            ),
         ]
-        self.critical_care_placement_scoring_factor = params["schedule_params"][
-            "critical_care_placement_scoring_factor"
+        self.speciality_checks = [
+            (re.compile("|".join(check_words), re.IGNORECASE), check_score)
+            for check_boolean, check_words, check_score in speciality_checks
+            if check_boolean
         ]
 
     def id_year_capacity(self, placement: "placement", ward_id: int) -> int:
@@ -107,95 +215,97 @@ class Schedule:
         :returns: capacity for the specific type of placement and ward
         """
 
-        if placement.part == "P1":
-            year_cap = self.wards[ward_id].p1_capacity
-        elif placement.part == "P2":
-            year_cap = self.wards[ward_id].p2_capacity
-        elif placement.part == "P3":
-            year_cap = self.wards[ward_id].p3_capacity
-        else:
-            year_cap = self.wards[ward_id].capacity
+        year_cap = self.instance.ward_capacity[
+            ward_id, PART_INDEX.get(placement.part, TOTAL_INDEX)
+        ]
 
         return year_cap
 
-    def calc_slot_index(self, ward_id: int, num_weeks: int, start_week: int) -> int:
-        """
-        Function to calculate the index for the slot based on the id of the ward,
-        the total number of weeks the schedule is produced over and
-        the start week of the placement
-
-        :param ward_id: id of the ward as per original data
-        :param num_weeks: total integer number of weeks the entire schedule covers
-        :param start_week: week number that the placement starts in
-        :returns: the id within the slots class object that the placement starts on
-        """
-
-        return int((ward_id * num_weeks) + start_week + 1)
-
+    @timed("schedule_generation")
     def schedule_generation(self):
         """
-        Function to initialise a schedule which is generated by randomly choosing a
-        ward for the placement to occur on
+        Function to initialise a schedule by placing each placement on a randomly chosen ward with
+        room for it. Placements with the fewest possible wards, then the longest placements, are
+        placed first so that they are not crowded out. A placement which no ward has room for is
+        left unassigned and recorded in unplaceable.
 
-        :returns: no explicit return but populates conf_placements class object
+        :returns: no explicit return but populates assignment, occupancy and unplaceable class objects
         """
-
-        for p in self.placements:
-            placement_duration = int(p.duration)
-            invalid_ward = True
-
-            # Find a ward which valid based on capacity and education audit
-            while invalid_ward:
-                invalid_ward = False
-                ward_id = randint(0, len(self.wards) - 1)
-                slot_index_increment = self.calc_slot_index(
-                    ward_id, self.num_weeks, p.start
+        ward_capacity = self.instance.ward_capacity[:, TOTAL_INDEX]
+        unplaceable = []
+
+        for placement_id in self.instance.seeding_order:
+            start_week = self.instance.placement_start_week[placement_id]
+            end_week = start_week + self.instance.placement_duration[placement_id]
+            part = self.instance.placement_part[placement_id]
+            # Only wards with a compatible covid status and capacity for the placement's part are considered
+            feasible_wards = self.instance.feasible_wards[placement_id]
+            if not len(feasible_wards):
+                unplaceable.append(placement_id)
+                continue
+
+            # Try a few random wards first, as when wards are not full one is usually found quickly
+            ward_id = UNASSIGNED
+            for attempt in range(self.seeding_attempts):
+                candidate = feasible_wards[randint(0, len(feasible_wards) - 1)]
+                ward_weeks = self.occupancy[candidate, start_week:end_week]
+                # Check if overall capacity breached, and then whether year-specific capacity satisfied
+                if (ward_weeks[:, TOTAL_INDEX] < ward_capacity[candidate]).all() and (
+                    ward_weeks[:, part] < self.instance.ward_capacity[candidate, part]
+                ).all():
+                    ward_id = candidate
+                    break
+
+            # Otherwise choose from every ward which has room in each week of the placement
+            if ward_id == UNASSIGNED:
+                busiest_weeks = self.occupancy[feasible_wards, start_week:end_week].max(
+                    axis=1
                 )
-
-                year_cap = self.id_year_capacity(p, ward_id)
-                if year_cap == 0:
-                    invalid_ward = True
-                else:
-                    for i in range(0, placement_duration):
-                        # Check if overall capacity breached or ward has expired education audit
-                        if (
-                            len(self.slots[slot_index_increment])
-                            >= self.wards[ward_id].capacity
-                        ) or (
-                            (p.covid_status == "Low/Medium")
-                            and (self.wards[ward_id].covid_status == "Medium/High")
-                        ):
-                            invalid_ward = True
-                            break
-                        else:
-                            # If overall cap and education audit are fine, check whether year-specific capacity satisfied
-                            same_year_count = 0
-                            for plac in self.slots[slot_index_increment]:
-                                if plac.part == p.part:
-                                    same_year_count += 1
-                            if same_year_count >= year_cap:
-                                invalid_ward = True
-                                break
-                            if invalid_ward:
-                                break
-                        slot_index_increment += 1
+                has_room = (
+                    busiest_weeks[:, TOTAL_INDEX] < ward_capacity[feasible_wards]
+                ) & (
+                    busiest_weeks[:, part]
+                    < self.instance.ward_capacity[feasible_wards, part]
+                )
+                available_wards = feasible_wards[has_room]
+                if not len(available_wards):
+                    unplaceable.append(placement_id)
+                    continue
+                ward_id = available_wards[randint(0, len(available_wards) - 1)]
 
             # Now that ward has been identified, populate schedule
-            overall_slot_index = self.calc_slot_index(ward_id, self.num_weeks, p.start)
-            slot_index_increment = overall_slot_index
-            for i in range(0, placement_duration):
-                self.slots[slot_index_increment].append(p)
-                slot_index_increment += 1
-
-            self.conf_placements.append(
-                {
-                    "placement": p,
-                    "slotIndex": overall_slot_index,
-                    "startweek": p.start,
-                    "length": placement_duration,
-                }
+            self.assign_placement(placement_id, ward_id)
+
+        self.unplaceable = np.array(sorted(unplaceable), dtype=np.int64)
+        if len(unplaceable):
+            logging.debug(
+                f"{len(unplaceable)} placements could not be placed on a ward with room and have been left unassigned"
             )
 
+    def assign_placement(self, placement_id: int, ward_id: int):
+        """
+        Function to assign a placement to a ward, keeping the occupancy counts up to date
+
+        :param placement_id: index of the placement within the placements list
+        :param ward_id: id of the ward the placement is to be assigned to
+        :returns: no explicit return but updates assignment and occupancy class objects
+        """
+        start_week = self.instance.placement_start_week[placement_id]
+        end_week = start_week + self.instance.placement_duration[placement_id]
+        part = self.instance.placement_part[placement_id]
+
+        previous_ward = self.assignment[placement_id]
+        if previous_ward != UNASSIGNED:
+            self.occupancy[previous_ward, start_week:end_week, TOTAL_INDEX] -= 1
+            if part != TOTAL_INDEX:
+                self.occupancy[previous_ward, start_week:end_week, part] -= 1
+
+        self.assignment[placement_id] = ward_id
+        if ward_id != UNASSIGNED:
+            self.occupancy[ward_id, start_week:end_week, TOTAL_INDEX] += 1
+            if part != TOTAL_INDEX:
+                self.occupancy[ward_id, start_week:end_week, part] += 1
+
     def clean_departments(self, output_string: str) -> list:
         """
         Function to clean up a list of department names for analysis. Removes some non-required words.
@@ -203,308 +313,426 @@ class Schedule:
         :params output_string: the string to be cleaned, containing multiple department names
         :returns: a clean list of individual words seen in original string
         """
-        replace_dict = {
-            ",": "",
-            "and": "",
-            "the": "",
-            "of": "",
-            "eneral": "general",
-            "None": "",
-            "-": "",
-            "\xa0": " ",
-            "  ": " ",
-        }
-        for word, replacement in replace_dict.items():
-            output_string = output_string.replace(word, replacement)
-        output_string = output_string.lower()
-        output_list = output_string.split(" ")
-        return output_list
+        return clean_departments(output_string)
 
+    @timed("get_fitness")
     def get_fitness(self):
         """
-        Function to assess the fitness of each schedule according to a range of metrics
+        Function to assess the fitness of each schedule according to a range of metrics. Results are
+        held per placement and per student so that move_placement can update the fitness after a
+        single placement is moved without re-scoring the whole schedule.
 
         :returns: no explicit return but updates various class object parameters
         """
-        self.schedule_scores = 0
-        self.placement_wards = collections.defaultdict(list)
-        self.placement_deps = collections.defaultdict(list)
-        self.viable = None  # Viable variable indicates whether a schedule
-        # could be used i.e. no hard constraints
-        # are breached
-
-        self.schedule_eval_scores = {}
-        self.schedule_eval_scores["cap_exceeded_score"] = 0
-        self.schedule_eval_scores["double_booked_score"] = 0
-        ward_utilisation = []
-        unallocatedPlacements = []
-
-        # Create a list of placements to be allocated, so we can check
-        # later whether all placements allocated in a schedule
-        placementsToAllocate = [p.id for p in self.placements]
-        for confirmed_placement in self.conf_placements:
-            schedule_score_component = 0
-
-            if confirmed_placement["placement"].id in placementsToAllocate:
-                placementsToAllocate.remove(confirmed_placement["placement"].id)
-            else:
-                unallocatedPlacements.append(confirmed_placement["placement"].id)
+        num_placements = self.instance.num_placements
+        num_students = self.instance.num_students
+
+        self.scored_ward = np.full(num_placements, UNASSIGNED, dtype=np.int64)
+        self.within_capacity = np.zeros(num_placements, dtype=bool)
+        self.covid_compatible = np.zeros(num_placements, dtype=bool)
+        self.double_booked = np.zeros(num_placements, dtype=bool)
+        self.start_occupancy = np.zeros(num_placements, dtype=np.int64)
+        self.ward_util_numerator = np.zeros(self.instance.num_wards, dtype=np.int64)
+
+        self.num_assigned = 0
+        self.num_within_capacity = 0
+        self.num_covid_incompatible = 0
+        self.num_double_booked = 0
+        self.num_fully_scored = 0
+
+        self.student_active = np.zeros(num_students, dtype=bool)
+        self.student_uniq_wards = np.zeros(num_students, dtype=float)
+        self.student_uniq_deps = np.zeros(num_students, dtype=float)
+        self.student_speciality = np.zeros(
+            (num_students, len(self.speciality_checks)), dtype=bool
+        )
 
-            placement_index = int(confirmed_placement["slotIndex"])
-            ward_index = int(math.floor(placement_index / len(self.placement_slots)))
+        self.rescore_placements(np.arange(num_placements))
+        self.rescore_students(np.arange(num_students))
+        self.score_totals()
 
-            ward = self.wards[ward_index]
+    def score(self, fitness_cache: FitnessCache = None):
+        """
+        Function to score the schedule, first checking whether an identical schedule has already been scored. A
+        schedule given its fitness from the cache is left without per-placement scores, and is fully scored when
+        it is next changed or reported on
 
-            # Add Ward and Speciality to each nurse's individual list
-            nurse_name = confirmed_placement["placement"].name.split("_", maxsplit=1)[0]
+        :param fitness_cache: FitnessCache of schedules already scored, or None to always score
+        :returns: no explicit return but updates fitness and viable class objects
+        """
+        if fitness_cache is None:
+            self.get_fitness()
+            return
+
+        key = fitness_cache.genome_key(self.assignment)
+        cached = fitness_cache.get(key)
+        if cached is None:
+            self.get_fitness()
+            fitness_cache.put(key, (self.fitness, self.viable))
+        else:
+            self.fitness, self.viable = cached
+            self.scored_ward = None
 
-            # Maximise variety of wards
-            if not self.placement_wards[nurse_name]:
-                previous_wards = confirmed_placement["placement"].wardhistory.split(
-                    ", "
-                )
-                for old_ward in previous_wards:
-                    self.placement_wards[nurse_name].append(old_ward)
-
-            self.placement_wards[nurse_name].append(ward.ward)
-            # Maximise variety of specialities
-            if not self.placement_deps[nurse_name]:
-                previous_departments = self.clean_departments(
-                    confirmed_placement["placement"].dephistory
-                )
-                self.placement_deps[nurse_name] = previous_departments
+    def move_placement(self, placement_id: int, ward_id: int):
+        """
+        Function to move a single placement to a different ward and update the fitness of the
+        schedule. Only the placements starting on the ward-weeks the move affects, and the
+        placements of the same student, are re-scored.
 
-            dep_clean = self.clean_departments(ward.department)
-            for dep_word in dep_clean:
-                self.placement_deps[nurse_name].append(dep_word)
+        :param placement_id: index of the placement within the placements list
+        :param ward_id: id of the ward the placement is to be moved to
+        :returns: no explicit return but updates assignment, occupancy and fitness class objects
+        """
+        previous_ward = self.assignment[placement_id]
+        if previous_ward == ward_id:
+            return
+        self.assign_placement(placement_id, ward_id)
+        if self.scored_ward is None:
+            self.get_fitness()
+            return
+
+        start_week = self.instance.placement_start_week[placement_id]
+        end_week = start_week + self.instance.placement_duration[placement_id]
+        nearby = self.instance.placements_starting_between(start_week, end_week)
+        nearby_wards = self.assignment[nearby]
+        affected = nearby[
+            ((nearby_wards == previous_ward) | (nearby_wards == ward_id))
+            & (nearby_wards != UNASSIGNED)
+        ]
+        student = self.instance.placement_student[placement_id]
+        affected = np.union1d(affected, self.instance.student_placements[student])
 
-            # Check if wards have exceeded capacity of assigned placements #
-            year_cap = self.id_year_capacity(
-                confirmed_placement["placement"], ward_index
-            )
+        self.rescore_placements(affected)
+        self.rescore_students(np.array([student]))
+        self.score_totals()
 
-            year_count = 0
-            for oth_placement in self.slots[placement_index]:
-                if oth_placement.part == confirmed_placement["placement"].part:
-                    year_count += 1
-
-            if (
-                len(self.slots[placement_index]) <= self.wards[ward_index].capacity
-            ) and (year_count <= year_cap):
-                schedule_score_component += self.within_capacity_scoring_factor
-                self.schedule_eval_scores[
-                    "cap_exceeded_score"
-                ] += self.within_capacity_scoring_factor
-            else:
-                schedule_score_component = 0
-                self.schedule_eval_scores["cap_exceeded_score"] = 0
-                self.viable = False
-                self.non_viable_reason = "Cap Exceeded"
-
-            if self.wards[ward_index].capacity != 0:
-                ward_utilisation.append(
-                    len(self.slots[placement_index]) / self.wards[ward_index].capacity
-                )
-            else:
-                ward_utilisation.append(0)
-
-            # Check if student's covid status can accommodate selected ward
-            if (confirmed_placement["placement"].covid_status == "Low/Medium") and (
-                self.wards[ward_index].covid_status == "Medium/High"
-            ):
-                schedule_score_component = 0
-                self.viable = False
-                self.non_viable_reason = "Covid status not compatible"
-
-            # Check if student has another placement arranged for a different
-            # ward at the same time ##
-            double_booked = False
-            for id in range(1, len(self.wards)):
-                if id != ward_index:
-                    indexForChecking = self.calc_slot_index(
-                        id, len(self.placement_slots), confirmed_placement["startweek"]
-                    )
-                    if indexForChecking == placement_index:
-                        continue
-
-                    if len(self.slots[indexForChecking]):
-                        for potential_match in self.slots[indexForChecking]:
-                            if (
-                                potential_match.name
-                                == confirmed_placement["placement"].name
-                            ):
-                                double_booked = True
-                                break
-                    else:
-                        continue
-            if not double_booked:
-                schedule_score_component += self.double_booked_scoring_factor
-                self.schedule_eval_scores[
-                    "double_booked_score"
-                ] += self.double_booked_scoring_factor
-            else:
-                self.viable = False
-                self.non_viable_reason = "Double booked"
-                schedule_score_component = 0
-                self.schedule_eval_scores["double_booked_score"] = 0
-            self.schedule_scores += schedule_score_component
-
-        self.schedule_eval_scores["mean_ward_util"] = sum(ward_utilisation) / len(
-            ward_utilisation
+    def tally_placements(self, placement_ids: np.ndarray, sign: int):
+        """
+        Function to add (or with a negative sign, remove) the scored results of placements to the running totals
+
+        :param placement_ids: array of placement indices
+        :param sign: 1 to add the placements to the totals or -1 to remove them
+        :returns: no explicit return but updates running total class objects
+        """
+        placement_ids = placement_ids[self.scored_ward[placement_ids] != UNASSIGNED]
+        within_capacity = self.within_capacity[placement_ids]
+        covid_compatible = self.covid_compatible[placement_ids]
+        double_booked = self.double_booked[placement_ids]
+
+        self.num_assigned += sign * len(placement_ids)
+        self.num_within_capacity += sign * int(np.count_nonzero(within_capacity))
+        self.num_covid_incompatible += sign * int(
+            np.count_nonzero(~covid_compatible)
+        )
+        self.num_double_booked += sign * int(np.count_nonzero(double_booked))
+        self.num_fully_scored += sign * int(
+            np.count_nonzero(within_capacity & covid_compatible & ~double_booked)
+        )
+        np.add.at(
+            self.ward_util_numerator,
+            self.scored_ward[placement_ids],
+            sign * self.start_occupancy[placement_ids],
         )
 
-        mean_uniq_wards_list = []
-        for assigned_wards in self.placement_wards.values():
-            mean_uniq_wards_list.append(len(set(assigned_wards)) / len(assigned_wards))
-        prop_uniq_wards = sum(mean_uniq_wards_list) / len(mean_uniq_wards_list)
-        self.add_score(self.uniq_wards_scoring_factor * prop_uniq_wards)
-        self.schedule_eval_scores["mean_uniq_wards"] = prop_uniq_wards
+    def rescore_placements(self, placement_ids: np.ndarray):
+        """
+        Function to check capacity, covid status and double booking for a set of placements
 
-        ## Reward schedules which have a unique set of departments ##
-        mean_uniq_deps_list = []
-        for assigned_departments in self.placement_deps.values():
-            mean_uniq_deps_list.append(
-                len(set(assigned_departments)) / len(assigned_departments)
-            )
+        :param placement_ids: array of placement indices to be re-scored
+        :returns: no explicit return but updates per-placement results and running totals
+        """
+        self.tally_placements(placement_ids, -1)
+        self.scored_ward[placement_ids] = self.assignment[placement_ids]
 
-        mean_uniq_deps = sum(mean_uniq_deps_list) / len(mean_uniq_deps_list)
-        self.add_score(self.uniq_departments_scoring_factor * mean_uniq_deps)
+        placement_ids = placement_ids[self.assignment[placement_ids] != UNASSIGNED]
+        ward_ids = self.assignment[placement_ids]
+        parts = self.instance.placement_part[placement_ids]
+        rows = np.arange(len(placement_ids))
 
-        self.schedule_eval_scores["mean_uniq_deps"] = mean_uniq_deps
+        # Check if wards have exceeded capacity of assigned placements in the week they start
+        start_occupancy = self.occupancy[
+            ward_ids, self.instance.placement_start_week[placement_ids]
+        ]
+        ward_count = start_occupancy[:, TOTAL_INDEX]
+        year_count = start_occupancy[rows, parts]
+        capacity = self.instance.ward_capacity[ward_ids]
+        self.within_capacity[placement_ids] = (
+            ward_count <= capacity[:, TOTAL_INDEX]
+        ) & (year_count <= capacity[rows, parts])
+        self.start_occupancy[placement_ids] = ward_count
+
+        # Check if student's covid status can accommodate selected ward
+        self.covid_compatible[placement_ids] = ~self.instance.covid_conflict[
+            placement_ids, ward_ids
+        ]
 
-        ####################################################################################
-        ## NOTE THAT THE BELOW IS CURRENT TURNED OFF USING BOOLEANS SET AT START OF CLASS ##
-        ####################################################################################
+        # Check if student has another placement arranged for a different ward at the same time. Only
+        # placements whose student has more than one placement running in their start week need checking
+        overlapped = np.flatnonzero(self.instance.placement_overlapped[placement_ids])
+        rows, positions = segment_positions(
+            self.instance.overlap_pointer, placement_ids[overlapped]
+        )
+        other_wards = self.assignment[self.instance.overlap_other[positions]]
+        clashes = (other_wards != UNASSIGNED) & (
+            other_wards != ward_ids[overlapped][rows]
+        )
+        double_booked = np.zeros(len(placement_ids), dtype=bool)
+        double_booked[overlapped] = (
+            np.bincount(rows, weights=clashes, minlength=len(overlapped)) > 0
+        )
+        self.double_booked[placement_ids] = double_booked
+
+        self.tally_placements(placement_ids, 1)
+
+    def rescore_students(self, student_ids: np.ndarray):
+        """
+        Function to score the variety of wards and departments each student has been placed on,
+        including wards and departments they have been placed on before. The placements of the
+        students are gathered through the student index of the ProblemInstance and each metric is
+        reduced over the placements of each student at once
 
-        ## Enforce at least one Medical placement
-        ## Increase score if assigned to a Medical ward ##
-        self.check_specific_speciality(
-            self.medical_placement_check,
-            ["Medical", "Medicine"],
-            self.medical_placement_scoring_factor,
+        :param student_ids: array of student indices to be re-scored
+        :returns: no explicit return but updates per-student results
+        """
+        instance = self.instance
+        student_ids = np.asarray(student_ids, dtype=np.int64)
+        num_students = len(student_ids)
+        rows, positions = segment_positions(instance.student_pointer, student_ids)
+        ward_ids = self.assignment[instance.student_placement_ids[positions]]
+        assigned = ward_ids != UNASSIGNED
+        rows, ward_ids = rows[assigned], ward_ids[assigned]
+        students = student_ids[rows]
+
+        num_assigned = np.bincount(rows, minlength=num_students)
+        active = num_assigned > 0
+        self.student_active[student_ids] = active
+
+        # Maximise variety of wards
+        new_wards = count_new_tokens(
+            rows,
+            students,
+            instance.ward_tokens[ward_ids],
+            instance.ward_history_keys,
+            instance.num_ward_tokens,
+            num_students,
+        )
+        self.student_uniq_wards[student_ids] = np.divide(
+            instance.ward_history_unique[student_ids] + new_wards,
+            instance.ward_history_length[student_ids] + num_assigned,
+            out=np.zeros(num_students, dtype=float),
+            where=active,
         )
 
-        ## Increase score if assigned to a Surgical ward ##
-        self.check_specific_speciality(
-            self.surgical_placement_check,
-            ["Surgical", "Surgery"],
-            self.surgical_placement_scoring_factor,
+        # Maximise variety of specialities
+        department_rows, department_positions = segment_positions(
+            instance.ward_department_pointer, ward_ids
+        )
+        new_departments = count_new_tokens(
+            rows[department_rows],
+            students[department_rows],
+            instance.ward_department_ids[department_positions],
+            instance.department_history_keys,
+            instance.num_department_tokens,
+            num_students,
+        )
+        self.student_uniq_deps[student_ids] = np.divide(
+            instance.department_history_unique[student_ids] + new_departments,
+            instance.department_history_length[student_ids]
+            + np.bincount(rows[department_rows], minlength=num_students),
+            out=np.zeros(num_students, dtype=float),
+            where=active,
         )
 
-        ## Increase score if assigned to a Community ward ##
-        self.check_specific_speciality(
-            self.community_placement_check,
-            ["Community"],
-            self.community_placement_scoring_factor,
+        if len(self.speciality_checks):
+            ward_speciality, history_speciality = instance.speciality_matches(
+                self.speciality_checks
+            )
+            for check_index in range(len(self.speciality_checks)):
+                ward_matches = np.bincount(
+                    rows,
+                    weights=ward_speciality[check_index, ward_ids],
+                    minlength=num_students,
+                )
+                self.student_speciality[student_ids, check_index] = active & (
+                    (ward_matches > 0) | history_speciality[check_index, student_ids]
+                )
+
+    def score_totals(self):
+        """
+        Function to combine the per-placement and per-student results into the fitness of the schedule
+
+        :returns: no explicit return but updates fitness, viable and schedule_eval_scores class objects
+        """
+        capacity = self.instance.ward_capacity[:, TOTAL_INDEX]
+        ward_utilisation = np.divide(
+            self.ward_util_numerator,
+            capacity,
+            out=np.zeros(len(capacity), dtype=float),
+            where=capacity != 0,
+        )
+        (
+            self.fitness,
+            self.viable,
+            self.non_viable_reason,
+            self.schedule_scores,
+            self.schedule_eval_scores,
+        ) = self.combine_scores(
+            self.num_assigned,
+            self.num_within_capacity,
+            self.num_covid_incompatible,
+            self.num_double_booked,
+            self.num_fully_scored,
+            float(np.sum(ward_utilisation)),
+            int(np.count_nonzero(self.student_active)),
+            float(np.sum(self.student_uniq_wards)),
+            float(np.sum(self.student_uniq_deps)),
+            np.count_nonzero(self.student_speciality, axis=0),
         )
 
-        ## Increase score if assigned to a Critical Care ward ##
-        self.check_specific_speciality(
-            self.critical_care_placement_check,
-            ["Critical", "Emergency"],
-            self.critical_care_placement_scoring_factor,
+    def combine_scores(
+        self,
+        num_assigned: int,
+        num_within_capacity: int,
+        num_covid_incompatible: int,
+        num_double_booked: int,
+        num_fully_scored: int,
+        utilisation_total: float,
+        num_students: int,
+        uniq_wards_total: float,
+        uniq_deps_total: float,
+        speciality_counts: list,
+    ) -> tuple:
+        """
+        Function to turn counts and totals of the scored placements and students into a fitness score.
+        This is shared with the PopulationEvaluator so that both produce identical scores.
+
+        :param num_assigned: number of placements assigned to a ward
+        :param num_within_capacity: number of assigned placements whose ward is within capacity in their start week
+        :param num_covid_incompatible: number of assigned placements on a ward not compatible with their covid status
+        :param num_double_booked: number of assigned placements whose student is on a different ward at the same time
+        :param num_fully_scored: number of assigned placements which pass all of the above checks
+        :param utilisation_total: sum over wards of start-week occupancy of their placements divided by ward capacity
+        :param num_students: number of students with at least one placement assigned
+        :param uniq_wards_total: sum over students of the proportion of their wards which are unique
+        :param uniq_deps_total: sum over students of the proportion of their department words which are unique
+        :param speciality_counts: number of students matching each enabled speciality check
+        :returns: fitness, viability, non-viable reason, total score and a dictionary of evaluation scores
+        """
+        num_placements = self.instance.num_placements
+
+        schedule_eval_scores = {}
+        if num_within_capacity == num_assigned:
+            schedule_eval_scores["cap_exceeded_score"] = (
+                num_within_capacity * self.within_capacity_scoring_factor
+            )
+        else:
+            schedule_eval_scores["cap_exceeded_score"] = 0
+        if num_double_booked == 0:
+            schedule_eval_scores["double_booked_score"] = (
+                num_assigned * self.double_booked_scoring_factor
+            )
+        else:
+            schedule_eval_scores["double_booked_score"] = 0
+
+        # A placement scores for capacity only if it is also covid compatible and not double booked
+        schedule_scores = (
+            num_fully_scored * self.within_capacity_scoring_factor
+            + (num_assigned - num_double_booked) * self.double_booked_scoring_factor
         )
 
-        ## Increase fitness if all placements assigned ##
-        if len(placementsToAllocate) == 0 and len(unallocatedPlacements) == 0:
-            self.add_score(self.all_placements_assigned_scoring_factor)
+        if num_assigned:
+            avg_utilisation = utilisation_total / num_assigned
         else:
-            self.viable = False
-            self.non_viable_reason = "Placement not allocated"
+            avg_utilisation = 0
+        schedule_eval_scores["mean_ward_util"] = avg_utilisation
+
+        if num_students:
+            prop_uniq_wards = uniq_wards_total / num_students
+            mean_uniq_deps = uniq_deps_total / num_students
+        else:
+            prop_uniq_wards = 0
+            mean_uniq_deps = 0
+        schedule_scores += self.uniq_wards_scoring_factor * prop_uniq_wards
+        schedule_eval_scores["mean_uniq_wards"] = prop_uniq_wards
+
+        ## Reward schedules which have a unique set of departments ##
+        schedule_scores += self.uniq_departments_scoring_factor * mean_uniq_deps
+        schedule_eval_scores["mean_uniq_deps"] = mean_uniq_deps
+
+        ## Increase score for each student assigned to a ward of a required speciality ##
+        for (_, check_score), check_count in zip(
+            self.speciality_checks, speciality_counts
+        ):
+            schedule_scores += check_score * int(check_count)
+
+        ## Increase fitness if all placements assigned ##
+        all_assigned = num_assigned == num_placements
+        if all_assigned:
+            schedule_scores += self.all_placements_assigned_scoring_factor
 
         ## Increase fitness based on placement capacity utilisation #
-        avg_utilisation = sum(ward_utilisation) / len(ward_utilisation)
-        self.add_score(avg_utilisation * self.capacity_utilisation_scoring_factor)
+        schedule_scores += avg_utilisation * self.capacity_utilisation_scoring_factor
 
         # Calculate maximum score
         max_score = (  # Must have scoring components
-            (len(self.conf_placements) * self.within_capacity_scoring_factor)
+            (num_placements * self.within_capacity_scoring_factor)
             + (  # Exceeded capacity component
-                len(self.conf_placements) * self.double_booked_scoring_factor
+                num_placements * self.double_booked_scoring_factor
             )
             + (  # Double booked component
-                len(self.conf_placements) * self.all_placements_assigned_scoring_factor
+                num_placements * self.all_placements_assigned_scoring_factor
             )
             +  # All placements allocated component
             # Nice to have scoring components
             (self.uniq_departments_scoring_factor)
             + (self.uniq_wards_scoring_factor)  # Unique departments component
             + (self.capacity_utilisation_scoring_factor)  # Unique wards component
-            +  # Average utilisation component
             # Speciality specific scoring components
-            (
-                self.medical_placement_check
-                * len(self.placement_wards.values())
-                * self.medical_placement_scoring_factor
-            )
-            + (  # Medical ward component
-                self.surgical_placement_check
-                * len(self.placement_wards.values())
-                * self.surgical_placement_scoring_factor
-            )
-            + (  # Surgical ward component
-                self.community_placement_check
-                * len(self.placement_wards.values())
-                * self.community_placement_scoring_factor
-            )
-            + (  # Community ward component
-                self.critical_care_placement_check
-                * len(self.placement_wards.values())
-                * self.critical_care_placement_scoring_factor
-            )  # High Dependency ward component
+            + sum(num_students * check_score for _, check_score in self.speciality_checks)
         )
-        if len(self.conf_placements):
-            self.fitness = float(self.schedule_scores) / max_score
+        if num_assigned:
+            fitness = float(schedule_scores) / max_score
         else:
-            self.fitness = 0
-
-        if self.viable is None:
-            self.viable = True
-
-    def check_specific_speciality(
-        self, check_boolean: Boolean, check_words: list, check_score: int
-    ):
-        """
-        Function to check presence of specific words in specialities list for a student
-        """
-        if check_boolean:
-            check_words_regex = re.compile("|".join(check_words))
-            for assigned_departments in self.placement_deps.values():
-                if check_words_regex.search(assigned_departments):
-                    self.add_score(check_score)
-
-    def add_score(self, score: float):
-        """
-        Function to add score value to all schedule entries
+            fitness = 0
+
+        # Viable variable indicates whether a schedule could be used i.e. no hard constraints are breached
+        viable = False
+        if not all_assigned:
+            non_viable_reason = "Placement not allocated"
+        elif num_double_booked:
+            non_viable_reason = "Double booked"
+        elif num_covid_incompatible:
+            non_viable_reason = "Covid status not compatible"
+        elif num_within_capacity != num_assigned:
+            non_viable_reason = "Cap Exceeded"
+        else:
+            viable = True
+            non_viable_reason = None
 
-        :param score: score to be added to overall total
-        :returns: no explicit return but updates schedule_scores object
-        """
-        self.schedule_scores += score
+        return fitness, viable, non_viable_reason, schedule_scores, schedule_eval_scores
 
+    @timed("populate_schedule")
     def populate_schedule(self):
         """
-        Function to reconstruct schedules after mutations and recombination to make sure
-        that placements are still structured correctly (prevents
-        mutation/recombination from putting lots of incorrectly located
-        placements in the schedule)
+        Function to re-score a schedule after mutations and recombination. As every
+        placement holds exactly one ward id in the assignment array only the
+        occupancy counts need to be rebuilt before scoring.
 
-        :returns: no explicit return but updates slots class object
+        :returns: no explicit return but updates occupancy and fitness class objects
         """
-        self.slots = [[] for _ in range(len(self.slots))]
-        for confirmed_placement in self.conf_placements:
-            slotIndex = int(confirmed_placement["slotIndex"])
-            for i in range(0, confirmed_placement["length"]):
-                self.slots[slotIndex].append(confirmed_placement["placement"])
-                slotIndex += 1
+        self.occupancy = self.instance.occupancy_counts(self.assignment)
         self.get_fitness()
 
     def recombination(
-        self, otherparent: object, num_recomb_points: int, num_offspring: int
+        self,
+        otherparent: object,
+        num_recomb_points: int,
+        num_offspring: int,
+        fitness_cache: FitnessCache = None,
     ) -> list:
         """
-        Function to produce offspring by combining two parent schedules,
-        with 2 crossing points. This will yield:
+        Function to produce offspring by combining the assignment arrays of two
+        parent schedules, with 2 crossing points. This will yield:
         p1 = [0 0 0 1 1 0 0 1 0 1]
         p2 = [1 0 1 0 0 0 1 0 0 0]
         p1 [combined with] p2 = [0 0|1 0 0 0 1|1 0 1]
@@ -514,55 +742,70 @@ class Schedule:
         :param otherparent: other schedule for recombination to be carried out with
         :param num_recomb_points: integer number of crossing over points to be used
         :param num_offspring: integer number of offspring to produce
+        :param fitness_cache: FitnessCache consulted before scoring each offspring, if given
         :returns: list of recombined schedule objects
         """
-        pop_size = len(self.conf_placements)
-        rcp = []
-        for i in range(num_recomb_points, 0, -1):
-            check_point = False
-            while not check_point:
-                p = randrange(pop_size)
-                if p not in rcp:
-                    rcp.append(p)
-                    check_point = True
-        rcp = sorted(rcp)
+        num_placements = len(self.assignment)
+        num_recomb_points = max(0, min(num_recomb_points, num_placements - 1))
+        rcp = sorted(sample(range(1, num_placements), num_recomb_points))
 
-        offspring_list = []
-        prev_index = 0
-
-        shuffle(self.conf_placements)
-        shuffle(otherparent.conf_placements)
+        # Odd numbered segments between crossing points come from the other parent
+        from_other_parent = (
+            np.searchsorted(rcp, np.arange(num_placements), side="right") % 2 == 1
+        )
 
-        parents = [self.conf_placements, otherparent.conf_placements]
-        first_parent = True
+        offspring_list = []
         for i in range(num_offspring):
             offspring = Schedule(
-                self.placement_slots, self.wards, self.placements, self.num_weeks
+                self.placement_slots,
+                self.wards,
+                self.placements,
+                self.num_weeks,
+                self.instance,
+                self.config,
+            )
+            offspring.assignment = np.where(
+                from_other_parent, otherparent.assignment, self.assignment
             )
-            for index in rcp:
-                list_index = rcp.index(index)
-                if first_parent:
-                    parent_index = 0
-                    other_index = 1
-                else:
-                    parent_index = 1
-                    other_index = 0
-                if list_index == 0:
-                    offspring.conf_placements += parents[parent_index][0:index]
-                elif index == rcp[-1]:
-                    prev_index = rcp[list_index - 1]
-                    offspring.conf_placements += parents[other_index][prev_index:index]
-                    offspring.conf_placements += parents[parent_index][index:]
-                else:
-                    prev_index = rcp[list_index - 1]
-                    offspring.conf_placements += parents[parent_index][prev_index:index]
-                first_parent = not first_parent
             offspring.generation = max(self.generation, otherparent.generation) + 1
-            offspring.populate_schedule()
+            offspring.occupancy = self.instance.occupancy_counts(offspring.assignment)
+            offspring.score(fitness_cache)
             offspring_list.append(offspring)
+            from_other_parent = ~from_other_parent
 
         return offspring_list
 
+    def clone(self) -> "Schedule":
+        """
+        Function to make a copy of the schedule which can be changed without affecting this schedule. Only the
+        arrays listed in state_arrays are written to when a schedule changes, so these are copied with a single
+        array copy each. Everything else is either a number or data shared by every schedule, which cannot be
+        written to, so it is shared with the copy rather than copied.
+
+        :returns: schedule object
+        """
+        schedule_copy = copy.copy(self)
+        for attribute in self.state_arrays:
+            value = getattr(self, attribute, None)
+            if value is not None:
+                setattr(schedule_copy, attribute, value.copy())
+        return schedule_copy
+
+    def snapshot(self) -> "Schedule":
+        """
+        Function to make a copy of the schedule which cannot be changed, so that its report can be written in the
+        background while this schedule carries on changing. The state arrays are copied as in clone and then made
+        read-only
+
+        :returns: schedule object
+        """
+        schedule_copy = self.clone()
+        for attribute in self.state_arrays:
+            value = getattr(schedule_copy, attribute, None)
+            if value is not None:
+                value.flags.writeable = False
+        return schedule_copy
+
     def mutation(self, num_mutations: int) -> object:
         """
         Function to mutate the location of one of the placements within a schedule
@@ -570,90 +813,125 @@ class Schedule:
         :param num_mutations: integer number of mutations to introduce to mutated schedule
         :returns: mutated schedule object
         """
-        mutation_schedule = copy.copy(self)
+        mutation_schedule = self.clone()
 
         for i in range(0, num_mutations):
-            placement_index = randint(0, len(mutation_schedule.conf_placements) - 1)
-            ward_index = randint(0, len(self.wards) - 1)
-            mutation_schedule.conf_placements[placement_index][
-                "slotIndex"
-            ] = self.calc_slot_index(
-                ward_index,
-                self.num_weeks,
-                mutation_schedule.conf_placements[placement_index]["startweek"],
-            )
+            placement_index = randint(0, len(mutation_schedule.assignment) - 1)
+            feasible_wards = self.instance.feasible_wards[placement_index]
+            if len(feasible_wards):
+                ward_index = feasible_wards[randint(0, len(feasible_wards) - 1)]
+            else:
+                ward_index = randint(0, len(self.wards) - 1)
+            mutation_schedule.move_placement(placement_index, ward_index)
 
         mutation_schedule.generation = self.generation + 1
-        mutation_schedule.populate_schedule()
+        if mutation_schedule.scored_ward is None:
+            mutation_schedule.populate_schedule()
         return mutation_schedule
 
+    def export_state(self) -> dict:
+        """
+        Function to extract the state of a schedule without the data shared by every schedule, so that it can be
+        cheaply sent to another process
+
+        :returns: dictionary of the schedule's attributes, excluding shared_attributes
+        """
+        return {
+            attribute: value
+            for attribute, value in vars(self).items()
+            if attribute not in self.shared_attributes
+        }
+
+    @classmethod
+    def from_state(
+        cls, state: dict, instance: ProblemInstance, config: Config
+    ) -> "Schedule":
+        """
+        Function to rebuild a schedule from a state produced by export_state
+
+        :param state: dictionary of the schedule's attributes from export_state
+        :param instance: the ProblemInstance shared by all schedules
+        :param config: the Config shared by all schedules
+        :returns: schedule object
+        """
+        schedule = cls.__new__(cls)
+        schedule.__dict__.update(state)
+        schedule.instance = instance
+        schedule.config = config
+        schedule.wards = instance.wards
+        schedule.placements = instance.placements
+        schedule.placement_slots = instance.slots
+        return schedule
+
+    @classmethod
+    def from_assignment(
+        cls,
+        assignment: np.ndarray,
+        instance: ProblemInstance,
+        config: Config,
+        generation: int = 1,
+        fitness: float = 0.0,
+        viable: bool = False,
+    ) -> "Schedule":
+        """
+        Function to rebuild a schedule from its assignment array alone, such as one read from a checkpoint. The
+        fitness and viability are taken as given, and as for a schedule given its fitness from the FitnessCache,
+        the schedule is only fully scored when it is next changed or reported on
+
+        :param assignment: array with one ward id per placement
+        :param instance: the ProblemInstance shared by all schedules
+        :param config: the Config shared by all schedules
+        :param generation: integer generation of the schedule
+        :param fitness: float fitness score of the schedule
+        :param viable: bool of whether the schedule is viable
+        :returns: schedule object
+        """
+        schedule = cls(
+            instance.slots,
+            instance.wards,
+            instance.placements,
+            instance.num_weeks,
+            instance,
+            config,
+        )
+        schedule.assignment = np.array(assignment, dtype=np.int64)
+        schedule.occupancy = instance.occupancy_counts(schedule.assignment)
+        schedule.generation = int(generation)
+        schedule.fitness = float(fitness)
+        schedule.viable = bool(viable)
+        return schedule
+
     def produce_dataframe(self) -> pd.DataFrame:
         """
-        Function to save results out to a CSV
+        Function to convert the assignment array into the long-format frame that every part of the report is
+        derived from, with one row per placement week
 
         :returns: a pandas dataframe summarising the schedule generated
         """
-        ward_names = []
-        ward_deps = []
-        ward_caps = []
-        ward_p1_caps = []
-        ward_p2_caps = []
-        ward_p3_caps = []
-        ward_ed_audits = []
-        placement_names = []
-        placement_cohorts = []
-        placement_parts = []
-        placement_start = []
-        placement_start_dates = []
-        placement_durations = []
-        placement_week = []
-        for i in range(0, len(self.slots)):
-            ward_index = int(math.floor(i / len(self.placement_slots)))
-            week_index = i - (ward_index * self.num_weeks)
-            if i % len(self.placement_slots) == 0:
-                ward_name = self.wards[ward_index].ward
-                ward_dep = self.wards[ward_index].department
-                ward_cap = self.wards[ward_index].capacity
-                p1_ward_cap = self.wards[ward_index].p1_capacity
-                p2_ward_cap = self.wards[ward_index].p2_capacity
-                p3_ward_cap = self.wards[ward_index].p3_capacity
-                ward_ed_audit = self.wards[ward_index].ed_audit_expiry_week
-
-            scheduled_placements = self.slots[i]
-
-            for schedule_placement in scheduled_placements:
-                if schedule_placement is not None:
-                    ward_names.append(ward_name)
-                    ward_deps.append(ward_dep)
-                    ward_caps.append(ward_cap)
-                    ward_p1_caps.append(p1_ward_cap)
-                    ward_p2_caps.append(p2_ward_cap)
-                    ward_p3_caps.append(p3_ward_cap)
-                    ward_ed_audits.append(ward_ed_audit)
-                    placement_names.append(schedule_placement.name)
-                    placement_cohorts.append(schedule_placement.cohort)
-                    placement_parts.append(schedule_placement.part)
-                    placement_start.append(schedule_placement.start)
-                    placement_start_dates.append(schedule_placement.start_date)
-                    placement_week.append(week_index)
-                    placement_durations.append(schedule_placement.duration)
+        assigned = np.flatnonzero(self.assignment != UNASSIGNED)
+        placement_rows, placement_week = self.instance.placement_weeks(assigned)
+        ward_rows = self.assignment[placement_rows]
 
+        placement_details = self.instance.placement_table.iloc[placement_rows]
+        ward_details = self.instance.ward_table.iloc[ward_rows]
         schedule_df = pd.DataFrame(
             {
-                "nurse_name": placement_names,
-                "nurse_uni_cohort": placement_cohorts,
-                "placement_part": placement_parts,
-                "placement_start": placement_start,
-                "placement_start_date": placement_start_dates,
+                "nurse_name": placement_details["nurse_name"].values,
+                "nurse_uni_cohort": placement_details["nurse_uni_cohort"].values,
+                "placement_part": placement_details["placement_part"].values,
+                "placement_start": placement_details["placement_start"].values,
+                "placement_start_date": placement_details[
+                    "placement_start_date"
+                ].values,
                 "placement_week": placement_week,
-                "placement_duration": placement_durations,
-                "ward_name": ward_names,
-                "department": ward_deps,
-                "ward_capacity": ward_caps,
-                "p1_ward_capacity": ward_p1_caps,
-                "p2_ward_capacity": ward_p2_caps,
-                "p3_ward_capacity": ward_p3_caps,
-                "ed_audit_exp_week": ward_ed_audits,
+                "placement_duration": placement_details["placement_duration"].values,
+                "ward_name": ward_details["ward_name"].values,
+                "department": ward_details["department"].values,
+                "ward_capacity": ward_details["ward_capacity"].values,
+                "p1_ward_capacity": ward_details["p1_ward_capacity"].values,
+                "p2_ward_capacity": ward_details["p2_ward_capacity"].values,
+                "p3_ward_capacity": ward_details["p3_ward_capacity"].values,
+                "ed_audit_exp_week": ward_details["ed_audit_exp_week"].values,
             }
         )
 
@@ -661,46 +939,53 @@ class Schedule:
             by=["nurse_name", "placement_start", "placement_week"], inplace=True
         )
 
-        script_directory = os.path.dirname(os.path.abspath(__file__))
-        save_directory = os.path.join(script_directory, "..", "results")
+        # Columns used by the report views. The nurse key and block of each placement name are split
+        # once per run by the ProblemInstance
+        order = schedule_df.index.to_numpy()
+        schedule_df["placement_start_week"] = schedule_df["placement_week"]
+        schedule_df["nurse_id"] = placement_details["nurse_id"].values[order]
+        schedule_df["block"] = placement_details["block"].values[order]
+        schedule_df["ward_name"] = schedule_df["ward_name"].fillna("None")
+        schedule_df["placement_week_date"] = pd.to_datetime(
+            schedule_df.placement_start_date.min()
+        ) + pd.to_timedelta((schedule_df["placement_week"] - 1) * 7, unit="d")
+        return schedule_df
 
-        try:
-            os.makedirs(save_directory)
-        except OSError:
-            pass  # already exists
+    def save_csv(self, schedule: pd.DataFrame, file_name: str):
+        """
+        Function to save the schedule to a CSV, with one row per placement week. The CSV is named after the report, so
+        each report has its own CSV
 
-        now = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
-        full_save_path = os.path.join(save_directory, f"sched_output_{now}.csv")
-        schedule_df.to_csv(full_save_path)
-        return schedule_df
+        :param schedule: the dataframe produced by produce_dataframe
+        :param file_name: the file name of the schedule's report
+        """
+        save_directory = self.results_directory()
+        csv_file_name = os.path.splitext(file_name)[0] + ".csv"
+        full_save_path = os.path.join(save_directory, csv_file_name)
+        schedule[CSV_COLUMNS].to_csv(full_save_path)
+
+    def results_directory(self) -> str:
+        """
+        Function to find the folder that reports are saved to, creating it if needed
+
+        :returns: path of the results folder
+        """
+        return results_directory(self.results_folder)
 
-    def schedule_quality_check(self) -> Tuple[int, int, int, int]:
+    def schedule_quality_check(
+        self, schedule: pd.DataFrame = None
+    ) -> Tuple[int, int, int, int]:
         """
         Function to do some basic checks to make sure all rules have worked as desired
 
+        :param schedule: the dataframe produced by produce_dataframe, produced here if not given
         :returns: counts of the number of schedules affected by poor quality
         """
         # Check that everyone has all placements assigned
         self.quality_metrics = {}
 
-        schedule = self.produce_dataframe()
-
-        schedule["placement_start_week"] = schedule["placement_week"]
-        schedule["nurse_id"] = None
-        schedule["block"] = None
-        schedule[["nurse_id", "block"]] = schedule["nurse_name"].str.split(
-            "_", expand=True, n=1
-        )
-
-        schedule["ward_name"] = schedule["ward_name"].fillna("None")
-        schedule["placement_week_date"] = pd.to_datetime(
-            schedule.placement_start_date.min()
-        )
-        schedule["placement_offset"] = (schedule["placement_week"] - 1) * 7
-        schedule["placement_week_date"] = schedule[
-            "placement_week_date"
-        ] + pd.to_timedelta(schedule["placement_offset"], unit="d")
-        schedule = schedule.drop("placement_offset", axis=1)
+        if schedule is None:
+            schedule = self.produce_dataframe()
 
         all_assigned_check = schedule[["nurse_name", "block"]]
         all_assigned_check = all_assigned_check.drop_duplicates()
@@ -708,14 +993,10 @@ class Schedule:
             all_assigned_check.groupby("nurse_name")["block"].count()
         )
 
-        placement_list = [p.name for p in self.placements]
-        total_placements_df = pd.DataFrame(placement_list, columns=["placement"])
-        total_placements_df[["nurse_name", "placement_title"]] = total_placements_df[
-            "placement"
-        ].str.split("_", expand=True, n=1)
         student_plac_count = pd.DataFrame(
-            total_placements_df.groupby("nurse_name")["placement_title"].count()
+            self.instance.placement_table.groupby("nurse_id")["block"].count()
         ).reset_index()
+        student_plac_count.columns = ["nurse_name", "placement_title"]
         plac_count_compare = all_assigned_check_df.merge(
             student_plac_count, on="nurse_name"
         )
@@ -859,11 +1140,37 @@ class Schedule:
             double_booked_rows,
         )
 
-    def save_report(self) -> str:
+    def report_file_name(self, taken_names=()) -> str:
+        """
+        Function to name the report of the schedule after the time it is saved,
+        its generation and whether it is viable. Reports named in the same second
+        would otherwise share a name, so a count is added after the viability if
+        the name is in taken_names or already saved in the results folder
+
+        :param taken_names: collection of file names already given to other reports
+        :returns: the file name of the report
+        """
+        now = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
+        file_name = f"schedule_output_{now}_{self.generation}_{self.viable}.xlsx"
+        save_directory = self.results_directory()
+        count = 1
+        while file_name in taken_names or os.path.exists(
+            os.path.join(save_directory, file_name)
+        ):
+            count += 1
+            file_name = (
+                f"schedule_output_{now}_{self.generation}_{self.viable}_{count}.xlsx"
+            )
+        return file_name
+
+    @timed("save_report")
+    def save_report(self, file_name: str = None) -> str:
         """
         Function to save down the formatted versions of the schedules including
-        a number of views
+        a number of views. The schedule dataframe is produced once and every view
+        is derived from it
 
+        :param file_name: the file name of the report, named by report_file_name if not given
         :returns: the file name of the saved down report
         """
         schedule = self.produce_dataframe()
@@ -872,29 +1179,36 @@ class Schedule:
         if not self.viable:
             logging.info(f"Non-viable reason: {self.non_viable_reason}")
 
-        schedule["placement_start_week"] = schedule["placement_week"]
-        schedule["nurse_id"] = None
-        schedule["block"] = None
-        schedule[["nurse_id", "block"]] = schedule["nurse_name"].str.split(
-            "_", expand=True, n=1
-        )
+        save_directory = self.results_directory()
+        if file_name is None:
+            file_name = self.report_file_name()
+        self.file_name = file_name
 
-        schedule["ward_name"] = schedule["ward_name"].fillna("None")
-        schedule["placement_week_date"] = pd.to_datetime(
-            schedule.placement_start_date.min()
-        )
-        schedule["placement_offset"] = (schedule["placement_week"] - 1) * 7
-        schedule["placement_week_date"] = schedule[
-            "placement_week_date"
-        ] + pd.to_timedelta(schedule["placement_offset"], unit="d")
-        schedule = schedule.drop("placement_offset", axis=1)
+        if self.save_schedule_csv:
+            self.save_csv(schedule, file_name)
 
+        full_save_path = os.path.join(save_directory, file_name)
+
+        with pd.ExcelWriter(full_save_path) as writer:
+            for sheet_name, (sheet, index) in self.report_sheets(schedule).items():
+                sheet.to_excel(writer, sheet_name=sheet_name, index=index)
+
+        return file_name
+
+    def report_sheets(self, schedule: pd.DataFrame) -> dict:
+        """
+        Function to derive each sheet of the report from the schedule dataframe
+
+        :param schedule: the dataframe produced by produce_dataframe
+        :returns: dictionary of (sheet, whether to write its index) for each sheet name, in the order
+            they are written. Quality check sheets are only included when a check has failed
+        """
         (
             incorrect_num_plac_rows,
             incorrect_len_rows,
             cap_exceeded_rows,
             double_booked_rows,
-        ) = self.schedule_quality_check()
+        ) = self.schedule_quality_check(schedule)
 
         # Student-level ward allocation
         nurse_sch = schedule[["nurse_id", "placement_week_date", "ward_name"]]
@@ -1012,50 +1326,19 @@ class Schedule:
         ed_aud_exp_fail = ed_aud_exp_fail.drop_duplicates()
         ed_aud_exp_fail = ed_aud_exp_fail.sort_values(by="ward_name")
 
-        script_directory = os.path.dirname(os.path.abspath(__file__))
-        save_directory = os.path.join(script_directory, "..", "results")
-        try:
-            os.makedirs(save_directory)
-        except OSError:
-            pass  # already exists
-
-        now = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
-        file_name = f"schedule_output_{now}_{self.generation}_{self.viable}.xlsx"
-        self.file_name = file_name
-
-        full_save_path = os.path.join(save_directory, file_name)
-
-        with pd.ExcelWriter(full_save_path) as writer:
-            ed_aud_exp_fail.to_excel(
-                writer, sheet_name="wards_expired_audits", index=False
-            )
-            if incorrect_num_plac_rows is not None:
-                incorrect_num_plac_rows.to_excel(
-                    writer, sheet_name="incorrect_num_placements", index=False
-                )
-            if incorrect_len_rows is not None:
-                incorrect_len_rows.to_excel(
-                    writer, sheet_name="incorrect_len_placements", index=False
-                )
-            if cap_exceeded_rows is not None:
-                cap_exceeded_rows.to_excel(
-                    writer, sheet_name="capacity_exceeded", index=False
-                )
-            if double_booked_rows is not None:
-                double_booked_rows.to_excel(
-                    writer, sheet_name="double_booked_students", index=False
-                )
-            nurse_sch_formatted.to_excel(writer, sheet_name="nurse_schedule")
-            ward_sch_formatted.to_excel(writer, sheet_name="ward_schedule")
-            ward_hours_sch_formatted.to_excel(writer, sheet_name="ward_hours_schedule")
-            cohort_hours_sch_formatted.to_excel(
-                writer, sheet_name="cohort_hours_schedule"
-            )
-            ward_util_sch_formatted.to_excel(
-                writer, sheet_name="ward_weekly_util_schedule"
-            )
-            ward_q_util_formatted.to_excel(
-                writer, sheet_name="ward_quarterly_util_schedule"
-            )
-
-        return file_name
+        sheets = {"wards_expired_audits": (ed_aud_exp_fail, False)}
+        if incorrect_num_plac_rows is not None:
+            sheets["incorrect_num_placements"] = (incorrect_num_plac_rows, False)
+        if incorrect_len_rows is not None:
+            sheets["incorrect_len_placements"] = (incorrect_len_rows, False)
+        if cap_exceeded_rows is not None:
+            sheets["capacity_exceeded"] = (cap_exceeded_rows, False)
+        if double_booked_rows is not None:
+            sheets["double_booked_students"] = (double_booked_rows, False)
+        sheets["nurse_schedule"] = (nurse_sch_formatted, True)
+        sheets["ward_schedule"] = (ward_sch_formatted, True)
+        sheets["ward_hours_schedule"] = (ward_hours_sch_formatted, True)
+        sheets["cohort_hours_schedule"] = (cohort_hours_sch_formatted, True)
+        sheets["ward_weekly_util_schedule"] = (ward_util_sch_formatted, True)
+        sheets["ward_quarterly_util_schedule"] = (ward_q_util_formatted, True)
+        return sheets
@@ -0,0 +1,90 @@
+import numpy as np
+
+
+def selection_weights(fitnesses: np.ndarray) -> np.ndarray:
+    """
+    Function to turn fitness scores into non-negative selection weights. If no schedule has a positive fitness, every
+    schedule is given the same weight
+
+    :param fitnesses: array of fitness scores, one per schedule
+    :returns: array of selection weights
+    """
+    weights = np.clip(np.asarray(fitnesses, dtype=float), 0, None)
+    if weights.sum() <= 0:
+        return np.ones(len(weights))
+    return weights
+
+
+def roulette_selection(
+    fitnesses: np.ndarray, num_selections: int, rng: np.random.Generator, **kwargs
+) -> np.ndarray:
+    """
+    Function to select schedules with a probability proportional to their fitness (roulette wheel selection).
+    Each selection is found by binary search on the cumulative fitness
+
+    :param fitnesses: array of fitness scores, one per schedule
+    :param num_selections: integer number of schedules to select
+    :param rng: NumPy random Generator
+    :returns: array of selected schedule indices
+    """
+    cumulative_fitness = np.cumsum(selection_weights(fitnesses))
+    spins = rng.uniform(0, cumulative_fitness[-1], num_selections)
+    return np.minimum(
+        np.searchsorted(cumulative_fitness, spins, side="right"),
+        len(cumulative_fitness) - 1,
+    )
+
+
+def stochastic_universal_sampling(
+    fitnesses: np.ndarray, num_selections: int, rng: np.random.Generator, **kwargs
+) -> np.ndarray:
+    """
+    Function to select schedules with a probability proportional to their fitness using evenly spaced pointers from a
+    single spin of the wheel. This keeps the number of times each schedule is chosen close to its expected value
+
+    :param fitnesses: array of fitness scores, one per schedule
+    :param num_selections: integer number of schedules to select
+    :param rng: NumPy random Generator
+    :returns: array of selected schedule indices, in a random order
+    """
+    cumulative_fitness = np.cumsum(selection_weights(fitnesses))
+    spacing = cumulative_fitness[-1] / max(num_selections, 1)
+    pointers = rng.uniform(0, spacing) + spacing * np.arange(num_selections)
+    selected = np.minimum(
+        np.searchsorted(cumulative_fitness, pointers, side="right"),
+        len(cumulative_fitness) - 1,
+    )
+    return rng.permutation(selected)
+
+
+def tournament_selection(
+    fitnesses: np.ndarray,
+    num_selections: int,
+    rng: np.random.Generator,
+    tournament_size: int = 2,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Function to select schedules by picking the fittest of tournament_size randomly chosen schedules, repeated for each
+    selection
+
+    :param fitnesses: array of fitness scores, one per schedule
+    :param num_selections: integer number of schedules to select
+    :param rng: NumPy random Generator
+    :param tournament_size: integer number of schedules in each tournament
+    :returns: array of selected schedule indices
+    """
+    fitnesses = np.asarray(fitnesses, dtype=float)
+    entrants = rng.integers(
+        0, len(fitnesses), size=(num_selections, max(1, tournament_size))
+    )
+    winners = np.argmax(fitnesses[entrants], axis=1)
+    return entrants[np.arange(num_selections), winners]
+
+
+# Selection methods which can be chosen with selection_method in config/params.yml
+SELECTION_METHODS = {
+    "roulette": roulette_selection,
+    "sus": stochastic_universal_sampling,
+    "tournament": tournament_selection,
+}
@@ -1,5 +1,7 @@
 class Slot:
     """ Slot class represents weeks where placements can be taken """
 
+    __slots__ = ("id", "week")
+
     def __init__(self, listOfInputs):
         self.id, self.week = listOfInputs
@@ -0,0 +1,120 @@
+import numpy as np
+from typing import Tuple
+
+
+def clean_departments(output_string: str) -> list:
+    """
+    Function to clean up a list of department names for analysis. Removes some non-required words.
+
+    :params output_string: the string to be cleaned, containing multiple department names
+    :returns: a clean list of individual words seen in original string
+    """
+    replace_dict = {
+        ",": "",
+        "and": "",
+        "the": "",
+        "of": "",
+        "eneral": "general",
+        "None": "",
+        "-": "",
+        "\xa0": " ",
+        "  ": " ",
+    }
+    for word, replacement in replace_dict.items():
+        output_string = output_string.replace(word, replacement)
+    output_string = output_string.lower()
+    output_list = output_string.split(" ")
+    return output_list
+
+
+class Vocabulary:
+    """
+    A Vocabulary gives each distinct token (a ward name, a cleaned department word or a student key) an integer id, so
+    that comparisons made while scoring schedules are between integers rather than strings.
+
+    param: token_ids: A dictionary of the id of each token
+    param: tokens: A list of the tokens, in id order
+    """
+
+    def __init__(self):
+        self.token_ids = {}
+        self.tokens = []
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def token_id(self, token: str) -> int:
+        """
+        Function to get the id of a token, adding it to the vocabulary if it has not been seen before
+
+        :param token: the token string
+        :returns: integer id of the token
+        """
+        if token not in self.token_ids:
+            self.token_ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return self.token_ids[token]
+
+    def token_array(self, tokens: list) -> np.ndarray:
+        """
+        Function to convert a list of tokens into an array of ids
+
+        :param tokens: list of token strings
+        :returns: read-only array of integer ids, in the same order as tokens
+        """
+        ids = np.array([self.token_id(token) for token in tokens], dtype=np.int64)
+        ids.flags.writeable = False
+        return ids
+
+
+def tokenise(wards: list, placements: list) -> Tuple[Vocabulary, Vocabulary]:
+    """
+    Function to build the ward name and department word vocabularies, and give each Ward and Placement arrays of token
+    ids. Each ward gets ward_token and department_tokens; each placement gets wardhistory_tokens and dephistory_tokens.
+    Department strings are only cleaned once, however many times they appear.
+
+    :param wards: list of Ward objects
+    :param placements: list of Placement objects
+    :returns: the ward name vocabulary and the department word vocabulary
+    """
+    ward_vocabulary = Vocabulary()
+    department_vocabulary = Vocabulary()
+    ward_history_tokens = {}
+    department_tokens = {}
+
+    def departments(department_string: str) -> np.ndarray:
+        if department_string not in department_tokens:
+            department_tokens[department_string] = department_vocabulary.token_array(
+                clean_departments(department_string)
+            )
+        return department_tokens[department_string]
+
+    for ward in wards:
+        ward.ward_token = ward_vocabulary.token_id(ward.ward)
+        ward.department_tokens = departments(ward.department)
+
+    for placement in placements:
+        if placement.wardhistory not in ward_history_tokens:
+            ward_history_tokens[placement.wardhistory] = ward_vocabulary.token_array(
+                placement.wardhistory.split(", ")
+            )
+        placement.wardhistory_tokens = ward_history_tokens[placement.wardhistory]
+        placement.dephistory_tokens = departments(placement.dephistory)
+
+    return ward_vocabulary, department_vocabulary
+
+
+def index_students(placements: list) -> Vocabulary:
+    """
+    Function to give each Placement the integer student_idx of its student, identified by the nurse key at the start
+    of the placement name. Students are numbered in the order they first appear
+
+    :param placements: list of Placement objects
+    :returns: the vocabulary of student keys
+    """
+    student_vocabulary = Vocabulary()
+    for placement in placements:
+        placement.student_idx = student_vocabulary.token_id(
+            placement.name.split("_", maxsplit=1)[0]
+        )
+    return student_vocabulary
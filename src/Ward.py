@@ -1,6 +1,20 @@
 class Ward:
     """ Ward class represents wards where placements can take place """
 
+    __slots__ = (
+        "id",
+        "ward",
+        "department",
+        "ed_audit_expiry_week",
+        "covid_status",
+        "capacity",
+        "p1_capacity",
+        "p2_capacity",
+        "p3_capacity",
+        "ward_token",
+        "department_tokens",
+    )
+
     def __init__(self, listOfInputs):
         (
             self.id,
@@ -13,3 +27,6 @@ class Ward:
             self.p2_capacity,
             self.p3_capacity,
         ) = listOfInputs
+        # Token ids of the ward name and department words, set by tokenise in src/Vocabulary.py
+        self.ward_token = None
+        self.department_tokens = None
@@ -0,0 +1,24 @@
+from src.RecordTable import RecordTable
+
+
+class WardTable(RecordTable):
+    """
+    A WardTable holds the attributes of every Ward in a structured array (see src/RecordTable.py), so that the
+    ProblemInstance can compile them a column at a time
+
+    param: fields: A tuple of the Ward attributes held as columns
+    param: records: A read-only NumPy record array with one row per ward
+    """
+
+    fields = (
+        "id",
+        "ward",
+        "department",
+        "ed_audit_expiry_week",
+        "covid_status",
+        "capacity",
+        "p1_capacity",
+        "p2_capacity",
+        "p3_capacity",
+        "ward_token",
+    )
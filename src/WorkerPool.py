@@ -0,0 +1,360 @@
+import multiprocessing
+import random
+import numpy as np
+from src.Schedule import Schedule
+from src.ProblemInstance import ProblemInstance
+from src.PopulationEvaluator import PopulationEvaluator
+from src.Config import Config
+from src.FitnessCache import FitnessCache
+from src.RunStats import RunStats
+
+
+class WorkerContext:
+    """
+    A WorkerContext holds the static data needed to generate, change and score schedules. Each worker process builds
+    its own WorkerContext once when it starts, so only the changing state of each schedule is sent with a task.
+
+    param: instance: A ProblemInstance holding the static slot, ward and placement data shared by all schedules
+    param: config: The Config read from config/params.yml
+    param: evaluator: A PopulationEvaluator for scoring arrays of assignments
+    param: fitness_cache: A FitnessCache of schedules already scored by this process
+    param: stats: A RunStats of the time this process spends in each phase, if collect_timings is on
+    """
+
+    def __init__(
+        self,
+        instance: ProblemInstance,
+        config: Config,
+        evaluator: PopulationEvaluator = None,
+    ):
+        self.instance = instance
+        self.config = config
+        if evaluator is None:
+            evaluator = PopulationEvaluator(instance, config)
+        self.evaluator = evaluator
+        self.fitness_cache = FitnessCache(
+            config.genetic_algorithm_params.fitness_cache_size
+        )
+        self.stats = RunStats(
+            config.genetic_algorithm_params.collect_timings,
+            config.genetic_algorithm_params.timings_file,
+        )
+
+    def new_schedule(self) -> Schedule:
+        """
+        Function to create an empty schedule using the shared data
+
+        :returns: schedule object
+        """
+        return Schedule(
+            self.instance.slots,
+            self.instance.wards,
+            self.instance.placements,
+            self.instance.num_weeks,
+            self.instance,
+            self.config,
+        )
+
+    def schedule_from_state(self, state: dict) -> Schedule:
+        """
+        Function to rebuild a schedule sent to this process
+
+        :param state: dictionary of the schedule's attributes from Schedule.export_state
+        :returns: schedule object
+        """
+        return Schedule.from_state(state, self.instance, self.config)
+
+
+# Context of the current worker process, set once by init_worker
+worker_context = None
+
+
+def init_worker(instance: ProblemInstance, config: Config):
+    """
+    Function run once as each worker process starts, to build the context shared by all its tasks
+
+    :param instance: the ProblemInstance shared by all schedules
+    :param config: the Config read from config/params.yml
+    """
+    global worker_context
+    worker_context = WorkerContext(instance, config)
+
+
+def run_task(task_function, task_args: tuple):
+    """
+    Function to run a task within a worker process using that process's context. When timings are collected, the
+    time spent in timed functions during the task is sent back with the result
+
+    :param task_function: module level function taking a WorkerContext followed by task_args
+    :param task_args: tuple of arguments for the task
+    :returns: result of the task, or a tuple of the result and its timings if collect_timings is on
+    """
+    stats = worker_context.stats
+    if not stats.enabled:
+        return task_function(worker_context, *task_args)
+    with stats.recording():
+        result = task_function(worker_context, *task_args)
+    return result, stats.take()
+
+
+def run_seeded(seed: int, task_function, *task_args):
+    """
+    Function to run a task with the random module seeded for that task alone. Each task draws from its own
+    sequence of random numbers, so results do not depend on which process runs the task or in which order
+
+    :param seed: integer seed for the task
+    :param task_function: function to run
+    :returns: result of the task
+    """
+    outer_state = random.getstate()
+    random.seed(seed)
+    try:
+        return task_function(*task_args)
+    finally:
+        random.setstate(outer_state)
+
+
+def generate_schedule(context: WorkerContext, seed: int) -> dict:
+    """
+    Function to generate and score a new schedule
+
+    :param context: the WorkerContext of the process running the task
+    :param seed: integer seed for the task
+    :returns: state of the new schedule
+    """
+
+    def generate():
+        schedule = context.new_schedule()
+        schedule.schedule_generation()
+        schedule.get_fitness()
+        return schedule.export_state()
+
+    return run_seeded(seed, generate)
+
+
+def mutate_schedule(
+    context: WorkerContext, seed: int, state: dict, num_mutations: int
+) -> dict:
+    """
+    Function to produce a mutated copy of a schedule
+
+    :param context: the WorkerContext of the process running the task
+    :param seed: integer seed for the task
+    :param state: state of the schedule to be mutated
+    :param num_mutations: integer number of mutations to introduce
+    :returns: state of the mutated schedule
+    """
+
+    def mutate():
+        schedule = context.schedule_from_state(state)
+        return schedule.mutation(num_mutations).export_state()
+
+    return run_seeded(seed, mutate)
+
+
+def recombine_schedules(
+    context: WorkerContext,
+    seed: int,
+    state: dict,
+    other_state: dict,
+    num_recomb_points: int,
+    num_offspring: int,
+) -> list:
+    """
+    Function to produce scored offspring from two parent schedules
+
+    :param context: the WorkerContext of the process running the task
+    :param seed: integer seed for the task
+    :param state: state of the first parent schedule
+    :param other_state: state of the second parent schedule
+    :param num_recomb_points: integer number of crossing over points to be used
+    :param num_offspring: integer number of offspring to produce
+    :returns: list of offspring schedule states
+    """
+
+    def recombine():
+        parent = context.schedule_from_state(state)
+        other_parent = context.schedule_from_state(other_state)
+        return [
+            offspring.export_state()
+            for offspring in parent.recombination(
+                other_parent, num_recomb_points, num_offspring, context.fitness_cache
+            )
+        ]
+
+    return run_seeded(seed, recombine)
+
+
+def evaluate_assignments(context: WorkerContext, assignments: np.ndarray) -> tuple:
+    """
+    Function to score a block of assignments with the PopulationEvaluator
+
+    :param context: the WorkerContext of the process running the task
+    :param assignments: 2-D array with one row of ward ids per schedule
+    :returns: an array of fitness scores and an array of viability for each schedule
+    """
+    return context.evaluator.evaluate(assignments)
+
+
+class WorkerPool:
+    """
+    The WorkerPool runs schedule generation, mutation, recombination and scoring tasks for the GeneticAlgorithm. With a
+    single worker, tasks are run one after another in the current process. With more workers, tasks are spread across a
+    pool of processes. The static instance and config are sent to each worker once when it starts, and each task only
+    carries the state of the schedules it works on.
+
+    Every task is given its own random seed, drawn in the main process, so a run gives the same schedules for a fixed
+    seed whatever the number of workers. The fitness of every schedule a task returns is stored in the FitnessCache of
+    the current process, so the population is not scored again when it is evaluated.
+
+    param: instance: A ProblemInstance holding the static slot, ward and placement data shared by all schedules
+    param: config: The Config read from config/params.yml
+    param: num_workers: Integer number of processes to use. 0 uses every available core
+    param: evaluator: A PopulationEvaluator to use for scoring in the current process, built if not given
+    """
+
+    def __init__(
+        self,
+        instance: ProblemInstance,
+        config: Config,
+        num_workers: int = 1,
+        evaluator: PopulationEvaluator = None,
+    ):
+        if num_workers == 0:
+            num_workers = multiprocessing.cpu_count()
+        self.num_workers = max(1, num_workers)
+        self.context = WorkerContext(instance, config, evaluator)
+        self.pool = None
+        if self.num_workers > 1:
+            self.pool = multiprocessing.Pool(
+                self.num_workers, initializer=init_worker, initargs=(instance, config)
+            )
+
+    def map(self, task_function, tasks: list) -> list:
+        """
+        Function to run a task function over a list of tasks, keeping the order of the results
+
+        :param task_function: module level function taking a WorkerContext followed by the arguments of a task
+        :param tasks: list of tuples of arguments, one per task
+        :returns: list of results, in the same order as tasks
+        """
+        if self.pool is None or len(tasks) <= 1:
+            return [task_function(self.context, *task_args) for task_args in tasks]
+        results = self.pool.starmap(
+            run_task, [(task_function, task_args) for task_args in tasks]
+        )
+        if not self.context.stats.enabled:
+            return results
+        for _, timings in results:
+            self.context.stats.merge(timings)
+        return [result for result, _ in results]
+
+    def remember(self, schedules: list) -> list:
+        """
+        Function to store the fitness of schedules returned by tasks in the FitnessCache of the current process, so
+        that they are not scored again when the population is evaluated. Worker processes each have a cache of their
+        own, which the current process cannot see
+
+        :param schedules: list of scored schedule objects
+        :returns: the same list of schedule objects
+        """
+        fitness_cache = self.context.fitness_cache
+        if fitness_cache.max_size:
+            for schedule in schedules:
+                fitness_cache.put(
+                    fitness_cache.genome_key(schedule.assignment),
+                    (schedule.fitness, schedule.viable),
+                )
+        return schedules
+
+    def generate(self, seeds: list) -> list:
+        """
+        Function to generate new scored schedules
+
+        :param seeds: list of integer seeds, one per schedule
+        :returns: list of schedule objects
+        """
+        return self.remember(
+            [
+                self.context.schedule_from_state(state)
+                for state in self.map(generate_schedule, [(seed,) for seed in seeds])
+            ]
+        )
+
+    def mutate(self, mutations: list, num_mutations: int) -> list:
+        """
+        Function to produce mutated copies of schedules
+
+        :param mutations: list of tuples of an integer seed and the schedule to mutate
+        :param num_mutations: integer number of mutations per schedule
+        :returns: list of mutated schedule objects
+        """
+        tasks = [
+            (seed, schedule.export_state(), num_mutations)
+            for seed, schedule in mutations
+        ]
+        return self.remember(
+            [
+                self.context.schedule_from_state(state)
+                for state in self.map(mutate_schedule, tasks)
+            ]
+        )
+
+    def recombine(
+        self, pairs: list, num_recomb_points: int, num_offspring: int
+    ) -> list:
+        """
+        Function to produce offspring from pairs of parent schedules
+
+        :param pairs: list of tuples of an integer seed and the two parent schedules
+        :param num_recomb_points: integer number of crossing over points to be used
+        :param num_offspring: integer number of offspring per pair
+        :returns: list with a list of offspring schedule objects for each pair
+        """
+        tasks = [
+            (
+                seed,
+                schedule.export_state(),
+                other_schedule.export_state(),
+                num_recomb_points,
+                num_offspring,
+            )
+            for seed, schedule, other_schedule in pairs
+        ]
+        return [
+            self.remember(
+                [self.context.schedule_from_state(state) for state in offspring_states]
+            )
+            for offspring_states in self.map(recombine_schedules, tasks)
+        ]
+
+    def evaluate(self, assignments: np.ndarray) -> tuple:
+        """
+        Function to score a population of schedules, split into one block per worker
+
+        :param assignments: 2-D array with one row of ward ids per schedule
+        :returns: an array of fitness scores and an array of viability for each schedule
+        """
+        if self.pool is None:
+            return self.context.evaluator.evaluate(assignments)
+        results = self.map(
+            evaluate_assignments,
+            [
+                (block,)
+                for block in np.array_split(assignments, self.num_workers)
+                if len(block)
+            ],
+        )
+        return (
+            np.concatenate([fitnesses for fitnesses, _ in results]),
+            np.concatenate([viable for _, viable in results]),
+        )
+
+    def close(self):
+        """
+        Function to shut down the worker processes, if any
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
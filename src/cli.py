@@ -0,0 +1,256 @@
+import argparse
+import dataclasses
+import logging
+import os
+import random
+import sys
+import pandas as pd
+from src.data_load import DataLoader
+from src.GeneticAlgorithm import GeneticAlgorithm
+from src.IslandModel import IslandModel
+from src.ProblemInstance import ProblemInstance
+from src.Config import Config, DEFAULT_CONFIG_PATH
+from src.ReportWriter import (
+    ReportWriter,
+    COMPARISON_COLUMNS,
+    comparison_row,
+    save_comparison,
+)
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """
+    Function to read the command line options. Any option not given falls back to config/params.yml
+
+    :param argv: list of command line arguments, sys.argv if not given
+    :returns: the parsed options
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Run the Nursing Placement Optimisation tool without the user interface, saving the schedules "
+        "and the comparison file to the results folder",
+    )
+    parser.add_argument(
+        "--input",
+        help="input .xlsx file, defaults to data/<input_file_name> from params.yml",
+    )
+    parser.add_argument(
+        "--runs", type=int, default=1, help="number of schedules to produce"
+    )
+    parser.add_argument(
+        "--pop-size",
+        type=int,
+        help="number of schedules in the population of each run, defaults to numberOfChromosomes from params.yml",
+    )
+    parser.add_argument("--seed", type=int, help="random seed, for repeatable runs")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of processes used to generate and score schedules, 0 uses every core, defaults to "
+        "num_workers from params.yml",
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="folder the schedules and comparison file are saved to, defaults to results_folder from params.yml",
+    )
+    parser.add_argument(
+        "--config", default=DEFAULT_CONFIG_PATH, help="location of params.yml"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="always read the input workbook, rather than the cached processed frames",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="carry on runs which were stopped part way through from their checkpoints, if checkpoint_interval is "
+        "set in params.yml",
+    )
+    parser.add_argument(
+        "--log-file", help="file to write the log to, the terminal if not given"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="number of seconds after which each run stops with the fittest schedule so far",
+    )
+    parser.add_argument(
+        "--timings-file",
+        help="file the time spent in each phase of every generation is appended to as JSON lines, turning on "
+        "collect_timings",
+    )
+    return parser.parse_args(argv)
+
+
+def configure(args: argparse.Namespace) -> Config:
+    """
+    Function to load the config and apply any options given on the command line
+
+    :param args: the options from parse_args
+    :returns: the Config to run with
+    """
+    config = Config.load(args.config)
+    if args.workers is not None:
+        config = dataclasses.replace(
+            config,
+            genetic_algorithm_params=dataclasses.replace(
+                config.genetic_algorithm_params, num_workers=args.workers
+            ),
+        )
+    if args.timings_file is not None:
+        config = dataclasses.replace(
+            config,
+            genetic_algorithm_params=dataclasses.replace(
+                config.genetic_algorithm_params,
+                collect_timings=True,
+                timings_file=args.timings_file,
+            ),
+        )
+    if args.output_dir is not None:
+        config = dataclasses.replace(
+            config,
+            schedule_params=dataclasses.replace(
+                config.schedule_params, results_folder=os.path.abspath(args.output_dir)
+            ),
+        )
+    return config
+
+
+def run_schedules(
+    dataload: DataLoader,
+    num_schedules: int,
+    pop_size: int,
+    config: Config,
+    resume: bool = False,
+    time_budget: float = None,
+) -> pd.DataFrame:
+    """
+    Function to run the genetic algorithm num_schedules times, as the Run button of the UI does. Each run's report is
+    written in the background while the next run starts
+
+    :param dataload: a DataLoader which has read its input data
+    :param num_schedules: the integer number of schedules to produce
+    :param pop_size: the integer number of schedules in the population of each run
+    :param config: the Config to run with
+    :param resume: whether runs stopped part way through last time carry on from their checkpoints
+    :param time_budget: number of seconds after which each run stops with the fittest schedule so far, or None
+    :returns: the schedule comparison table, with one row per schedule
+    """
+    num_weeks = dataload.num_weeks()
+    logging.info(f"Total weeks covered: {num_weeks}")
+    slots, wards, placements = dataload.preprocData(num_weeks)
+    # Shared by every run, using the compact tables built by preprocData
+    instance = ProblemInstance(
+        slots,
+        wards,
+        placements,
+        num_weeks,
+        dataload.placement_records,
+        dataload.ward_records,
+    )
+
+    report_writer = ReportWriter(config.ui_params.report_queue_size)
+    chosen_schedules = []
+    for i in range(num_schedules):
+        if config.genetic_algorithm_params.num_islands > 1:
+            GA = IslandModel(
+                slots,
+                wards,
+                placements,
+                pop_size,
+                num_weeks,
+                config,
+                report_writer,
+                instance,
+            )
+        else:
+            GA = GeneticAlgorithm(
+                slots,
+                wards,
+                placements,
+                pop_size,
+                num_weeks,
+                config,
+                report_writer,
+                instance,
+                run_index=i,
+            )
+        # With --resume, a run which was stopped part way through carries on from its last checkpoint
+        for snapshot in GA.run(resume=resume, time_budget=time_budget):
+            pass
+        GA.close()
+        chosen_schedule = GA.chosen_schedule
+        iteration = snapshot.iteration
+        logging.info(
+            f"Schedule {i + 1} of {num_schedules} chosen with fitness {chosen_schedule.fitness} after {iteration} iterations"
+        )
+        chosen_schedules.append((chosen_schedule, iteration))
+
+    report_writer.close()
+    scheduleCompare = []
+    for chosen_schedule, iteration in chosen_schedules:
+        job = report_writer.job(chosen_schedule.file_name)
+        if job is None:
+            quality_scores = chosen_schedule.quality_metrics
+        elif job.error is None:
+            quality_scores = job.quality_metrics
+        else:
+            logging.error(f"The report for {job.file_name} could not be saved")
+            continue
+        scheduleCompare.append(
+            comparison_row(chosen_schedule, iteration, quality_scores)
+        )
+        logging.info(f"{chosen_schedule.file_name} generated")
+    return pd.DataFrame(scheduleCompare, columns=COMPARISON_COLUMNS)
+
+
+def main(argv: list = None) -> int:
+    """
+    Function to run the Nursing Placement Optimisation tool end-to-end from the command line, for example from cron on
+    a machine without a display. Neither Streamlit nor matplotlib is imported. For the options see docs/cli.md or run
+    python -m src.cli --help
+
+    :param argv: list of command line arguments, sys.argv if not given
+    :returns: exit status, 0 once every schedule has been produced
+    """
+    args = parse_args(argv)
+    logging.basicConfig(
+        filename=args.log_file,
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+
+    config = configure(args)
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    input_file = args.input
+    if input_file is None:
+        input_file_name = config.ui_params.input_file_name
+        if input_file_name == "file_name_here" or input_file_name == "":
+            logging.error(
+                "No input file given, use --input or set input_file_name in params.yml"
+            )
+            return 2
+        input_file = os.path.join("data", input_file_name)
+
+    dataload = DataLoader()
+    dataload.readData(input_file, use_cache=not args.no_cache)
+
+    pop_size = args.pop_size or config.ui_params.numberOfChromosomes
+    scheduleCompareDF = run_schedules(
+        dataload, args.runs, pop_size, config, args.resume, args.time_budget
+    )
+    comparison_file = save_comparison(
+        scheduleCompareDF, config.schedule_params.results_folder
+    )
+    print(comparison_file)
+
+    num_viable = (scheduleCompareDF["Viable schedule?"] == "True").sum()
+    logging.info(f"{num_viable} of {len(scheduleCompareDF)} schedules are viable")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,26 +3,59 @@ import numpy as np
 from src.Slot import Slot
 from src.Ward import Ward
 from src.Placement import Placement
+from src.Vocabulary import tokenise
+from src.WardTable import WardTable
+from src.PlacementTable import PlacementTable
+import hashlib
+import json
+import logging
+import os
 import time
 
 
+# Increase whenever readData changes the frames it produces, so that cached frames from older versions are rebuilt
+LOADER_VERSION = 1
+
+# Frames produced by readData which are kept in the cache
+CACHED_FRAMES = ("students", "ward_data", "uni_placements", "student_placements")
+
+
 class DataLoader:
-    def readData(self, filename: str):
+    def readData(self, filename: str, use_cache: bool = True):
         """
-        Function to load data from files and do basic preprocessing and prep
+        Function to load data from files and do basic preprocessing and prep. The processed frames are cached as
+        Parquet files in a .cache folder next to the input file, and reused while the file is unchanged
 
         :param filename: name of the .xlsx file in the data folder for input data to be read from
+        :param use_cache: whether to read and write the cache of processed frames
         :returns: nothing returned by function, various class objects created
         """
+        if use_cache:
+            cache_key = self.cache_key(filename)
+            if self.read_cache(filename, cache_key):
+                return
 
-        # Load relevant files
-        self.students = pd.read_excel(
-            filename, sheet_name="students", engine="openpyxl"
-        )
-        self.ward_data = pd.read_excel(filename, sheet_name="wards", engine="openpyxl")
-        self.uni_placements = pd.read_excel(
-            filename, sheet_name="placements", engine="openpyxl"
+        # Load relevant files, opening the workbook once for all sheets
+        sheets = pd.read_excel(
+            filename, sheet_name=["students", "wards", "placements"], engine="openpyxl"
         )
+        self.process_sheets(sheets)
+
+        if use_cache:
+            self.write_cache(filename, cache_key)
+
+    def process_sheets(self, sheets: dict):
+        """
+        Function to do the basic preprocessing and prep of the students, wards and placements sheets of the input
+        data. Called by readData, and used directly by the benchmarks to load generated data without writing it to a
+        workbook first
+
+        :param sheets: dictionary of the students, wards and placements dataframes, as read from the input file
+        :returns: nothing returned by function, various class objects created
+        """
+        self.students = sheets["students"]
+        self.ward_data = sheets["wards"]
+        self.uni_placements = sheets["placements"]
 
         self.students["student_cohort"] = (
             self.students["university"].astype(str)
@@ -43,8 +76,8 @@ class DataLoader:
         self.students["prev_placements"] = (
             self.students["prev_placements"].str.strip().str.replace("'", "")
         )
-        self.students["allprevwards"] = self.students.prev_placements.apply(
-            lambda x: x[1:-1].split(",")
+        self.students["allprevwards"] = (
+            self.students["prev_placements"].str[1:-1].str.split(",")
         )
 
         # Process ward info
@@ -87,20 +120,17 @@ class DataLoader:
             "P3_CAP",
         ]
 
-        self.ward_dep_match = pd.Series(
-            self.ward_data.Department.values, index=self.ward_data.Ward
-        ).to_dict()
-        self.ward_dep_match[""] = "None"
-        self.students["prev_deps"] = [
-            [self.ward_dep_match[value.rstrip().lstrip()] for value in x]
-            for x in self.students["allprevwards"]
-        ]
-        self.students["allprevdeps"] = [
-            ", ".join(dep_list) for dep_list in self.students["prev_deps"]
-        ]
-        self.students["allprevwards"] = [
-            ", ".join(prev_plac) for prev_plac in self.students["allprevwards"]
-        ]
+        self.match_ward_departments()
+
+        # Look up the department of every previous ward at once, with one row per previous ward
+        prev_wards = self.students["allprevwards"].explode().str.strip()
+        unknown_wards = ~prev_wards.isin(list(self.ward_dep_match))
+        if unknown_wards.any():
+            raise KeyError(prev_wards[unknown_wards].iloc[0])
+        prev_deps = prev_wards.map(self.ward_dep_match).groupby(level=0)
+        self.students["prev_deps"] = prev_deps.agg(list)
+        self.students["allprevdeps"] = prev_deps.agg(", ".join)
+        self.students["allprevwards"] = self.students["allprevwards"].str.join(", ")
         self.student_placements = self.students.merge(
             self.uni_placements, how="left", on="student_cohort"
         )
@@ -131,63 +161,209 @@ class DataLoader:
             - 1
         )
 
+    def match_ward_departments(self):
+        """
+        Function to build the dictionary of the department of each ward, used to find the departments of
+        students' previous placements
+
+        :returns: nothing returned by function, ward_dep_match class object created
+        """
+        self.ward_dep_match = pd.Series(
+            self.ward_data.Department.values, index=self.ward_data.Ward
+        ).to_dict()
+        self.ward_dep_match[""] = "None"
+
+    def cache_directory(self, filename: str) -> str:
+        """
+        Function to find the folder where the processed frames of an input file are cached
+
+        :param filename: name of the input .xlsx file
+        :returns: path of the cache folder, in a .cache folder next to the input file
+        """
+        return os.path.join(
+            os.path.dirname(filename), ".cache", os.path.basename(filename)
+        )
+
+    def cache_key(self, filename: str) -> str:
+        """
+        Function to produce the key of the cached frames for an input file, from the file's contents and
+        the loader version. Any change to either gives a different key
+
+        :param filename: name of the input .xlsx file
+        :returns: hex digest of the key
+        """
+        file_hash = hashlib.sha256(f"loader version {LOADER_VERSION}".encode())
+        with open(filename, "rb") as input_file:
+            for block in iter(lambda: input_file.read(1 << 20), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    def read_cache(self, filename: str, cache_key: str) -> bool:
+        """
+        Function to load the processed frames of an input file from the cache, if they were cached with
+        the same key
+
+        :param filename: name of the input .xlsx file
+        :param cache_key: key of the input file (see cache_key)
+        :returns: True if the frames were loaded, False if the cache is missing or stale
+        """
+        directory = self.cache_directory(filename)
+        try:
+            with open(os.path.join(directory, "key.txt")) as key_file:
+                if key_file.read() != cache_key:
+                    logging.info(f"Cached frames for {filename} are stale, rebuilding")
+                    return False
+            frames = {
+                name: pd.read_parquet(os.path.join(directory, f"{name}.parquet"))
+                for name in CACHED_FRAMES
+            }
+            with open(os.path.join(directory, "dtypes.json")) as dtypes_file:
+                dtypes = json.load(dtypes_file)
+        except (FileNotFoundError, ImportError):
+            return False
+        except (OSError, ValueError) as error:
+            logging.warning(f"Could not read cached frames for {filename}: {error}")
+            return False
+
+        for name, frame in frames.items():
+            # Parquet may read a column back with a different dtype (e.g. strings held as objects), so the dtypes
+            # the frames had when they were cached are restored
+            for column, dtype in dtypes[name].items():
+                if str(frame[column].dtype) != dtype:
+                    frame[column] = frame[column].astype(dtype)
+            setattr(self, name, frame)
+        # Parquet returns list columns as arrays
+        for frame in (self.students, self.student_placements):
+            frame["prev_deps"] = frame["prev_deps"].map(list)
+        self.match_ward_departments()
+        return True
+
+    def write_cache(self, filename: str, cache_key: str):
+        """
+        Function to save the processed frames of an input file to the cache. The key is written last, so
+        that a partly written cache is never read
+
+        :param filename: name of the input .xlsx file
+        :param cache_key: key of the input file (see cache_key)
+        :returns: nothing returned by function, cache files written
+        """
+        directory = self.cache_directory(filename)
+        key_path = os.path.join(directory, "key.txt")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if os.path.exists(key_path):
+                os.remove(key_path)
+            for name in CACHED_FRAMES:
+                getattr(self, name).to_parquet(
+                    os.path.join(directory, f"{name}.parquet")
+                )
+            with open(os.path.join(directory, "dtypes.json"), "w") as dtypes_file:
+                json.dump(
+                    {
+                        name: {
+                            column: str(dtype)
+                            for column, dtype in getattr(self, name).dtypes.items()
+                        }
+                        for name in CACHED_FRAMES
+                    },
+                    dtypes_file,
+                )
+            with open(key_path, "w") as key_file:
+                key_file.write(cache_key)
+        except ImportError:
+            logging.info("Install pyarrow to cache the processed input data")
+        except (OSError, ValueError, TypeError) as error:
+            logging.warning(f"Could not cache frames for {filename}: {error}")
+
+    def num_weeks(self) -> int:
+        """
+        Function to find the number of weeks the schedule needs to cover. This is the number of weeks between the
+        first and last placement start dates, plus the longest placement so that even the longest placement fits
+
+        :returns: integer number of weeks
+        """
+        start_dates = pd.to_datetime(
+            self.student_placements["placement_start_date_raw"]
+        )
+        num_weeks = int(
+            np.round(
+                (start_dates.max() - start_dates.min()) / np.timedelta64(1, "W"), 0
+            )
+        )
+        longest_placement = int(self.student_placements["placement_len_weeks"].max())
+        return num_weeks + longest_placement + 1
+
     def preprocData(self, num_weeks: int):
         """
-        Function to convert dataframes into lists of Class objects for Genetic Algorithm
+        Function to convert dataframes into lists of Class objects for Genetic Algorithm, working a column
+        at a time. Each placement is given the integer index of its student, and wards and placements are
+        given token ids for their ward names and department words (see src/Vocabulary.py). The same
+        attributes are kept in compact WardTable and PlacementTable structured arrays, as ward_records
+        and placement_records, to be passed to the ProblemInstance
 
         :param num_weeks: the integer number of weeks covered by the schedule
         :returns: slots, wards and placements class objects
         """
 
-        num_slots = list(range(1, num_weeks + 1))
-        self.slots = []
-        pos = 0
-        for item in num_slots:
-            row_contents = []
-            row_contents.extend([pos, str(item)])
-            pos += 1
-            slot_item = Slot(row_contents)
-            self.slots.append(slot_item)
-
-        self.wards = []
-        for index, row in self.ward_data.iterrows():
-            row_contents = []
-            row_contents.extend(
-                [
-                    index,
-                    row.Ward,
-                    row.Department,
-                    row.education_audit_exp_week,
-                    row.covid_status,
-                    row.capacity,
-                    row.P1_CAP,
-                    row.P2_CAP,
-                    row.P3_CAP,
-                ]
-            )
-            ward_item = Ward(row_contents)
-            self.wards.append(ward_item)
-
-        self.placements = []
-        for index, row in self.student_placements.iterrows():
-            row_contents = []
-            year_num = row.placement_name.split(",", maxsplit=1)[0]
-            row_contents.extend(
-                [
-                    index,
-                    str(row.student_id) + "_" + str(row.placement_name),
-                    row.student_cohort,
-                    row.placement_len_weeks,
-                    row.placement_start_date,
-                    row.placement_start_date_raw,
-                    year_num,
-                    row.allprevwards,
-                    row.allprevdeps,
-                    row.allowable_covid_status,
-                ]
-            )
-            placement_item = Placement(row_contents)
-            self.placements.append(placement_item)
+        self.slots = [
+            Slot([pos, str(week)]) for pos, week in enumerate(range(1, num_weeks + 1))
+        ]
+
+        # Columns in the order of the Ward and Placement constructor inputs
+        ward_columns = {
+            "id": self.ward_data.index,
+            "ward": self.ward_data["Ward"],
+            "department": self.ward_data["Department"],
+            "ed_audit_expiry_week": self.ward_data["education_audit_exp_week"],
+            "covid_status": self.ward_data["covid_status"],
+            "capacity": self.ward_data["capacity"],
+            "p1_capacity": self.ward_data["P1_CAP"],
+            "p2_capacity": self.ward_data["P2_CAP"],
+            "p3_capacity": self.ward_data["P3_CAP"],
+        }
+        placement_columns = {
+            "id": self.student_placements.index,
+            "name": self.student_placements["student_id"].astype(str)
+            + "_"
+            + self.student_placements["placement_name"].astype(str),
+            "cohort": self.student_placements["student_cohort"],
+            "duration": self.student_placements["placement_len_weeks"],
+            "start": self.student_placements["placement_start_date"],
+            "start_date": self.student_placements["placement_start_date_raw"],
+            "part": self.student_placements["placement_name"]
+            .str.split(",", n=1)
+            .str[0],
+            "wardhistory": self.student_placements["allprevwards"],
+            "dephistory": self.student_placements["allprevdeps"],
+            "covid_status": self.student_placements["allowable_covid_status"],
+        }
+        # The objects and the tables below are built from the same lists, so that they share each string
+        ward_values = {name: column.tolist() for name, column in ward_columns.items()}
+        placement_values = {
+            name: column.tolist() for name, column in placement_columns.items()
+        }
+        self.wards = [Ward(list(row)) for row in zip(*ward_values.values())]
+        self.placements = [
+            Placement(list(row)) for row in zip(*placement_values.values())
+        ]
+
+        # Number the students, in the order they first appear, by the nurse key at the start of the
+        # placement name so that their placements can be grouped with integer indices
+        student_idx, _ = pd.factorize(
+            placement_columns["name"].str.split("_", n=1).str[0]
+        )
+        placement_values["student_idx"] = student_idx
+        for placement, placement_student in zip(self.placements, student_idx.tolist()):
+            placement.student_idx = placement_student
+
+        # Convert ward names and department words into integer token ids once, for use when scoring schedules
+        tokenise(self.wards, self.placements)
+        ward_values["ward_token"] = [ward.ward_token for ward in self.wards]
+
+        # Compact column-wise copies of the ward and placement attributes, passed to the ProblemInstance so that it
+        # does not rebuild them from the objects
+        self.ward_records = WardTable.from_columns(ward_values)
+        self.placement_records = PlacementTable.from_columns(placement_values)
 
         return self.slots, self.wards, self.placements
 
@@ -0,0 +1,12 @@
+import os
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    """
+    Function to run each test from the root of the repository, where the tool expects to find config/params.yml
+    """
+    monkeypatch.chdir(REPO_ROOT)
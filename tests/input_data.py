@@ -0,0 +1,182 @@
+"""
+Small input files for the tests, in the same format as a real input workbook. Students belong to cohorts with three
+placements each, students further through their course have previous placements on the wards, and some students and
+wards have a covid status which rules out some wards, so that every part of scoring is exercised. Python's random
+module is used rather than NumPy's, so the same seed gives the same data with any version of NumPy.
+"""
+
+import random
+import numpy as np
+import pandas as pd
+from src.data_load import DataLoader
+from src.ProblemInstance import ProblemInstance
+
+UNIVERSITIES = ["University1", "University2"]
+QUALIFICATIONS = ["Adult Nursing", "Child Nursing"]
+INTAKES = [("Sep2021", "P1"), ("Sep2020", "P2"), ("Sep2019", "P3")]
+DEPARTMENTS = [
+    "General Medicine",
+    "General Surgery",
+    "Critical Care",
+    "Community Nursing",
+    "Paediatrics",
+    "Elderly Care",
+]
+FIRST_WEEK = pd.Timestamp("2021-09-06")
+
+
+def input_sheets(
+    num_students: int,
+    num_wards: int,
+    seed: int = 0,
+    capacity: int = 4,
+    block_weeks: int = 8,
+) -> dict:
+    """
+    Function to make the students, wards and placements sheets of an input file
+
+    :param num_students: integer number of students
+    :param num_wards: integer number of wards
+    :param seed: integer seed, the same seed always gives the same sheets
+    :param capacity: integer capacity of each ward, which each part of the course may use most of
+    :param block_weeks: integer number of weeks between the blocks of placements of a cohort. Placements last two to
+        five weeks and start up to three weeks into their block, so with fewer than eight weeks a student's placements
+        can overlap
+    :returns: dictionary of the students, wards and placements dataframes
+    """
+    rng = random.Random(seed)
+    ward_names = [f"Ward{i}" for i in range(num_wards)]
+
+    cohorts = []
+    placement_rows = []
+    for university in UNIVERSITIES:
+        for qualification in QUALIFICATIONS:
+            for course_start, part in INTAKES:
+                cohorts.append((university, qualification, course_start, part))
+                for block in range(3):
+                    start_week = block * block_weeks + rng.randint(0, 3)
+                    placement_rows.append(
+                        [
+                            university,
+                            qualification,
+                            course_start,
+                            f"{part}, Block {block + 1}",
+                            str((FIRST_WEEK + pd.Timedelta(weeks=start_week)).date()),
+                            rng.randint(2, 5),
+                        ]
+                    )
+    placements = pd.DataFrame(
+        placement_rows,
+        columns=[
+            "university",
+            "qualification",
+            "course_start",
+            "placement_name",
+            "placement_start_date",
+            "placement_len_weeks",
+        ],
+    )
+
+    students = []
+    for student in range(num_students):
+        university, qualification, course_start, part = rng.choice(cohorts)
+        num_previous = min(int(part[1]) * 2 - 2, num_wards)
+        previous_wards = rng.sample(ward_names, num_previous)
+        students.append(
+            [
+                f"Student{student}",
+                university,
+                qualification,
+                course_start,
+                f"Year{part[1]}",
+                "[" + ", ".join(f"'{ward}'" for ward in previous_wards) + "]",
+                "Low/Medium" if rng.random() < 0.2 else "Medium/High",
+            ]
+        )
+    students = pd.DataFrame(
+        students,
+        columns=[
+            "student_id",
+            "university",
+            "qualification",
+            "course_start",
+            "year",
+            "prev_placements",
+            "allowable_covid_status",
+        ],
+    )
+
+    part_capacity = [
+        [max(1, capacity - rng.randint(0, 1)) for _ in range(3)]
+        for _ in range(num_wards)
+    ]
+    wards = pd.DataFrame(
+        {
+            "ward_name": ward_names,
+            "ward_speciality": [rng.choice(DEPARTMENTS) for _ in range(num_wards)],
+            "education_audit_exp": str(
+                (FIRST_WEEK + pd.Timedelta(weeks=104)).date()
+            ),
+            "covid_status": [
+                "Medium/High" if rng.random() < 0.25 else "Low/Medium"
+                for _ in range(num_wards)
+            ],
+            "capacity_num": capacity,
+            "p1_cap": [caps[0] for caps in part_capacity],
+            "p2_cap": [caps[1] for caps in part_capacity],
+            "p3_cap": [caps[2] for caps in part_capacity],
+        }
+    )
+
+    return {"students": students, "wards": wards, "placements": placements}
+
+
+def write_workbook(sheets: dict, filename: str):
+    """
+    Function to save sheets as an input workbook
+
+    :param sheets: dictionary of the students, wards and placements dataframes
+    :param filename: path of the .xlsx file to write
+    """
+    with pd.ExcelWriter(filename) as writer:
+        for sheet_name, sheet in sheets.items():
+            sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+
+
+def load_problem(filename: str) -> tuple:
+    """
+    Function to read an input workbook as the UI does
+
+    :param filename: path of the .xlsx file
+    :returns: slots, wards, placements, the integer number of weeks, and the placement and ward tables
+    """
+    dataload = DataLoader()
+    dataload.readData(filename)
+    start_dates = pd.to_datetime(
+        dataload.student_placements["placement_start_date_raw"]
+    )
+    num_weeks = int(
+        np.round((start_dates.max() - start_dates.min()) / np.timedelta64(1, "W"), 0)
+    )
+    num_weeks += int(dataload.student_placements["placement_len_weeks"].max()) + 1
+    slots, wards, placements = dataload.preprocData(num_weeks)
+    return (
+        slots,
+        wards,
+        placements,
+        num_weeks,
+        dataload.placement_records,
+        dataload.ward_records,
+    )
+
+
+def problem_instance(filename: str, **kwargs) -> ProblemInstance:
+    """
+    Function to write an input workbook and read it back in as a problem instance
+
+    :param filename: path of the .xlsx file to write
+    :param kwargs: arguments passed on to input_sheets
+    :returns: ProblemInstance for the workbook
+    """
+    write_workbook(input_sheets(**kwargs), filename)
+    return ProblemInstance(*load_problem(filename))
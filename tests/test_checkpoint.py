@@ -0,0 +1,227 @@
+"""
+Checks that a GeneticAlgorithm run which is stopped part way through and resumed from its checkpoint reaches exactly
+the same schedule as a run which was not stopped, with one worker or several, that a checkpoint saved for a different
+run or different parameters is not resumed, that run only resumes when asked to, and that the checkpoint is removed
+once the run finishes or is stopped.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import dataclasses
+import os
+import random
+import pytest
+from benchmarks.synthetic_data import generate_sheets
+from src.Config import Config
+from src.data_load import DataLoader
+from src.GeneticAlgorithm import GeneticAlgorithm
+from src.ProblemInstance import ProblemInstance
+from src.Schedule import Schedule
+
+POPULATION_SIZE = 20
+STOP_AT_GENERATION = 7
+
+
+@pytest.fixture(scope="module")
+def instance():
+    dataload = DataLoader()
+    dataload.process_sheets(generate_sheets(120, 8))
+    num_weeks = dataload.num_weeks()
+    slots, wards, placements = dataload.preprocData(num_weeks)
+    return ProblemInstance(
+        slots,
+        wards,
+        placements,
+        num_weeks,
+        dataload.placement_records,
+        dataload.ward_records,
+    )
+
+
+@pytest.fixture(autouse=True)
+def results_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(Schedule, "results_directory", lambda self: str(tmp_path))
+
+
+def checkpoint_config(tmp_path, **ga_params) -> Config:
+    """
+    Function to load the config with a checkpoint saved every generation to a file in tmp_path
+    """
+    config = Config.load()
+    ga_params = {
+        "checkpoint_interval": 1,
+        "checkpoint_file": str(tmp_path / "checkpoints" / "ga.npz"),
+        **ga_params,
+    }
+    return dataclasses.replace(
+        config,
+        genetic_algorithm_params=dataclasses.replace(
+            config.genetic_algorithm_params, **ga_params
+        ),
+    )
+
+
+def new_algorithm(instance, config: Config, run_index: int = 0) -> GeneticAlgorithm:
+    return GeneticAlgorithm(
+        instance.slots,
+        instance.wards,
+        instance.placements,
+        POPULATION_SIZE,
+        instance.num_weeks,
+        config,
+        instance=instance,
+        run_index=run_index,
+    )
+
+
+def run_until(algorithm: GeneticAlgorithm, status: tuple, stop_at: int = None) -> tuple:
+    """
+    Function to evolve the population until the run finishes, or until generation stop_at has been evaluated. The
+    fitness and assignment of every schedule in the final population are returned as well as the chosen schedule, as
+    the fittest schedule is often settled within a few generations and the rest of the population is what shows
+    whether the resumed run drew the same random numbers
+    """
+    continue_eval, chosen_schedule, fitness, iteration, _ = status
+    while continue_eval and iteration != stop_at:
+        continue_eval, chosen_schedule, fitness, iteration, _ = algorithm.evolve()
+    population = [
+        (member["fitness"], member["schedule"].assignment.tolist())
+        for member in algorithm.schedules
+    ]
+    return continue_eval, chosen_schedule, fitness, iteration, population
+
+
+def assert_same_result(result: tuple, other_result: tuple):
+    continue_eval, chosen_schedule, fitness, iteration, population = result
+    assert not continue_eval
+    assert iteration == other_result[3]
+    assert fitness == other_result[2]
+    assert chosen_schedule.assignment.tolist() == other_result[1].assignment.tolist()
+    assert population == other_result[4]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_resumed_run_reaches_same_result(instance, tmp_path, num_workers):
+    config = checkpoint_config(tmp_path, num_workers=num_workers)
+
+    random.seed(11)
+    algorithm = new_algorithm(instance, config)
+    algorithm.seed_schedules()
+    try:
+        expected = run_until(algorithm, algorithm.evaluate())
+    finally:
+        algorithm.close()
+    assert expected[3] > STOP_AT_GENERATION
+    assert not os.path.exists(algorithm.checkpoint_file)
+
+    random.seed(11)
+    algorithm = new_algorithm(instance, config)
+    algorithm.seed_schedules()
+    try:
+        stopped = run_until(algorithm, algorithm.evaluate(), STOP_AT_GENERATION)
+    finally:
+        algorithm.close()
+    assert stopped[0] and stopped[3] == STOP_AT_GENERATION
+    assert os.path.exists(algorithm.checkpoint_file)
+
+    # The random state is restored from the checkpoint, so the seed the run is started with makes no difference
+    random.seed(12)
+    algorithm = new_algorithm(instance, config)
+    try:
+        assert algorithm.load_checkpoint()
+        assert algorithm.iteration_count == STOP_AT_GENERATION
+        resumed = run_until(algorithm, algorithm.resume_status())
+    finally:
+        algorithm.close()
+    assert_same_result(resumed, expected)
+    assert not os.path.exists(algorithm.checkpoint_file)
+
+
+def test_each_run_has_own_checkpoint(instance, tmp_path):
+    config = checkpoint_config(tmp_path)
+    first_run = new_algorithm(instance, config, run_index=0)
+    second_run = new_algorithm(instance, config, run_index=1)
+    try:
+        assert first_run.checkpoint_file == str(tmp_path / "checkpoints" / "ga_0.npz")
+        assert second_run.checkpoint_file == str(tmp_path / "checkpoints" / "ga_1.npz")
+        first_run.seed_schedules()
+        first_run.evaluate()
+        assert os.path.exists(first_run.checkpoint_file)
+        assert not second_run.load_checkpoint()
+        # Even given the first run's checkpoint, the second run does not resume it
+        assert not second_run.load_checkpoint(first_run.checkpoint_file)
+    finally:
+        first_run.close()
+        second_run.close()
+
+
+
+def test_run_resumes_only_when_asked(instance, tmp_path):
+    config = checkpoint_config(tmp_path)
+    algorithm = new_algorithm(instance, config)
+    try:
+        for snapshot in algorithm.run():
+            if snapshot.iteration == 3:
+                break
+    finally:
+        algorithm.close()
+    assert os.path.exists(algorithm.checkpoint_file)
+
+    resumed_algorithm = new_algorithm(instance, config)
+    try:
+        snapshot = next(resumed_algorithm.run(resume=True))
+    finally:
+        resumed_algorithm.close()
+    assert snapshot.resumed and snapshot.iteration == 3
+
+    new_run = new_algorithm(instance, config)
+    try:
+        snapshot = next(new_run.run())
+    finally:
+        new_run.close()
+    assert not snapshot.resumed and snapshot.iteration == 1
+
+
+def test_stop_removes_checkpoint(instance, tmp_path):
+    algorithm = new_algorithm(instance, checkpoint_config(tmp_path))
+    try:
+        algorithm.start()
+        assert os.path.exists(algorithm.checkpoint_file)
+        chosen_schedule = algorithm.stop()
+    finally:
+        algorithm.close()
+    assert not os.path.exists(algorithm.checkpoint_file)
+    assert chosen_schedule.file_name in os.listdir(tmp_path)
+
+
+@pytest.mark.parametrize(
+    "ga_params, resumed",
+    [
+        ({"mutationProbability": 0.3}, False),
+        ({"selection_method": "tournament"}, False),
+        ({"num_workers": 2, "fitness_cache_size": 0}, True),
+        ({"collect_timings": True}, True),
+    ],
+)
+def test_checkpoint_with_other_parameters(instance, tmp_path, ga_params, resumed):
+    algorithm = new_algorithm(instance, checkpoint_config(tmp_path))
+    try:
+        algorithm.seed_schedules()
+        algorithm.evaluate()
+    finally:
+        algorithm.close()
+
+    other_algorithm = new_algorithm(instance, checkpoint_config(tmp_path, **ga_params))
+    try:
+        assert other_algorithm.load_checkpoint() is resumed
+    finally:
+        other_algorithm.close()
+
+
+def test_relative_checkpoint_file_in_tool_folder(instance, tmp_path):
+    config = checkpoint_config(tmp_path, checkpoint_file="checkpoints/ga.npz")
+    algorithm = new_algorithm(instance, config)
+    algorithm.close()
+    tool_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert algorithm.checkpoint_file == os.path.join(
+        tool_directory, "checkpoints", "ga_0.npz"
+    )
@@ -0,0 +1,82 @@
+"""
+Checks that the command line runner produces a report for each run and a comparison file in the chosen output folder
+from a generated input workbook, and that it never imports Streamlit or matplotlib.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import os
+import subprocess
+import sys
+import pandas as pd
+import pytest
+from tests.input_data import input_sheets, write_workbook
+from src.cli import main
+from src.ReportWriter import COMPARISON_COLUMNS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NUM_RUNS = 2
+
+
+@pytest.fixture
+def input_file(tmp_path) -> str:
+    filename = str(tmp_path / "cli.xlsx")
+    write_workbook(
+        input_sheets(num_students=24, num_wards=6, seed=1, capacity=6), filename
+    )
+    return filename
+
+
+def cli_args(input_file: str, output_dir: str) -> list:
+    return [
+        "--input",
+        input_file,
+        "--runs",
+        str(NUM_RUNS),
+        "--pop-size",
+        "6",
+        "--seed",
+        "3",
+        "--workers",
+        "1",
+        "--output-dir",
+        output_dir,
+        "--no-cache",
+    ]
+
+
+def test_comparison_file(input_file, tmp_path, capsys):
+    output_dir = str(tmp_path / "output")
+    assert main(cli_args(input_file, output_dir)) == 0
+
+    comparison_file = capsys.readouterr().out.strip()
+    assert os.path.dirname(comparison_file) == output_dir
+    assert os.path.basename(comparison_file).startswith("schedule_comparison_")
+    comparison = pd.read_csv(comparison_file, index_col=0)
+    assert list(comparison.columns) == COMPARISON_COLUMNS
+    assert len(comparison) == NUM_RUNS
+
+    saved = os.listdir(output_dir)
+    for file_name in comparison["Schedule file name"]:
+        assert file_name in saved
+    assert comparison["Viable schedule?"].astype(str).isin(["True", "False"]).all()
+    assert (comparison["Number of iterations to generate"] >= 1).all()
+
+
+def test_no_user_interface_imports(input_file, tmp_path):
+    # A fresh interpreter, so that nothing imported by other tests is in sys.modules
+    script = (
+        "import sys\n"
+        "from src.cli import main\n"
+        f"status = main({cli_args(input_file, str(tmp_path / 'output'))!r})\n"
+        "imported = [name for name in ('streamlit', 'matplotlib')\n"
+        "    if name in sys.modules]\n"
+        "print(status, imported)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.splitlines()[-1] == "0 []"
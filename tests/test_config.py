@@ -0,0 +1,107 @@
+"""
+Checks that params.yml is read into a Config with every value of the right type, that parameters with defaults may
+be left out, and that values which cannot be read as the type of their parameter stop the tool with a ValueError
+naming the parameter rather than being quietly changed.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+from dataclasses import MISSING, dataclass, fields
+import pytest
+import yaml
+from src.Config import Config, DEFAULT_CONFIG_PATH, section_from_dict
+
+
+@dataclass(frozen=True)
+class ExampleParams:
+    """ Parameters of each type, some with defaults """
+
+    name: str
+    size: int
+    weight: float
+    check: bool
+    limit: int = 10
+    enabled: bool = True
+
+
+def example_section(**values) -> dict:
+    section = {"name": "example", "size": 3, "weight": 0.5, "check": False}
+    section.update(values)
+    return section
+
+
+def read_params() -> dict:
+    with open(DEFAULT_CONFIG_PATH) as f:
+        return yaml.load(f, Loader=yaml.FullLoader)
+
+
+def test_load_gives_field_types():
+    config = Config.load()
+    for section_field in fields(Config):
+        section = getattr(config, section_field.name)
+        for field in fields(section):
+            assert type(getattr(section, field.name)) is field.type, field.name
+
+
+def test_older_params_without_defaulted_keys(tmp_path):
+    # A params.yml without the parameters that have defaults reads the same as the full file, so each default matches
+    # the value given in config/params.yml
+    params = read_params()
+    for section_field in fields(Config):
+        for field in fields(section_field.type):
+            if field.default is not MISSING:
+                del params[section_field.name][field.name]
+    path = tmp_path / "params.yml"
+    path.write_text(yaml.dump(params))
+    assert Config.load(str(path)) == Config.load()
+
+
+def test_missing_key_without_default():
+    section = example_section()
+    del section["size"]
+    with pytest.raises(KeyError, match="size"):
+        section_from_dict(ExampleParams, section)
+
+
+def test_missing_and_empty_keys_take_defaults():
+    params = section_from_dict(ExampleParams, example_section(enabled=None))
+    assert params.limit == 10
+    assert params.enabled is True
+
+
+def test_empty_key_without_default():
+    with pytest.raises(ValueError, match="weight in ExampleParams must be given"):
+        section_from_dict(ExampleParams, example_section(weight=None))
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(True, True), (False, False), ("False", False), ("true", True), (" TRUE ", True)],
+)
+def test_bool_values(value, expected):
+    params = section_from_dict(ExampleParams, example_section(check=value))
+    assert params.check is expected
+
+
+@pytest.mark.parametrize("value", ["yes", "", 0, 1, 1.0])
+def test_bad_bool_values(value):
+    with pytest.raises(ValueError, match="check in ExampleParams must be True or"):
+        section_from_dict(ExampleParams, example_section(check=value))
+
+
+@pytest.mark.parametrize("value, expected", [(4, 4), (4.0, 4), ("4", 4), (0, 0)])
+def test_int_values(value, expected):
+    params = section_from_dict(ExampleParams, example_section(size=value))
+    assert params.size == expected
+    assert type(params.size) is int
+
+
+@pytest.mark.parametrize("value", [0.5, 2.7, "2.7", "two", True])
+def test_bad_int_values(value):
+    with pytest.raises(ValueError, match="size in ExampleParams must be a whole"):
+        section_from_dict(ExampleParams, example_section(size=value))
+
+
+def test_float_values():
+    assert section_from_dict(ExampleParams, example_section(weight=2)).weight == 2.0
+    with pytest.raises(ValueError, match="weight in ExampleParams must be a float"):
+        section_from_dict(ExampleParams, example_section(weight="heavy"))
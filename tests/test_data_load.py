@@ -0,0 +1,82 @@
+"""
+Checks the cache of processed input frames kept by DataLoader.readData: a second read of an unchanged workbook comes
+from the cache with the same frames and dtypes as reading the workbook, a changed workbook is read again, and
+use_cache=False neither reads nor writes the cache.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from tests.input_data import input_sheets, write_workbook
+from src.data_load import CACHED_FRAMES, DataLoader
+from src.ProblemInstance import ProblemInstance
+
+pytest.importorskip("pyarrow")
+
+
+def read_excel_unavailable(*args, **kwargs):
+    raise AssertionError("the workbook was read instead of the cache")
+
+
+def read(filename: str, use_cache: bool = True) -> DataLoader:
+    dataload = DataLoader()
+    dataload.readData(filename, use_cache=use_cache)
+    return dataload
+
+
+def assert_same_frames(dataload: DataLoader, other: DataLoader):
+    for name in CACHED_FRAMES:
+        pd.testing.assert_frame_equal(getattr(dataload, name), getattr(other, name))
+    assert dataload.ward_dep_match == other.ward_dep_match
+
+
+@pytest.fixture
+def workbook(tmp_path) -> str:
+    filename = str(tmp_path / "input.xlsx")
+    write_workbook(input_sheets(20, 5, seed=4), filename)
+    return filename
+
+
+def test_cache_hit(workbook, monkeypatch):
+    uncached = read(workbook, use_cache=False)
+    read(workbook)
+    assert os.path.exists(os.path.join(os.path.dirname(workbook), ".cache"))
+
+    monkeypatch.setattr(pd, "read_excel", read_excel_unavailable)
+    cached = read(workbook)
+    assert_same_frames(cached, uncached)
+
+    # The frames from the cache give the same instance as the frames read from the workbook
+    num_weeks = 30
+    instances = [
+        ProblemInstance(
+            *dataload.preprocData(num_weeks),
+            num_weeks,
+            dataload.placement_records,
+            dataload.ward_records,
+        )
+        for dataload in (uncached, cached)
+    ]
+    for name, value in vars(instances[0]).items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(getattr(instances[1], name), value)
+
+
+def test_changed_workbook_read_again(workbook):
+    read(workbook)
+    write_workbook(input_sheets(25, 5, seed=5), workbook)
+    dataload = read(workbook)
+    assert len(dataload.students) == 25
+    assert_same_frames(dataload, read(workbook, use_cache=False))
+
+
+def test_use_cache_false(workbook, monkeypatch):
+    read(workbook, use_cache=False)
+    assert not os.path.exists(os.path.join(os.path.dirname(workbook), ".cache"))
+
+    # A cache which is present is not read either
+    read(workbook)
+    monkeypatch.setattr(DataLoader, "read_cache", read_excel_unavailable)
+    read(workbook, use_cache=False)
@@ -0,0 +1,135 @@
+"""
+Checks that the FitnessCache drops the least recently used schedule once full, counts its hits and misses, scores
+each new assignment in a population only once, and does nothing when its size is 0. Also checks that the WorkerPool
+stores every schedule its tasks return in the cache of the current process, with one worker or several.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+from tests.input_data import problem_instance
+from src.Config import Config
+from src.FitnessCache import FitnessCache
+from src.WorkerPool import WorkerPool
+
+
+class CountingEvaluator:
+    """ Scores each assignment by its sum, remembering every assignment it was asked to score """
+
+    def __init__(self):
+        self.scored = []
+
+    def __call__(self, assignments: np.ndarray) -> tuple:
+        self.scored.extend(tuple(assignment) for assignment in assignments)
+        fitnesses = assignments.sum(axis=1).astype(float)
+        return fitnesses, fitnesses > 2
+
+
+def key(value: int) -> bytes:
+    return FitnessCache.genome_key(np.array([value]))
+
+
+def test_genome_key():
+    assert FitnessCache.genome_key(np.array([1, 2, 3])) == FitnessCache.genome_key(
+        np.array([1, 2, 3], dtype=np.int32)
+    )
+    assert FitnessCache.genome_key(np.array([1, 2, 3])) != FitnessCache.genome_key(
+        np.array([3, 2, 1])
+    )
+
+
+def test_least_recently_used_dropped():
+    cache = FitnessCache(3)
+    for value in range(3):
+        cache.put(key(value), (float(value), False))
+    # Looking up 0 makes 1 the least recently used, and storing 1 again afterwards makes it the most recent
+    assert cache.get(key(0)) == (0.0, False)
+    cache.put(key(3), (3.0, True))
+    assert list(cache.entries) == [key(2), key(0), key(3)]
+    cache.put(key(2), (2.0, False))
+    cache.put(key(4), (4.0, True))
+    assert list(cache.entries) == [key(3), key(2), key(4)]
+    assert cache.get(key(1)) is None
+    assert cache.get(key(0)) is None
+
+
+def test_hits_and_misses():
+    cache = FitnessCache(10)
+    cache.put(key(1), (1.0, False))
+    assert cache.get(key(1)) == (1.0, False)
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)) == (1.0, False)
+    assert cache.stats() == {
+        "size": 1,
+        "max_size": 10,
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": 2 / 3,
+    }
+
+
+def test_evaluate_scores_new_assignments_once():
+    cache = FitnessCache(10)
+    evaluator = CountingEvaluator()
+    population = [np.array(a) for a in ([1, 0], [1, 2], [1, 0], [0, 4])]
+    fitnesses, viable = cache.evaluate(population, evaluator)
+    assert fitnesses.tolist() == [1.0, 3.0, 1.0, 4.0]
+    assert viable.tolist() == [False, True, False, True]
+    assert evaluator.scored == [(1, 0), (1, 2), (0, 4)]
+
+    fitnesses, viable = cache.evaluate(population[:2] + [np.array([2, 2])], evaluator)
+    assert fitnesses.tolist() == [1.0, 3.0, 4.0]
+    assert viable.tolist() == [False, True, True]
+    assert evaluator.scored == [(1, 0), (1, 2), (0, 4), (2, 2)]
+    assert cache.stats()["size"] == 4
+
+
+def test_size_zero_turns_cache_off():
+    cache = FitnessCache(0)
+    cache.put(key(1), (1.0, False))
+    assert len(cache.entries) == 0
+
+    evaluator = CountingEvaluator()
+    population = [np.array([1, 0]), np.array([1, 0])]
+    for _ in range(2):
+        fitnesses, _ = cache.evaluate(population, evaluator)
+        assert fitnesses.tolist() == [1.0, 1.0]
+    assert len(evaluator.scored) == 4
+    assert cache.stats()["hits"] == cache.stats()["misses"] == 0
+
+
+@pytest.fixture(scope="module")
+def instance(tmp_path_factory):
+    return problem_instance(
+        str(tmp_path_factory.mktemp("data") / "cache.xlsx"),
+        num_students=24,
+        num_wards=6,
+        seed=1,
+        capacity=6,
+    )
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_worker_pool_remembers_returned_schedules(instance, num_workers):
+    workers = WorkerPool(instance, Config.load(), num_workers)
+    try:
+        cache = workers.context.fitness_cache
+        schedules = workers.generate([1, 2, 3, 4])
+        schedules += workers.mutate([(5, schedules[0]), (6, schedules[1])], 3)
+        for offspring in workers.recombine([(7, schedules[2], schedules[3])], 5, 2):
+            schedules += offspring
+
+        for schedule in schedules:
+            assert cache.entries[cache.genome_key(schedule.assignment)] == (
+                schedule.fitness,
+                schedule.viable,
+            )
+        misses = cache.misses
+        fitnesses, viable = cache.evaluate(
+            [schedule.assignment for schedule in schedules], workers.evaluate
+        )
+        assert cache.misses == misses
+        assert fitnesses.tolist() == [schedule.fitness for schedule in schedules]
+        assert viable.tolist() == [bool(schedule.viable) for schedule in schedules]
+    finally:
+        workers.close()
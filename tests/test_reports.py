@@ -0,0 +1,105 @@
+"""
+Checks that reports saved in the same second are given different file names, so that none is overwritten, and that
+the schedule comparison still reads the viability from a name with a count added.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import datetime
+import os
+import random
+import pytest
+from tests.input_data import problem_instance
+from src.Config import Config
+from src.ReportWriter import ReportWriter, comparison_row
+from src import Schedule as schedule_module
+from src.Schedule import Schedule
+
+NOW = datetime.datetime(2021, 9, 6, 12, 30, 15)
+
+
+class FrozenDatetime(datetime.datetime):
+    """ A datetime whose now() is always the same second """
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+@pytest.fixture(scope="module")
+def instance(tmp_path_factory):
+    return problem_instance(
+        str(tmp_path_factory.mktemp("data") / "reports.xlsx"),
+        num_students=12,
+        num_wards=4,
+        seed=6,
+        capacity=6,
+    )
+
+
+@pytest.fixture
+def results_folder(tmp_path, monkeypatch) -> str:
+    monkeypatch.setattr(schedule_module, "datetime", FrozenDatetime)
+    monkeypatch.setattr(Schedule, "results_directory", lambda self: str(tmp_path))
+    return str(tmp_path)
+
+
+def new_schedules(instance, num_schedules: int) -> list:
+    random.seed(0)
+    config = Config.load()
+    schedules = []
+    for _ in range(num_schedules):
+        schedule = Schedule(
+            instance.slots,
+            instance.wards,
+            instance.placements,
+            instance.num_weeks,
+            instance,
+            config,
+        )
+        schedule.schedule_generation()
+        schedule.get_fitness()
+        schedules.append(schedule)
+    return schedules
+
+
+def test_reports_in_same_second(instance, results_folder):
+    schedules = new_schedules(instance, 4)
+    writer = ReportWriter(max_pending=2)
+    try:
+        jobs = [writer.submit(schedule) for schedule in schedules]
+        writer.wait()
+    finally:
+        writer.close()
+
+    file_names = [job.file_name for job in jobs]
+    assert len(set(file_names)) == len(file_names)
+    assert all(job.error is None for job in jobs)
+    assert sorted(writer.jobs) == sorted(file_names)
+    saved = os.listdir(results_folder)
+    for file_name in file_names:
+        assert file_name in saved
+        assert file_name.replace(".xlsx", ".csv") in saved
+
+    # A report saved straight away afterwards does not take the name of one already in the results folder
+    assert schedules[0].report_file_name() not in file_names
+
+
+def test_count_after_viability(instance, results_folder):
+    schedule = new_schedules(instance, 1)[0]
+    quality_scores = {
+        "num_incorr_num_plac": 0,
+        "num_incorrect_length": 0,
+        "num_capacity_exceeded": 0,
+        "num_double_booked": 0,
+    }
+    taken_names = set()
+    for viable in (True, False):
+        schedule.viable = viable
+        for count in range(3):
+            file_name = schedule.report_file_name(taken_names)
+            taken_names.add(file_name)
+            if count:
+                assert file_name.endswith(f"_{viable}_{count + 1}.xlsx")
+            schedule.file_name = file_name
+            row = comparison_row(schedule, 1, quality_scores)
+            assert row[:2] == [file_name, str(viable)]
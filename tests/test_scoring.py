@@ -0,0 +1,201 @@
+"""
+Checks that a schedule is scored the same however it is scored. Moves made by Schedule.move_placement only re-score
+the placements and students they affect, so the fitness they leave behind is compared exactly with a full re-score
+by Schedule.populate_schedule and with the PopulationEvaluator used to score the whole population. A fixed instance is also scored against fitness values taken from the original
+scoring code, so that the scores cannot all drift together.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import random
+import numpy as np
+import pytest
+from tests.input_data import problem_instance, load_problem
+from src.ProblemInstance import ProblemInstance, UNASSIGNED
+from src.PopulationEvaluator import PopulationEvaluator
+from src.Schedule import Schedule
+
+NUM_MOVES = 200
+
+# Fitness and viability of schedules of the golden instance, scored by the scoring code as it was before schedules
+# were stored as arrays. The student's placements in this instance never overlap, so they are scored the same way by
+# both versions of the double booking check.
+GOLDEN_FORMULA_FITNESS = [
+    (0.6490755640919159, False),
+    (0.6507085755813954, False),
+    (0.6621894033776301, False),
+    (0.6418081222314508, False),
+]
+GOLDEN_FEASIBLE_ASSIGNMENT = [
+    1, 2, 0, 5, 3, 3, 1, 0, 0, 0, 3, 4, 2, 0, 1, 4, 4, 2, 2, 1, 0, 2, 1, 0,
+    5, 2, 2, 1, 1, 5, 5, 2, 0, 4, 2, 5, 3, 4, 1, 1, 1, 3, 4, 4, 5, 4, 1, 3,
+    3, 4, 3, 3, 1, 1, 3, 5, 4, 4, 5, 3, 5, 2, 1, 5, 0, 3, 1, 5, 5, 3, 2, 1,
+]  # fmt: skip
+GOLDEN_FEASIBLE_FITNESS = 0.8909001726498093
+
+
+def build_instance(tmp_path_factory, name: str, **kwargs) -> ProblemInstance:
+    """
+    Function to write an input workbook and read it back in as a problem instance
+    """
+    return problem_instance(
+        str(tmp_path_factory.mktemp("data") / f"{name}.xlsx"), **kwargs
+    )
+
+
+@pytest.fixture(scope="module")
+def instance(tmp_path_factory) -> ProblemInstance:
+    """
+    Function to build an instance with too little ward capacity and overlapping placements, so that schedules are
+    over capacity and double booked as well as within capacity
+    """
+    return build_instance(
+        tmp_path_factory,
+        "crowded",
+        num_students=40,
+        num_wards=5,
+        seed=3,
+        capacity=3,
+        block_weeks=4,
+    )
+
+
+@pytest.fixture(scope="module")
+def golden_instance(tmp_path_factory) -> ProblemInstance:
+    return build_instance(
+        tmp_path_factory, "golden", num_students=24, num_wards=6, seed=1, capacity=6
+    )
+
+
+def scored_schedule(instance: ProblemInstance, assignment) -> Schedule:
+    """
+    Function to make and fully score a schedule with the given ward for each placement
+    """
+    schedule = Schedule(
+        instance.slots,
+        instance.wards,
+        instance.placements,
+        instance.num_weeks,
+        instance,
+    )
+    schedule.assignment = np.array(assignment, dtype=np.int64)
+    schedule.populate_schedule()
+    return schedule
+
+
+def random_schedule(instance: ProblemInstance) -> Schedule:
+    """
+    Function to make a schedule with every placement on a random ward
+    """
+    num_wards = len(instance.wards)
+    return scored_schedule(
+        instance,
+        [random.randrange(num_wards) for _ in range(len(instance.placements))],
+    )
+
+
+def assert_matches_full_rescore(schedule: Schedule, evaluator: PopulationEvaluator):
+    """
+    Function to check that the occupancy and fitness held by a schedule are exactly those of a full re-score and of
+    the PopulationEvaluator
+    """
+    rescored = scored_schedule(schedule.instance, schedule.assignment.copy())
+    np.testing.assert_array_equal(schedule.occupancy, rescored.occupancy)
+    assert schedule.fitness == rescored.fitness
+    assert bool(schedule.viable) == bool(rescored.viable)
+
+    fitnesses, viable = evaluator.evaluate(schedule.assignment[np.newaxis, :])
+    assert fitnesses[0] == schedule.fitness
+    assert viable[0] == bool(schedule.viable)
+
+
+def random_moves(schedule: Schedule, num_moves: int):
+    """
+    Function to move randomly chosen placements to random wards one at a time, sometimes leaving them unassigned
+    """
+    num_placements = len(schedule.assignment)
+    num_wards = len(schedule.wards)
+    for _ in range(num_moves):
+        placement_id = random.randrange(num_placements)
+        ward_id = random.randrange(-1, num_wards)
+        if ward_id == -1:
+            ward_id = UNASSIGNED
+        schedule.move_placement(placement_id, ward_id)
+
+
+@pytest.mark.parametrize("k", range(len(GOLDEN_FORMULA_FITNESS)))
+def test_golden_fitness(golden_instance, k):
+    num_wards = len(golden_instance.wards)
+    assignment = [
+        (p * (2 * k + 3) + k * k) % num_wards
+        for p in range(len(golden_instance.placements))
+    ]
+    schedule = scored_schedule(golden_instance, assignment)
+    fitness, viable = GOLDEN_FORMULA_FITNESS[k]
+    assert schedule.fitness == pytest.approx(fitness, rel=1e-12)
+    assert bool(schedule.viable) == viable
+    assert_matches_full_rescore(schedule, PopulationEvaluator(golden_instance))
+
+
+def test_golden_fitness_viable(golden_instance):
+    schedule = scored_schedule(golden_instance, GOLDEN_FEASIBLE_ASSIGNMENT)
+    assert schedule.fitness == pytest.approx(GOLDEN_FEASIBLE_FITNESS, rel=1e-12)
+    assert schedule.viable
+    assert_matches_full_rescore(schedule, PopulationEvaluator(golden_instance))
+
+
+def test_moves_match_full_rescore(instance):
+    random.seed(0)
+    evaluator = PopulationEvaluator(instance)
+    schedule = random_schedule(instance)
+    for _ in range(NUM_MOVES // 10):
+        random_moves(schedule, 10)
+        assert_matches_full_rescore(schedule, evaluator)
+
+
+def test_mutation_matches_full_rescore(instance):
+    random.seed(1)
+    evaluator = PopulationEvaluator(instance)
+    schedule = random_schedule(instance)
+    for _ in range(20):
+        schedule = schedule.mutation(3)
+        assert_matches_full_rescore(schedule, evaluator)
+
+
+def test_recombination_matches_full_rescore(instance):
+    random.seed(2)
+    evaluator = PopulationEvaluator(instance)
+    parents = [random_schedule(instance) for _ in range(4)]
+    for parent in parents:
+        random_moves(parent, 20)
+
+    offspring = []
+    for parent, other_parent in zip(parents, parents[1:] + parents[:1]):
+        offspring.extend(parent.recombination(other_parent, 5, 2))
+    for schedule in offspring:
+        assert_matches_full_rescore(schedule, evaluator)
+        # Offspring are scored from scratch, so moves afterwards check that they hold every running total
+        random_moves(schedule, 20)
+        assert_matches_full_rescore(schedule, evaluator)
+
+    # The whole population scored in one go gives the same fitnesses as each schedule on its own
+    population = parents + offspring
+    fitnesses, viable = evaluator.evaluate(
+        np.stack([schedule.assignment for schedule in population])
+    )
+    assert fitnesses.tolist() == [schedule.fitness for schedule in population]
+    assert viable.tolist() == [bool(schedule.viable) for schedule in population]
+
+
+def test_instance_from_tables(tmp_path):
+    # The ProblemInstance compiled from the DataLoader tables is the same as one compiled from the objects
+    filename = str(tmp_path / "tables.xlsx")
+    problem_instance(filename, num_students=30, num_wards=5, seed=2, block_weeks=4)
+    problem = load_problem(filename)
+    from_tables = ProblemInstance(*problem)
+    from_objects = ProblemInstance(*problem[:4])
+    for name in ("placement_records", "ward_records"):
+        records = getattr(from_objects, name).records
+        assert getattr(from_tables, name).records.dtype == records.dtype
+    for name, value in vars(from_objects).items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(getattr(from_tables, name), value)
@@ -0,0 +1,80 @@
+"""
+Checks that seeding a schedule always finishes. On an instance with more placements than the wards have room for,
+the placements which do not fit are recorded in unplaceable and left unassigned, and no ward is given more students
+than its capacity or the capacity for each part of the course.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import random
+import numpy as np
+import pytest
+from tests.input_data import problem_instance
+from src.Config import Config
+from src.ProblemInstance import ProblemInstance, TOTAL_INDEX, UNASSIGNED
+from src.Schedule import Schedule
+
+
+@pytest.fixture(scope="module")
+def crowded_instance(tmp_path_factory) -> ProblemInstance:
+    return problem_instance(
+        str(tmp_path_factory.mktemp("data") / "crowded.xlsx"),
+        num_students=60,
+        num_wards=3,
+        seed=5,
+        capacity=2,
+        block_weeks=4,
+    )
+
+
+@pytest.fixture(scope="module")
+def roomy_instance(tmp_path_factory) -> ProblemInstance:
+    return problem_instance(
+        str(tmp_path_factory.mktemp("data") / "roomy.xlsx"),
+        num_students=24,
+        num_wards=6,
+        seed=1,
+        capacity=6,
+    )
+
+
+def seeded_schedule(instance: ProblemInstance, seed: int) -> Schedule:
+    random.seed(seed)
+    schedule = Schedule(
+        instance.slots,
+        instance.wards,
+        instance.placements,
+        instance.num_weeks,
+        instance,
+        Config.load(),
+    )
+    schedule.schedule_generation()
+    return schedule
+
+
+def assert_within_capacity(schedule: Schedule):
+    instance = schedule.instance
+    np.testing.assert_array_equal(
+        schedule.occupancy, instance.occupancy_counts(schedule.assignment)
+    )
+    # Capacity of each ward for the whole ward and for each part, broadcast over the weeks
+    assert (schedule.occupancy <= instance.ward_capacity[:, np.newaxis, :]).all()
+    for placement_id in np.flatnonzero(schedule.assignment != UNASSIGNED):
+        assert schedule.assignment[placement_id] in instance.feasible_wards[placement_id]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_seeding_over_subscribed(crowded_instance, seed):
+    schedule = seeded_schedule(crowded_instance, seed)
+    assert len(schedule.unplaceable) > 0
+    unassigned = np.flatnonzero(schedule.assignment == UNASSIGNED)
+    np.testing.assert_array_equal(unassigned, schedule.unplaceable)
+    assert_within_capacity(schedule)
+    assert schedule.occupancy[:, :, TOTAL_INDEX].sum() > 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_seeding_with_room(roomy_instance, seed):
+    schedule = seeded_schedule(roomy_instance, seed)
+    assert len(schedule.unplaceable) == 0
+    assert (schedule.assignment != UNASSIGNED).all()
+    assert_within_capacity(schedule)
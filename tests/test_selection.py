@@ -0,0 +1,106 @@
+"""
+Checks that each parent selection method chooses schedules in the expected proportions for a fixed seed, that
+fitnesses which are all zero or negative fall back to choosing every schedule equally, and that an unknown
+selection_method in params.yml is rejected.
+Run from the root of the repository with: python -m pytest tests
+"""
+
+import dataclasses
+import numpy as np
+import pytest
+from tests.input_data import problem_instance
+from src.Config import Config
+from src.GeneticAlgorithm import GeneticAlgorithm
+from src.Selection import (
+    roulette_selection,
+    selection_weights,
+    stochastic_universal_sampling,
+    tournament_selection,
+)
+
+FITNESSES = np.array([0.1, 0.4, 0.2, 0.3])
+NUM_SELECTIONS = 100000
+
+
+def proportions(selected: np.ndarray, num_schedules: int) -> np.ndarray:
+    return np.bincount(selected, minlength=num_schedules) / len(selected)
+
+
+def test_selection_weights():
+    np.testing.assert_array_equal(selection_weights(FITNESSES), FITNESSES)
+    np.testing.assert_array_equal(selection_weights([-1.0, 0.0, 2.0]), [0, 0, 2])
+    np.testing.assert_array_equal(selection_weights([0.0, 0.0, 0.0]), [1, 1, 1])
+    np.testing.assert_array_equal(selection_weights([-0.5, -1.0, 0.0]), [1, 1, 1])
+
+
+def test_roulette_proportions():
+    selected = roulette_selection(FITNESSES, NUM_SELECTIONS, np.random.default_rng(0))
+    np.testing.assert_allclose(proportions(selected, 4), FITNESSES, atol=0.01)
+
+
+@pytest.mark.parametrize("fitnesses", [np.zeros(4), np.full(4, -1.0)])
+def test_roulette_without_positive_fitness(fitnesses):
+    selected = roulette_selection(fitnesses, NUM_SELECTIONS, np.random.default_rng(1))
+    np.testing.assert_allclose(proportions(selected, 4), 0.25, atol=0.01)
+
+
+@pytest.mark.parametrize("num_selections", [10, 33, 1000])
+def test_sus_counts(num_selections):
+    # Each schedule is chosen either side of its expected number of times, never further away
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        fitnesses = rng.uniform(0, 1, 7)
+        selected = stochastic_universal_sampling(fitnesses, num_selections, rng)
+        expected = num_selections * fitnesses / fitnesses.sum()
+        counts = np.bincount(selected, minlength=7)
+        assert len(selected) == num_selections
+        assert (np.abs(counts - expected) < 1 + 1e-9).all()
+
+
+def test_sus_without_positive_fitness():
+    selected = stochastic_universal_sampling(np.zeros(4), 100, np.random.default_rng(3))
+    np.testing.assert_array_equal(np.bincount(selected, minlength=4), 25)
+
+
+@pytest.mark.parametrize("tournament_size", [2, 3])
+def test_tournament_proportions(tournament_size):
+    # Entrants are drawn with replacement, so the schedule ranked r-th lowest of n wins with probability
+    # (r / n) ** size - ((r - 1) / n) ** size
+    selected = tournament_selection(
+        FITNESSES,
+        NUM_SELECTIONS,
+        np.random.default_rng(4),
+        tournament_size=tournament_size,
+    )
+    rank = np.argsort(np.argsort(FITNESSES)) + 1
+    expected = (rank / 4) ** tournament_size - ((rank - 1) / 4) ** tournament_size
+    np.testing.assert_allclose(proportions(selected, 4), expected, atol=0.01)
+
+
+def test_tournament_of_one_ignores_fitness():
+    selected = tournament_selection(
+        FITNESSES, NUM_SELECTIONS, np.random.default_rng(5), tournament_size=1
+    )
+    np.testing.assert_allclose(proportions(selected, 4), 0.25, atol=0.01)
+
+
+def test_unknown_selection_method(tmp_path):
+    instance = problem_instance(
+        str(tmp_path / "selection.xlsx"), num_students=6, num_wards=3
+    )
+    config = Config.load()
+    config = dataclasses.replace(
+        config,
+        genetic_algorithm_params=dataclasses.replace(
+            config.genetic_algorithm_params, selection_method="lottery"
+        ),
+    )
+    with pytest.raises(ValueError, match="Unknown selection_method lottery"):
+        GeneticAlgorithm(
+            instance.slots,
+            instance.wards,
+            instance.placements,
+            4,
+            instance.num_weeks,
+            config,
+        )
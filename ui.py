@@ -11,17 +11,48 @@ import pandas as pd
 import numpy as np
 from src.data_load import DataLoader
 from src.GeneticAlgorithm import GeneticAlgorithm
-import yaml
-from datetime import datetime
-import os
+from src.IslandModel import IslandModel
+from src.ProblemInstance import ProblemInstance
+from src.Config import Config
+from src.ReportWriter import (
+    ReportWriter,
+    COMPARISON_COLUMNS,
+    comparison_row,
+    save_comparison,
+)
 import matplotlib.pyplot as plt
 
 
-def main(num_schedules: int, pop_size: int):
+def collect_reports(pending_reports: list, scheduleCompare: list) -> bool:
+    """
+    Function to move the schedules whose reports have finished being written from pending_reports into the comparison
+    table
+    :param pending_reports: list of (chosen schedule, iteration, ReportJob) for reports being written in the background
+    :param scheduleCompare: list of comparison table rows, added to in place
+
+    :returns: bool of whether any reports had finished
+    """
+    finished = [report for report in pending_reports if report[2].done()]
+    for report in finished:
+        pending_reports.remove(report)
+        chosen_schedule, iteration, job = report
+        if job.error is not None:
+            st.error(f"The report for {job.file_name} could not be saved, see the log")
+            continue
+        scheduleCompare.append(
+            comparison_row(chosen_schedule, iteration, job.quality_metrics)
+        )
+        logging.info(f"{job.file_name} generated")
+    return len(finished) > 0
+
+
+def main(num_schedules: int, pop_size: int, config: Config, resume: bool = False):
     """
     Function to run Nursing Placement Optimisation tool end-to-end
     :param num_schedules: the overall integer number of schedules to output from the tool. Can be otherwise thought of as number of times the tool is run
     :param pop_size: the size of the population to be used for each run. This is the integer number of schedules randomly produced for each run of the tool, which are used as the base to find the best performing schedule from
+    :param config: the Config read from config/params.yml
+    :param resume: whether runs stopped part way through last time carry on from their checkpoints
     
     :returns: A series of .xlsx files, stored in results/ which contain the schedules, as well as a comparison file which shows the scores of each schedule beside each other
     """
@@ -32,56 +63,101 @@ def main(num_schedules: int, pop_size: int):
     st.subheader("Cycle information")
     st.subheader("Last saved schedule details")
     ui_schedule_results = st.empty()
+    ui_report_status = st.empty()
 
-    num_weeks = int(
-        np.round(
-            (
-                pd.to_datetime(
-                    dataload.student_placements["placement_start_date_raw"].max()
-                )
-                - pd.to_datetime(
-                    dataload.student_placements["placement_start_date_raw"].min()
-                )
-            )
-            / np.timedelta64(1, "W"),
-            0,
-        )
-    )
-
-    #  Add maximum placement length so that schedule is large enough to accommodate even the longest placement
-    num_weeks = (
-        num_weeks + int(dataload.student_placements["placement_len_weeks"].max()) + 1
-    )
-
+    num_weeks = dataload.num_weeks()
     logging.info(f"Total weeks covered: {num_weeks}")
     slots, wards, placements = dataload.preprocData(num_weeks)
+    # Shared by every run, using the compact tables built by preprocData
+    instance = ProblemInstance(
+        slots,
+        wards,
+        placements,
+        num_weeks,
+        dataload.placement_records,
+        dataload.ward_records,
+    )
 
     num_iter = num_schedules
     scheduleCompare = []
+    scheduleCompareDF = pd.DataFrame(scheduleCompare, columns=COMPARISON_COLUMNS)
+    # Reports are written on a background thread so that the next run can start straight away
+    report_writer = ReportWriter(config.ui_params.report_queue_size)
+    pending_reports = []
+
+    def show_reports():
+        """
+        Function to update the comparison table with any reports which have finished being written
+        """
+        nonlocal scheduleCompareDF
+        if collect_reports(pending_reports, scheduleCompare):
+            scheduleCompareDF = pd.DataFrame(
+                scheduleCompare, columns=COMPARISON_COLUMNS
+            )
+            ui_schedule_results.dataframe(
+                scheduleCompareDF.style.highlight_max(axis=0, color="lightgreen")
+            )
+        if pending_reports:
+            ui_report_status.info(
+                f"{len(pending_reports)} schedule report(s) still being saved to the results folder"
+            )
+        else:
+            ui_report_status.empty()
+
     placeholder = st.empty()
     graph_placeholder = st.empty()
     for i in range(num_iter):
-        GA = GeneticAlgorithm(slots, wards, placements, pop_size, num_weeks)
-        GA.seed_schedules()
-        (
-            continue_eval,
-            chosen_schedule,
-            fitness,
-            iteration,
-            schedule_fitnesses,
-        ) = GA.evaluate()
-        # prev_fitness = 0
-        while continue_eval:
+        # With more than one island, separate populations are evolved in parallel
+        if config.genetic_algorithm_params.num_islands > 1:
+            GA = IslandModel(
+                slots,
+                wards,
+                placements,
+                pop_size,
+                num_weeks,
+                config,
+                report_writer,
+                instance,
+            )
+        else:
+            GA = GeneticAlgorithm(
+                slots,
+                wards,
+                placements,
+                pop_size,
+                num_weeks,
+                config,
+                report_writer,
+                instance,
+                run_index=i,
+            )
+        # When asked to, a run which was stopped part way through carries on from its last checkpoint. The progress
+        # shown is updated at most every refresh_interval seconds
+        generations = GA.run(
+            resume=resume, min_interval=config.ui_params.refresh_interval
+        )
+        for generation, snapshot in enumerate(generations):
+            if generation == 0 and snapshot.resumed:
+                st.info(
+                    f"Resuming the schedule being generated when the tool was last stopped, from version {snapshot.iteration}"
+                )
+            show_reports()
             with placeholder.container():
                 metric1, metric2, metric3 = st.columns(3)
                 metric1.metric("Schedule # being generated", i + 1)
-                metric2.metric("Current schedule version generating", iteration)
-                metric3.metric("Highest schedule fitness score", np.round(fitness, 4))
+                metric2.metric(
+                    "Current schedule version generating", snapshot.iteration
+                )
+                metric3.metric(
+                    "Highest schedule fitness score",
+                    np.round(snapshot.best_fitness, 4),
+                )
                 with graph_placeholder.container():
                     fig, ax = plt.subplots(figsize=(20, 5))
                     ax.hist(
-                        schedule_fitnesses,
-                        bins=100,
+                        snapshot.fitness_bin_edges[:-1],
+                        bins=snapshot.fitness_bin_edges,
+                        weights=snapshot.fitness_counts,
                         color="#005EB8",
                         edgecolor="#003087",
                     )
@@ -96,71 +172,22 @@ def main(num_schedules: int, pop_size: int):
                     st.info(
                         "The above plot shows a histogram of fitness scores for schedules created by the algorithm. A score of 1 is the best possible score, while a score of 0 is the worst possible"
                     )
-                (
-                    continue_eval,
-                    chosen_schedule,
-                    fitness,
-                    iteration,
-                    schedule_fitnesses,
-                ) = GA.evolve()
-        viable = chosen_schedule.file_name.split("_", maxsplit=10)[9].replace(
-            ".xlsx", ""
-        )
-        schedule_scores = chosen_schedule.schedule_eval_scores
-        quality_scores = chosen_schedule.quality_metrics
-        scheduleCompare.append(
-            [
-                chosen_schedule.file_name,
-                viable,
-                chosen_schedule.non_viable_reason,
-                iteration,
-                np.round(chosen_schedule.fitness, 4),
-                np.round(schedule_scores["mean_ward_util"], 2),
-                np.round(schedule_scores["mean_uniq_deps"], 2),
-                np.round(schedule_scores["mean_uniq_wards"], 2),
-                np.round(quality_scores["num_incorr_num_plac"], 2),
-                np.round(quality_scores["num_incorrect_length"], 2),
-                np.round(quality_scores["num_capacity_exceeded"], 2),
-                np.round(quality_scores["num_double_booked"], 2),
-            ]
+        GA.close()
+        chosen_schedule = GA.chosen_schedule
+        pending_reports.append(
+            (
+                chosen_schedule,
+                snapshot.iteration,
+                report_writer.job(chosen_schedule.file_name),
+            )
         )
+        show_reports()
 
-        scheduleCompareDF = pd.DataFrame(
-            scheduleCompare,
-            columns=[
-                "Schedule file name",
-                "Viable schedule?",
-                "Non-viable reason",
-                "Number of iterations to generate",
-                "Schedule Fitness Score",
-                "Placement Utilisation score ",
-                "Unique Specialities Score",
-                "Unique Wards Score",
-                "No. students with incorrect no. of placements",
-                "No. of placements with the incorrect length",
-                "No. of ward-weeks where capacity is exceeded",
-                "No. of placements where student is double-booked",
-            ],
-        )
+    # Wait for the last reports before saving the comparison file
+    report_writer.close()
+    show_reports()
 
-        ui_schedule_results.dataframe(
-            scheduleCompareDF.style.highlight_max(axis=0, color="lightgreen")
-        )
-        logging.info(f"{chosen_schedule.file_name} generated")
-
-    script_directory = os.path.dirname(os.path.abspath(__file__))
-    save_directory = os.path.join(script_directory, "results")
-    try:
-        os.makedirs(save_directory)
-    except OSError:
-        pass  # already exists
-
-    now = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
-    file_name = f"schedule_comparison_{now}.csv"
-    full_save_path = os.path.join(save_directory, file_name)
-    now = datetime.now().strftime("%d_%m_%Y_%H_%M_%S")
-    scheduleCompareDF.to_csv(full_save_path)
-    logging.info("Comparison file saved")
+    save_comparison(scheduleCompareDF, config.schedule_params.results_folder)
     viableBool = False
     if len(scheduleCompareDF[scheduleCompareDF["Viable schedule?"] == True]) > 0:
         viableBool = True
@@ -184,11 +211,10 @@ if page == "Run algorithm":
     dataload = DataLoader()
 
     # Open the config params file to get some key arguments
-    with open("config/params.yml") as f:
-        params = yaml.load(f, Loader=yaml.FullLoader)
+    config = Config.load()
 
     # From the config file, read in the number of chromosomes (this is genetic algorithm terminology for the size of the population, or in this case the number of schedules being created to use to find the best solution)
-    numberOfChromosomes = params["ui_params"]["numberOfChromosomes"]
+    numberOfChromosomes = config.ui_params.numberOfChromosomes
 
     file_source = st.selectbox(
         "Select your data source", ["Fake data", "Your own data"]
@@ -201,7 +227,7 @@ if page == "Run algorithm":
             logging.exception(f"No fake_data.xlsx file found in the data directory")
     elif file_source == "Your own data":
         # From the config file, get the name of the file containing the input data
-        input_file_name = params["ui_params"]["input_file_name"]
+        input_file_name = config.ui_params.input_file_name
         if input_file_name == "file_name_here" or input_file_name == "":
             st.error(
                 f"No input file name has been configured, please update config/params.yml. Other errors may appear below this as a result."
@@ -258,6 +284,15 @@ if page == "Run algorithm":
             help="Note that once you click the Run button below, moving this slider again with cancel the program",
         )
 
+        # Only offered when checkpoints are saved, see checkpoint_interval in config/params.yml
+        resume = False
+        if config.genetic_algorithm_params.checkpoint_interval:
+            resume = st.checkbox(
+                "Carry on from where the last runs were stopped",
+                value=False,
+                help="Each run carries on from its checkpoint if it was stopped part way through with the same data and parameters",
+            )
+
         expire_wards_string = ""
         for item in list(
             dataload.ward_data[
@@ -300,7 +335,7 @@ if page == "Run algorithm":
         run_button = st.empty()
         end_message = st.empty()
         if run_button.button("Click here to start running"):
-            viableBool = main(num_schedules, numberOfChromosomes)
+            viableBool = main(num_schedules, numberOfChromosomes, config, resume)
             if viableBool:
                 st.balloons()
                 end_message.success("Schedule production complete!")